@@ -1,21 +1,46 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS, cross_origin
 import chess
 from chess_app.utils import AIPlayer, get_device
+from chess_app.ponder import Ponderer
+from chess_app.analysis import analyze_game as annotate_game, parse_game
+from chess_app.registry import ModelRegistry
 from chess_app.data import move_to_index
+from chess_app.gamestate import GameState, long_poll_timeout
 from chess_app.config import Config
+from chess_app.log import get_logger
+from chess_app.metrics import (
+    REGISTRY,
+    model_bytes,
+    record_move,
+    record_request,
+    stage,
+)
+import math
 import os
+import threading
 import time
-import traceback
-
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "http://localhost:3000"}})
 # Global variable to hold game state
 current_board = chess.Board()
+# Versioned snapshots of current_board for get_board; call
+# game_state.update(current_board) after every change to the board.
+game_state = GameState()
 ai_player = None
 opponent_ai = None
+ponderer = None
 engine_path = Config.ENGINE_PATH
+in_flight = 0
+# The threaded server runs hooks concurrently; += on a global is not atomic.
+in_flight_lock = threading.Lock()
+logger = get_logger("api")
+
+# Loaded once per process; games pick up reloaded weights between moves.
+model_registry = ModelRegistry(Config.MODEL_PATH, get_device())
+if Config.MODEL_WATCH:
+    model_registry.watch()
 
 
 def initialize_ai():
@@ -37,29 +62,109 @@ def get_legal_moves(board):
 def get_moves_san(board):
     san_moves = []
     temp_board = chess.Board()
-    for move in board.move_stack:
-        try:
-            san = temp_board.san(move)
-            san_moves.append(san)
-            temp_board.push(move)
-        except Exception as e:
-            print(f"Error generating SAN for move {move}: {e}")
-            san_moves.append("Invalid Move")
+    with stage("san_generation"):
+        for move in board.move_stack:
+            try:
+                san = temp_board.san(move)
+                san_moves.append(san)
+                temp_board.push(move)
+            except Exception as e:
+                logger.warning("Error generating SAN for move %s: %s", move.uci(), e)
+                san_moves.append("Invalid Move")
     return san_moves
 
 
+def version_of(player):
+    if player and player.model_version:
+        return player.model_version.number
+    return None
+
+
+def active_players():
+    return [player for player in (ai_player, opponent_ai) if player]
+
+
+REGISTRY.gauge(
+    "chess_live_games",
+    "Games in progress on this server.",
+    lambda: int(bool(active_players()) and not current_board.is_game_over()),
+)
+REGISTRY.gauge(
+    "chess_engine_processes",
+    "UCI engine processes held by the current game's players.",
+    lambda: sum(1 for player in active_players() if player.engine),
+)
+REGISTRY.gauge(
+    "chess_model_memory_bytes",
+    "Parameter and buffer memory of the loaded networks.",
+    lambda: sum(
+        model_bytes(model)
+        for model in {
+            id(model): model
+            for model in [p.model for p in active_players()]
+            + [v.model for v in (model_registry.current, model_registry.previous) if v]
+        }.values()
+    ),
+)
+REGISTRY.gauge(
+    "chess_requests_in_flight",
+    "Requests currently being handled.",
+    lambda: in_flight,
+)
+
+
+@app.before_request
+def start_request_timer():
+    global in_flight
+    with in_flight_lock:
+        in_flight += 1
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    start = g.pop("request_start", None)
+    if start is not None:
+        record_request(
+            request.endpoint or "unknown",
+            request.method,
+            response.status_code,
+            time.perf_counter() - start,
+        )
+    return response
+
+
+@app.teardown_request
+def finish_request(exc):
+    global in_flight
+    with in_flight_lock:
+        in_flight -= 1
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+
 @app.route("/api/start_game/<mode>", methods=["POST"])
 @cross_origin()
 def start_game(mode):
-    global current_board, ai_player, opponent_ai
-    timestamp = time.time()
-    print(f"[{timestamp}] Starting game in mode: {mode}")
+    global current_board, ai_player, opponent_ai, ponderer
+    logger.info("Starting game in mode: %s", mode)
+    if ponderer:
+        ponderer.reset()
+    # Release the previous game's engine processes before starting new ones.
+    for player in (ai_player, opponent_ai):
+        if player:
+            player.close()
     current_board.reset()
+    game_state.update(current_board)
     ai_player = None
     opponent_ai = None
+    ponderer = None
 
     if mode == "user_vs_stockfish":
-        print(f"[{timestamp}] Initializing against stockfish")
+        logger.debug("Initializing against stockfish")
         ai_player = AIPlayer(
             model_path=None,
             device=get_device(),
@@ -67,14 +172,29 @@ def start_game(mode):
             engine_path=engine_path,
         )
     elif mode == "user_vs_cai":
-        print(f"[{timestamp}] Initializing against cAI")
+        logger.debug("Initializing against cAI")
         ai_player = AIPlayer(
-            model_path=Config.MODEL_PATH, device=get_device(), side=chess.BLACK
+            model_path=Config.MODEL_PATH,
+            device=get_device(),
+            side=chess.BLACK,
+            registry=model_registry,
+        )
+    elif mode == "user_vs_cai_search":
+        logger.debug("Initializing against cAI with alpha-beta search")
+        ai_player = AIPlayer(
+            model_path=Config.MODEL_PATH,
+            device=get_device(),
+            side=chess.BLACK,
+            mode="search",
+            registry=model_registry,
         )
     elif mode == "watch_cai_vs_stockfish":
-        print(f"[{timestamp}] Initializing cAI vs stockfish")
+        logger.debug("Initializing cAI vs stockfish")
         ai_player = AIPlayer(
-            model_path=Config.MODEL_PATH, device=get_device(), side=chess.WHITE
+            model_path=Config.MODEL_PATH,
+            device=get_device(),
+            side=chess.WHITE,
+            registry=model_registry,
         )
         opponent_ai = AIPlayer(
             model_path=None,
@@ -83,44 +203,72 @@ def start_game(mode):
             engine_path=engine_path,
         )
 
-    return jsonify({"message": "Game started", "mode": mode})
+    # Only games against a human leave opponent time to ponder on.
+    if Config.PONDER_ENABLED and ai_player and not opponent_ai:
+        ponderer = Ponderer(ai_player)
+
+    return jsonify(
+        {"message": "Game started", "mode": mode, "modelVersion": version_of(ai_player)}
+    )
 
 
 @app.route("/api/get_board", methods=["GET"])
 @cross_origin()
 def get_board():
-    global current_board
-    return jsonify(
-        {
-            "fen": board_to_fen(current_board),
-            "legalMoves": get_legal_moves(current_board),
-            "moves": get_moves_san(current_board),
-            "gameOver": current_board.is_game_over(),
-            "turn": "white" if current_board.turn == chess.WHITE else "black",
-        }
-    )
+    """
+    The current game state, answered from the versioned snapshot.
+
+    - If-None-Match with the last ETag returns 304 while nothing changed.
+    - ?since=N&wait=S long-polls for up to S seconds until version > N.
+    - ?since=N&compact=1 returns only what changed after version N.
+    """
+    since = request.args.get("since", type=int)
+    wait = long_poll_timeout(request.args.get("wait", type=float))
+    compact = request.args.get("compact", "0") not in ("0", "false", "")
+    if since is not None and wait:
+        snapshot = game_state.wait(since, wait)
+    else:
+        snapshot = game_state.current()
+
+    etag = game_state.etag(snapshot["version"])
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(game_state.response(snapshot, since, compact))
+    response.set_etag(etag, weak=True)
+    # Clients must revalidate, never reuse a stored board blindly.
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @app.route("/api/make_move", methods=["POST"])
 @cross_origin()
 def make_move():
     global current_board
-    timestamp = time.time()
-    data = request.get_json()
-    move_uci = data.get("move")
-    print(f"[{timestamp}] Making move: {move_uci}")
+    with stage("request_parse"):
+        data = request.get_json()
+        move_uci = data.get("move")
+    logger.debug("Making move: %s", move_uci)
     if not move_uci:
-        print(f"[{timestamp}] Error: Move not provided")
+        logger.warning("Error: Move not provided")
         return jsonify({"error": "Move not provided"}), 400
 
     try:
-        move = chess.Move.from_uci(move_uci)
-        if move in current_board.legal_moves:
-            current_board.push(move)
-            print(f"[{timestamp}] Move made: {move_uci}")
+        with stage("board_update"):
+            move = chess.Move.from_uci(move_uci)
+            legal = move in current_board.legal_moves
+            if legal:
+                current_board.push(move)
+                game_state.update(current_board)
+        if legal:
+            logger.info("Move made: %s", move_uci)
+            if ponderer:
+                with stage("ponder_cancel"):
+                    hit = ponderer.resolve(current_board)
+                logger.debug("Ponder %s", "hit" if hit else "miss")
 
             if current_board.is_game_over():
-                print(f"[{timestamp}] Game over detected")
+                logger.info("Game over detected")
                 return jsonify(
                     {
                         "fen": board_to_fen(current_board),
@@ -160,17 +308,16 @@ def make_move():
                 }
             )
         else:
-            print(f"[{timestamp}] Invalid move attempted: {move_uci}")
-            print(f"Current board FEN: {current_board.fen()}")
+            logger.warning(
+                "Invalid move attempted: %s (FEN %s)", move_uci, current_board.fen()
+            )
             return jsonify({"error": "Invalid move"}), 400
 
     except ValueError as e:
-        print(f"[{timestamp}] Invalid move format: {e}")
-        traceback.print_exc()
+        logger.warning("Invalid move format: %s", e)
         return jsonify({"error": "Invalid move format"}), 400
     except Exception as e:
-        print(f"[{timestamp}] Error making move: {e}")
-        traceback.print_exc()
+        logger.exception("Error making move: %s", e)
         return jsonify({"error": "Error making move"}), 500
 
 
@@ -178,12 +325,15 @@ def make_move():
 @cross_origin()
 def undo_move():
     global current_board
-    timestamp = time.time()
-    print(f"[{timestamp}] Undoing move")
+    logger.debug("Undoing move")
     if len(current_board.move_stack) > 0:
         try:
-            current_board.pop()
-            print(f"[{timestamp}] Move undone")
+            if ponderer:
+                ponderer.reset()
+            with stage("board_update"):
+                current_board.pop()
+                game_state.update(current_board)
+            logger.info("Move undone")
             return jsonify(
                 {
                     "fen": board_to_fen(current_board),
@@ -193,11 +343,10 @@ def undo_move():
                 }
             )
         except Exception as e:
-            print(f"[{timestamp}] Error undoing move: {e}")
-            traceback.print_exc()
+            logger.exception("Error undoing move: %s", e)
             return jsonify({"error": "Error undoing move"}), 500
     else:
-        print(f"[{timestamp}] No moves to undo.")
+        logger.debug("No moves to undo.")
         return jsonify({"error": "No moves to undo."}), 400
 
 
@@ -205,68 +354,111 @@ def undo_move():
 @cross_origin()
 def redo_move():
     global current_board
-    timestamp = time.time()
-    print(f"[{timestamp}] Redoing move")
+    logger.debug("Redoing move")
     try:
         # We cannot redo without a way to track moves.
         return jsonify({"error": "Redo move is not yet implemented."}), 400
     except Exception as e:
-        print(f"[{timestamp}] Error redoing move: {e}")
-        traceback.print_exc()
+        logger.exception("Error redoing move: %s", e)
         return jsonify({"error": "Error redoing move"}), 500
 
 
 @app.route("/api/validate_move", methods=["POST"])
 @cross_origin()
 def validate_move():
-    timestamp = time.time()
-    data = request.get_json()
-    move_uci = data.get("move")
-    print(f"[{timestamp}] Validating move: {move_uci}")
+    with stage("request_parse"):
+        data = request.get_json()
+        move_uci = data.get("move")
+    logger.debug("Validating move: %s", move_uci)
     if not move_uci:
-        print(f"[{timestamp}] Error: Move not provided")
+        logger.warning("Error: Move not provided")
         return jsonify({"error": "Move not provided"}), 400
 
     try:
         move = chess.Move.from_uci(move_uci)
         is_legal = move in current_board.legal_moves
-        print(f"[{timestamp}] Move {move_uci} is {'legal' if is_legal else 'illegal'}")
+        logger.debug("Move %s is %s", move_uci, "legal" if is_legal else "illegal")
         return jsonify({"isLegal": is_legal})
     except ValueError as e:
-        print(f"[{timestamp}] Invalid move format: {e}")
-        traceback.print_exc()
+        logger.warning("Invalid move format: %s", e)
         return jsonify({"error": "Invalid move format"}), 400
     except Exception as e:
-        print(f"[{timestamp}] Error validating move: {e}")
-        traceback.print_exc()
+        logger.exception("Error validating move: %s", e)
         return jsonify({"error": "Error validating move"}), 500
 
 
+def is_clock_seconds(value):
+    # bool is an int subclass; true would otherwise read as one second.
+    return (
+        isinstance(value, (int, float))
+        and not isinstance(value, bool)
+        and math.isfinite(value)
+        and value >= 0
+    )
+
+
 @app.route("/api/ai_move", methods=["POST"])
 @cross_origin()
 def ai_move():
     global current_board, ai_player, opponent_ai
-    timestamp = time.time()
-    print(f"[{timestamp}] AI making a move")
+    logger.debug("AI making a move")
     try:
         if not ai_player and not opponent_ai:
-            print(f"[{timestamp}] Error: AI not initialized")
+            logger.warning("Error: AI not initialized")
             return jsonify({"error": "AI not initialized"}), 500
 
+        # Optional clock from the client: {"whiteTime", "blackTime", "increment"},
+        # all in seconds (not milliseconds), non-negative and finite.
+        with stage("request_parse"):
+            data = request.get_json(silent=True) or {}
+            clock_key = (
+                "whiteTime" if current_board.turn == chess.WHITE else "blackTime"
+            )
+            remaining = data.get(clock_key)
+            increment = data.get("increment", 0)
+            for key, value in ((clock_key, remaining), ("increment", increment)):
+                if value is not None and not is_clock_seconds(value):
+                    return (
+                        jsonify(
+                            {"error": f"{key} must be a non-negative number of seconds"}
+                        ),
+                        400,
+                    )
+            increment = increment or 0
+
         if opponent_ai and current_board.turn == opponent_ai.side:
-            move = opponent_ai.get_best_move(current_board)
+            mover = opponent_ai
+            move = opponent_ai.get_best_move(
+                current_board, remaining=remaining, increment=increment
+            )
         elif ai_player and current_board.turn == ai_player.side:
-            move = ai_player.get_best_move(current_board)
+            mover = ai_player
+            move = None
+            if ponderer:
+                with stage("ponder_cancel"):
+                    ponderer.cancel()
+                move = ponderer.take(current_board)
+            if move:
+                record_move("ponder")
+                logger.info("Using pondered move")
+            else:
+                move = ai_player.get_best_move(
+                    current_board, remaining=remaining, increment=increment
+                )
         else:
-            print(f"[{timestamp}] Error No AI to make a move")
+            logger.warning("Error No AI to make a move")
             return jsonify({"error": "No AI to make move"}), 400
 
         if move:
-            current_board.push(move)
-            print(f"[{timestamp}] AI move made: {move}")
+            with stage("board_update"):
+                current_board.push(move)
+                game_state.update(current_board)
+            logger.info("AI move made: %s", move.uci())
+            if ponderer:
+                ponderer.start(current_board)
 
             if current_board.is_game_over():
-                print(f"[{timestamp}] Game over detected")
+                logger.info("Game over detected")
                 return jsonify(
                     {
                         "fen": board_to_fen(current_board),
@@ -278,6 +470,7 @@ def ai_move():
                             if current_board.outcome()
                             else None
                         ),
+                        "modelVersion": version_of(mover),
                     }
                 )
             captured_pieces = {
@@ -303,23 +496,121 @@ def ai_move():
                     "moves": get_moves_san(current_board),
                     "gameOver": False,
                     "capturedPieces": captured_pieces,
+                    "modelVersion": version_of(mover),
                 }
             )
         else:
-            print(f"[{timestamp}] No AI move found")
+            logger.warning("No AI move found")
             return jsonify({"error": "No AI move found"}), 500
     except Exception as e:
-        print(f"[{timestamp}] Error in AI move: {e}")
-        traceback.print_exc()
+        logger.exception("Error in AI move: %s", e)
         return jsonify({"error": "Error in AI move"}), 500
 
 
+@app.route("/api/ponder_stats", methods=["GET"])
+@cross_origin()
+def ponder_stats():
+    if not ponderer:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **ponderer.stats()})
+
+
+@app.route("/api/model", methods=["GET"])
+@cross_origin()
+def model_info():
+    return jsonify(model_registry.stats())
+
+
+def allowed_model_path(path):
+    """
+    Only MODEL_PATH and files under CHECKPOINT_DIR may be loaded: the route
+    is unauthenticated and torch.load must not see arbitrary files.
+    """
+    real = os.path.realpath(path)
+    if real == os.path.realpath(model_registry.path):
+        return True
+    checkpoints = os.path.realpath(Config.CHECKPOINT_DIR)
+    return os.path.commonpath([real, checkpoints]) == checkpoints
+
+
+@app.route("/api/model/reload", methods=["POST"])
+@cross_origin()
+def reload_model():
+    # Optional {"path": ...} to load a checkpoint other than MODEL_PATH.
+    data = request.get_json(silent=True) or {}
+    path = data.get("path") or model_registry.path
+    if not isinstance(path, str) or not allowed_model_path(path):
+        return (
+            jsonify({"error": "Path must be MODEL_PATH or under CHECKPOINT_DIR"}),
+            400,
+        )
+    if not os.path.exists(path):
+        return jsonify({"error": f"Model file not found: {path}"}), 404
+    if not model_registry.reload(path):
+        return jsonify({"error": "A reload is already in progress"}), 409
+    logger.info("Reloading model from %s", path)
+    return jsonify({"message": "Reload started", "path": path}), 202
+
+
+@app.route("/api/model/rollback", methods=["POST"])
+@cross_origin()
+def rollback_model():
+    if not model_registry.rollback():
+        return jsonify({"error": "No previous model version to roll back to"}), 400
+    return jsonify({"message": "Rolled back", **model_registry.stats()})
+
+
+@app.route("/api/analyze_game", methods=["POST"])
+@cross_origin()
+def analyze_game():
+    """
+    Annotates a whole game with one batched network pass (chunked for long
+    games). Takes {"pgn": ...} or {"moves": [...], "fen": ...}; with neither
+    the current game is analysed.
+    """
+    with stage("request_parse"):
+        data = request.get_json(silent=True) or {}
+        try:
+            if data.get("pgn") or data.get("moves"):
+                start, moves = parse_game(
+                    pgn=data.get("pgn"), moves=data.get("moves"), fen=data.get("fen")
+                )
+            else:
+                start = current_board.root()
+                moves = list(current_board.move_stack)
+        except ValueError as e:
+            logger.warning("Invalid game for analysis: %s", e)
+            return jsonify({"error": str(e)}), 400
+
+    version = model_registry.get()
+    player = next((p for p in active_players() if p.model is not None), None)
+    if version is not None:
+        model, device, number = version.model, model_registry.device, version.number
+    elif player is not None:
+        model, device, number = player.model, player.device, version_of(player)
+    else:
+        return jsonify({"error": "No model loaded"}), 503
+
+    try:
+        with stage("game_analysis"):
+            report = annotate_game(model, device, start, moves)
+    except Exception as e:
+        logger.exception("Error analysing game: %s", e)
+        return jsonify({"error": "Error analysing game"}), 500
+    logger.info(
+        "Analysed %d plies in %d forward passes",
+        len(moves),
+        report["forwardPasses"],
+    )
+    report["modelVersion"] = number
+    return jsonify(report)
+
+
 @app.route("/api/save_game", methods=["POST"])
 @cross_origin()
 def save_game():
     global current_board
-    timestamp = time.time()
-    print(f"[{timestamp}] Saving game")
+    logger.debug("Saving game")
     try:
         data = request.get_json()
         fen = data.get("fen")
@@ -328,7 +619,7 @@ def save_game():
             from chess_app.utils import SaveLoad
 
             SaveLoad.save_game(board, "saved_game.pgn")
-            print(f"[{timestamp}] Game saved successfully")
+            logger.info("Game saved successfully")
             return jsonify({"success": True, "message": "Game Saved Successfully"})
         else:
             return (
@@ -336,8 +627,7 @@ def save_game():
                 400,
             )
     except Exception as e:
-        print(f"[{timestamp}] Error saving game: {e}")
-        traceback.print_exc()
+        logger.exception("Error saving game: %s", e)
         return jsonify({"success": False, "error": f"Error saving game: {e}"}), 500
 
 
@@ -345,14 +635,16 @@ def save_game():
 @cross_origin()
 def load_game():
     global current_board
-    timestamp = time.time()
-    print(f"[{timestamp}] Loading game")
+    logger.debug("Loading game")
     try:
         from chess_app.utils import SaveLoad
 
         board = SaveLoad.load_game("saved_game.pgn")
+        if ponderer:
+            ponderer.reset()
         current_board = board
-        print(f"[{timestamp}] Game loaded successfully")
+        game_state.update(current_board)
+        logger.info("Game loaded successfully")
         return jsonify(
             {
                 "success": True,
@@ -362,8 +654,7 @@ def load_game():
             }
         )
     except Exception as e:
-        print(f"[{timestamp}] Error loading game: {e}")
-        traceback.print_exc()
+        logger.exception("Error loading game: %s", e)
         return jsonify({"success": False, "error": f"Error loading game: {e}"}), 500
 
 
@@ -371,32 +662,31 @@ def load_game():
 @cross_origin()
 def resign_game():
     global current_board
-    timestamp = time.time()
-    print(f"[{timestamp}] Resigning game")
+    logger.debug("Resigning game")
     try:
         # Logic can be implemented here. We can simply return a 200 message.
+        if ponderer:
+            ponderer.reset()
         current_board.clear()
+        game_state.update(current_board)
         return jsonify({"success": True, "message": "Game Resigned."})
     except Exception as e:
-        print(f"[{timestamp}] Error resigning game: {e}")
-        traceback.print_exc()
+        logger.exception("Error resigning game: %s", e)
         return jsonify({"success": False, "error": f"Error resigning game: {e}"}), 500
 
 
 @app.route("/api/offer_draw", methods=["POST"])
 @cross_origin()
 def offer_draw():
-    timestamp = time.time()
-    print(f"[{timestamp}] Offering draw")
+    logger.debug("Offering draw")
     try:
         # Logic can be implemented here, We can simply return a 200 message.
         return jsonify({"success": True, "message": "Draw Offered."})
     except Exception as e:
-        print(f"[{timestamp}] Error offering draw: {e}")
-        traceback.print_exc()
+        logger.exception("Error offering draw: %s", e)
         return jsonify({"success": False, "error": f"Error offering draw: {e}"}), 500
 
 
 if __name__ == "__main__":
-    print("Starting Flask server")
+    logger.info("Starting Flask server")
     app.run(debug=True, port=6009, host="0.0.0.0")
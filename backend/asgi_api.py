@@ -0,0 +1,482 @@
+# asgi_api.py
+
+"""
+ASGI variant of api.py for many concurrent games:
+
+    uvicorn asgi_api:app --port 6009
+
+The routes and payloads match api.py. Requests may name a game with
+?game=<id> or a "gameId" JSON field; without one they use a shared
+"default" game, as api.py does. Engine moves go through a small pool of
+asyncio UCI engines shared by all games. Model moves and analysis run on a
+thread pool so the event loop never blocks. An idle game costs only its
+board and snapshots, and a long-poll waiting on it costs one coroutine.
+"""
+
+import asyncio
+import contextlib
+import functools
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import chess
+import chess.engine
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from chess_app.analysis import analyze_game as annotate_game, parse_game
+from chess_app.config import Config
+from chess_app.gamestate import GameState, long_poll_timeout
+from chess_app.log import get_logger
+from chess_app.metrics import REGISTRY, record_move, record_request
+from chess_app.registry import ModelRegistry
+from chess_app.utils import AIPlayer, get_device
+
+logger = get_logger("asgi")
+
+DEFAULT_GAME = "default"
+# Seconds to let a discarded engine exit before giving up on it.
+ENGINE_QUIT_TIMEOUT = 5.0
+MODEL_MODES = {
+    "user_vs_cai": {chess.BLACK: "policy"},
+    "user_vs_cai_search": {chess.BLACK: "search"},
+    "watch_cai_vs_stockfish": {chess.WHITE: "policy", chess.BLACK: "engine"},
+    "user_vs_stockfish": {chess.BLACK: "engine"},
+}
+
+model_registry = ModelRegistry(Config.MODEL_PATH, get_device())
+# Inference and other CPU-bound work; the event loop only awaits it.
+inference = ThreadPoolExecutor(
+    max_workers=Config.ASGI_INFERENCE_WORKERS, thread_name_prefix="inference"
+)
+
+
+class EnginePool:
+    """
+    UCI engines shared by every game, started on first use. At most `size`
+    moves run at once, each on an idle engine or, when none is idle, a newly
+    started one, so there are never more than `size` processes. An engine
+    whose move fails is discarded; its slot starts a fresh one next time.
+    """
+
+    def __init__(self, path=Config.ENGINE_PATH, size=Config.ASGI_ENGINE_POOL):
+        self.path = path
+        self.size = size
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+        self.engines = []
+
+    async def play(self, board, limit):
+        async with self.slots:
+            if self.idle:
+                engine = self.idle.pop()
+            else:
+                # A failed start raises here and just gives the slot back.
+                _, engine = await chess.engine.popen_uci(self.path)
+                self.engines.append(engine)
+            try:
+                result = await engine.play(board, limit)
+            except BaseException:
+                # Crashed, or cancelled mid-search: its state is unknown.
+                await self._discard(engine)
+                raise
+            self.idle.append(engine)
+            return result
+
+    async def _discard(self, engine):
+        self.engines.remove(engine)
+        with contextlib.suppress(Exception, asyncio.TimeoutError):
+            await asyncio.wait_for(engine.quit(), ENGINE_QUIT_TIMEOUT)
+
+    async def close(self):
+        for engine in self.engines:
+            await engine.quit()
+        self.engines = []
+        self.idle = []
+
+
+def make_player(side, kind):
+    # Like api.py, model modes fall back to the engine without a model.
+    if kind == "engine" or model_registry.get() is None:
+        return "engine"
+    return AIPlayer(
+        model_path=None,
+        device=model_registry.device,
+        side=side,
+        mode=kind,
+        registry=model_registry,
+    )
+
+
+def make_players(mode):
+    """The AI players of a mode by side. Loads the book, so run it off the loop."""
+    return {side: make_player(side, kind) for side, kind in MODEL_MODES[mode].items()}
+
+
+class Game:
+    def __init__(self, game_id, mode, players=None):
+        self.id = game_id
+        self.mode = mode
+        self.board = chess.Board()
+        self.state = GameState()
+        self.changed = asyncio.Event()
+        # Moves on one game are serialised; different games run in parallel.
+        self.lock = asyncio.Lock()
+        self.players = players or {}
+        self.closed = False
+
+    def update(self):
+        self.state.update(self.board)
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def wait(self, since, timeout):
+        deadline = time.monotonic() + timeout
+        while self.state.version <= since:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(self.changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return self.state.current()
+
+    def model_version(self):
+        for player in self.players.values():
+            if player != "engine" and player.model_version:
+                return player.model_version.number
+        return None
+
+    def close(self):
+        self.closed = True
+        for player in self.players.values():
+            if player != "engine":
+                player.close()
+
+    async def close_when_idle(self):
+        # An ai_move holding the lock may be using the players in the executor.
+        async with self.lock:
+            self.close()
+
+
+class Games:
+    """
+    Open games by id, least recently used first, capped at ASGI_MAX_GAMES.
+    Only the event loop touches the dict; get() reorders it on every lookup.
+    """
+
+    def __init__(self, limit=Config.ASGI_MAX_GAMES):
+        self.limit = limit
+        self.games = OrderedDict()
+
+    def get(self, game_id):
+        game = self.games.get(game_id)
+        if game is not None:
+            self.games.move_to_end(game_id)
+        return game
+
+    async def start(self, game_id, mode):
+        players = {}
+        if mode in MODEL_MODES:
+            loop = asyncio.get_running_loop()
+            players = await loop.run_in_executor(inference, make_players, mode)
+        game = Game(game_id, mode, players)
+        replaced = [self.games.pop(game_id, None)]
+        self.games[game_id] = game
+        while len(self.games) > self.limit:
+            replaced.append(self.games.popitem(last=False)[1])
+        for old in replaced:
+            if old is not None:
+                await old.close_when_idle()
+        return game
+
+
+games = Games()
+engines = None
+
+REGISTRY.gauge("chess_asgi_games", "Games held open.", lambda: len(games.games))
+
+
+def timed(handler):
+    @functools.wraps(handler)
+    async def wrapper(request):
+        start = time.perf_counter()
+        response = await handler(request)
+        record_request(
+            handler.__name__,
+            request.method,
+            response.status_code,
+            time.perf_counter() - start,
+        )
+        return response
+
+    return wrapper
+
+
+async def read_json(request):
+    try:
+        return await request.json()
+    except ValueError:
+        return {}
+
+
+def game_id_of(request, data=None):
+    return (
+        request.query_params.get("game") or (data or {}).get("gameId") or (DEFAULT_GAME)
+    )
+
+
+async def lookup(request, data=None):
+    game = games.get(game_id_of(request, data))
+    if game is None and game_id_of(request, data) == DEFAULT_GAME:
+        game = await games.start(DEFAULT_GAME, None)
+    return game
+
+
+def query_number(params, name, kind):
+    # Like Flask's request.args.get(name, type=kind): a bad value is ignored.
+    try:
+        return kind(params[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def not_found():
+    return JSONResponse({"error": "Unknown game"}, status_code=404)
+
+
+def captured_pieces(board):
+    captured = {"white": [], "black": []}
+    temp_board = chess.Board()
+    for move in board.move_stack:
+        if temp_board.is_capture(move):
+            piece = temp_board.piece_at(move.to_square)
+            if piece:
+                symbol = piece.symbol()
+                if piece.color == chess.WHITE:
+                    captured["white"].append(symbol.upper())
+                else:
+                    captured["black"].append(symbol.lower())
+        temp_board.push(move)
+    return captured
+
+
+def board_payload(game, **extra):
+    snapshot = game.state.current()
+    payload = {
+        "fen": snapshot["fen"],
+        "legalMoves": snapshot["legalMoves"],
+        "moves": list(snapshot["moves"]),
+        "gameOver": snapshot["gameOver"],
+        "version": snapshot["version"],
+    }
+    if snapshot["gameOver"]:
+        payload["winner"] = snapshot["winner"]
+    payload.update(extra)
+    return payload
+
+
+@timed
+async def start_game(request):
+    mode = request.path_params["mode"]
+    data = await read_json(request)
+    game_id = game_id_of(request, data)
+    logger.info("Starting game %s in mode: %s", game_id, mode)
+    game = await games.start(game_id, mode)
+    game.update()
+    return JSONResponse(
+        {
+            "message": "Game started",
+            "mode": mode,
+            "gameId": game.id,
+            "modelVersion": game.model_version(),
+        }
+    )
+
+
+@timed
+async def get_board(request):
+    game = await lookup(request)
+    if game is None:
+        return not_found()
+    params = request.query_params
+    since = query_number(params, "since", int)
+    wait = long_poll_timeout(query_number(params, "wait", float))
+    compact = params.get("compact", "0") not in ("0", "false", "")
+    if since is not None and wait:
+        snapshot = await game.wait(since, wait)
+    else:
+        snapshot = game.state.current()
+
+    etag = f'W/"{game.state.etag(snapshot["version"])}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(game.state.response(snapshot, since, compact), headers=headers)
+
+
+@timed
+async def make_move(request):
+    data = await read_json(request)
+    game = await lookup(request, data)
+    if game is None:
+        return not_found()
+    move_uci = data.get("move")
+    if not move_uci:
+        return JSONResponse({"error": "Move not provided"}, status_code=400)
+    try:
+        move = chess.Move.from_uci(move_uci)
+    except ValueError:
+        return JSONResponse({"error": "Invalid move format"}, status_code=400)
+    async with game.lock:
+        if move not in game.board.legal_moves:
+            return JSONResponse({"error": "Invalid move"}, status_code=400)
+        game.board.push(move)
+        game.update()
+    if game.board.is_game_over():
+        return JSONResponse(board_payload(game))
+    return JSONResponse(board_payload(game, capturedPieces=captured_pieces(game.board)))
+
+
+@timed
+async def undo_move(request):
+    data = await read_json(request)
+    game = await lookup(request, data)
+    if game is None:
+        return not_found()
+    async with game.lock:
+        if not game.board.move_stack:
+            return JSONResponse({"error": "No moves to undo."}, status_code=400)
+        game.board.pop()
+        game.update()
+    return JSONResponse(board_payload(game, gameOver=False))
+
+
+@timed
+async def validate_move(request):
+    data = await read_json(request)
+    game = await lookup(request, data)
+    if game is None:
+        return not_found()
+    try:
+        move = chess.Move.from_uci(data.get("move") or "")
+    except ValueError:
+        return JSONResponse({"error": "Invalid move format"}, status_code=400)
+    return JSONResponse({"isLegal": move in game.board.legal_moves})
+
+
+@timed
+async def ai_move(request):
+    data = await read_json(request)
+    game = await lookup(request, data)
+    if game is None:
+        return not_found()
+    async with game.lock:
+        if game.closed:
+            # Restarted or evicted while this request waited for the lock.
+            return JSONResponse({"error": "Game was replaced"}, status_code=409)
+        player = game.players.get(game.board.turn)
+        if player is None:
+            return JSONResponse({"error": "No AI to make move"}, status_code=400)
+        if game.board.is_game_over():
+            return JSONResponse({"error": "Game is over"}, status_code=400)
+        board = game.board.copy()
+        if player == "engine":
+            record_move("engine")
+            result = await engines.play(board, chess.engine.Limit(depth=2))
+            move = result.move
+        else:
+            loop = asyncio.get_running_loop()
+            move = await loop.run_in_executor(inference, player.get_best_move, board)
+        if move is None:
+            return JSONResponse({"error": "No AI move found"}, status_code=500)
+        game.board.push(move)
+        game.update()
+    if game.board.is_game_over():
+        return JSONResponse(board_payload(game, modelVersion=game.model_version()))
+    return JSONResponse(
+        board_payload(
+            game,
+            capturedPieces=captured_pieces(game.board),
+            modelVersion=game.model_version(),
+        )
+    )
+
+
+@timed
+async def analyze_game(request):
+    data = await read_json(request)
+    try:
+        if data.get("pgn") or data.get("moves"):
+            start, moves = parse_game(
+                pgn=data.get("pgn"), moves=data.get("moves"), fen=data.get("fen")
+            )
+        else:
+            game = await lookup(request, data)
+            if game is None:
+                return not_found()
+            start = game.board.root()
+            moves = list(game.board.move_stack)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    version = model_registry.get()
+    if version is None:
+        return JSONResponse({"error": "No model loaded"}, status_code=503)
+    loop = asyncio.get_running_loop()
+    report = await loop.run_in_executor(
+        inference, annotate_game, version.model, model_registry.device, start, moves
+    )
+    report["modelVersion"] = version.number
+    return JSONResponse(report)
+
+
+@timed
+async def model_info(request):
+    return JSONResponse(model_registry.stats())
+
+
+async def metrics(request):
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    global engines
+    engines = EnginePool()
+    if Config.MODEL_WATCH:
+        model_registry.watch()
+    yield
+    await engines.close()
+    for game in games.games.values():
+        game.close()
+    model_registry.close()
+    inference.shutdown(wait=False)
+
+
+app = Starlette(
+    routes=[
+        Route("/metrics", metrics, methods=["GET"]),
+        Route("/api/start_game/{mode}", start_game, methods=["POST"]),
+        Route("/api/get_board", get_board, methods=["GET"]),
+        Route("/api/make_move", make_move, methods=["POST"]),
+        Route("/api/undo_move", undo_move, methods=["POST"]),
+        Route("/api/validate_move", validate_move, methods=["POST"]),
+        Route("/api/ai_move", ai_move, methods=["POST"]),
+        Route("/api/analyze_game", analyze_game, methods=["POST"]),
+        Route("/api/model", model_info, methods=["GET"]),
+    ],
+    middleware=[
+        Middleware(
+            CORSMiddleware,
+            allow_origins=["http://localhost:3000"],
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+    ],
+    lifespan=lifespan,
+)
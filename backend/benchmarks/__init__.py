@@ -0,0 +1,6 @@
+# benchmarks/__init__.py
+
+"""
+Offline speed benchmarks for the Chess AI backend hot paths.
+Run with `python -m benchmarks` from the backend directory.
+"""
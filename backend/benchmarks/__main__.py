@@ -0,0 +1,112 @@
+# benchmarks/__main__.py
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Engine and model paths are read when chess_app.config is first imported,
+# so point them at offline stand-ins before any benchmark module loads it.
+os.environ.setdefault(
+    "CHESS_ENGINE_PATH", os.path.join(BENCHMARK_DIR, "fake_engine.py")
+)
+os.environ.setdefault("CHESS_MODEL_PATH", os.path.join(BENCHMARK_DIR, "no_model.pth"))
+
+from benchmarks import bench_api, bench_core, bench_player  # noqa: E402
+from benchmarks.runner import (  # noqa: E402
+    compare,
+    format_seconds,
+    load_json,
+    machine_metadata,
+    missing_cases,
+    run_cases,
+    save_json,
+)
+
+SUITES = {"core": bench_core, "player": bench_player, "api": bench_api}
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Chess AI backend benchmarks")
+    parser.add_argument(
+        "--suite", choices=sorted(SUITES), action="append", help="Suites to run"
+    )
+    parser.add_argument("--filter", help="Only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, help="Override repeats per case")
+    parser.add_argument(
+        "--baseline", default=os.path.join(BENCHMARK_DIR, "baseline.json")
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store this run as the baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Fail when a median is this fraction slower than the baseline",
+    )
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv if argv is not None else sys.argv[1:])
+    log = lambda message: print(message, file=sys.__stdout__, flush=True)
+
+    results = {}
+    failures = {}
+    # The app prints on every request; keep that cost but not the noise.
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for name in args.suite or sorted(SUITES):
+            log(f"== {name}")
+            suite_results, suite_failures = run_cases(
+                SUITES[name].cases(), args.filter, args.repeat, log, suite=name
+            )
+            results.update(suite_results)
+            failures.update(suite_failures)
+
+    run = {"metadata": machine_metadata(), "results": results, "failures": failures}
+    result_path = os.path.join(
+        args.output, f"bench_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(run, result_path)
+    log(f"Saved results to {result_path}")
+
+    # A case that raises must not pass the gate by having no timing.
+    for name, error in sorted(failures.items()):
+        log(f"FAILED {name}: {error}")
+    if failures:
+        if args.save_baseline:
+            log("Not saving a baseline with failed cases.")
+        return 1
+
+    if args.save_baseline:
+        save_json(run, args.baseline)
+        log(f"Saved baseline to {args.baseline}")
+        return 0
+
+    baseline = load_json(args.baseline)
+    if baseline is None:
+        log("No baseline found; run with --save-baseline to create one.")
+        return 0
+
+    missing = missing_cases(results, baseline, args.suite, args.filter)
+    for name in missing:
+        log(f"MISSING {name}: in the baseline but not measured")
+    regressions = compare(results, baseline, args.threshold)
+    for name, base, current, ratio in regressions:
+        log(
+            f"REGRESSION {name}: {format_seconds(base)} -> {format_seconds(current)} "
+            f"({ratio:.2f}x)"
+        )
+    if regressions or missing:
+        return 1
+    log(f"No regressions beyond {args.threshold:.0%} of the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
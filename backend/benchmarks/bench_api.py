@@ -0,0 +1,82 @@
+# benchmarks/bench_api.py
+
+from benchmarks.runner import Case
+
+
+def cases():
+    import api
+
+    client = api.app.test_client()
+
+    def start_game():
+        client.post("/api/start_game/user_vs_stockfish")
+
+    yield Case("api.start_game", start_game, repeat=3)
+
+    start_game()
+    client.post("/api/make_move", json={"move": "e2e4"})
+    yield Case("api.get_board", lambda: client.get("/api/get_board"), number=20)
+    yield Case(
+        "api.validate_move",
+        lambda: client.post("/api/validate_move", json={"move": "d7d5"}),
+        number=20,
+    )
+
+    def ai_move_and_undo():
+        client.post("/api/ai_move")
+        client.post("/api/undo_move")
+
+    yield Case("api.ai_move+undo", ai_move_and_undo, number=5)
+
+    client.post("/api/undo_move")
+
+    def make_move_and_undo():
+        client.post("/api/make_move", json={"move": "e2e4"})
+        client.post("/api/undo_move")
+
+    yield Case("api.make_move+undo", make_move_and_undo, number=10)
+
+    # Instrumentation overhead: the same request with metrics switched off,
+    # a bare timed stage, and a scrape of the endpoint.
+    from chess_app.metrics import REGISTRY, stage
+
+    def get_board_without_metrics():
+        REGISTRY.enabled = False
+        try:
+            client.get("/api/get_board")
+        finally:
+            REGISTRY.enabled = True
+
+    yield Case("api.get_board_no_metrics", get_board_without_metrics, number=20)
+
+    def timed_stages():
+        for _ in range(100):
+            with stage("benchmark"):
+                pass
+
+    yield Case("metrics.stage", timed_stages, items=100, number=10)
+    yield Case("api.metrics", lambda: client.get("/metrics"), number=20)
+
+    # Logging cost on the calling thread: a record handed to the listener
+    # queue, and one dropped by the level check.
+    from chess_app.log import get_logger
+
+    logger = get_logger("benchmark")
+
+    def log_records(log):
+        for i in range(100):
+            log("Benchmark record %d of %s", i, "api")
+
+    yield Case(
+        "log.info_enqueue", lambda: log_records(logger.info), items=100, number=10
+    )
+    yield Case(
+        "log.debug_gated", lambda: log_records(logger.debug), items=100, number=10
+    )
+
+    # Engine threads would otherwise keep the interpreter alive at exit.
+    if api.ponderer:
+        api.ponderer.reset()
+    for player in (api.ai_player, api.opponent_ai):
+        if player:
+            player.close()
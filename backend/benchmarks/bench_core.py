@@ -0,0 +1,156 @@
+# benchmarks/bench_core.py
+
+import os
+import random
+import tempfile
+
+import chess
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+from benchmarks.presets import sample_boards, small_model
+from benchmarks.runner import Case
+from chess_app.analysis import analyze_game
+from chess_app.augment import flip_batch, verify_against_mirror
+from chess_app.checkpoint import CheckpointWriter, atomic_save, snapshot
+from chess_app.data import board_to_tensor, index_to_move, move_to_index
+from chess_app.model import ChessNet, save_model
+
+
+def cases():
+    boards = sample_boards(64)
+    rng = random.Random(0)
+    moves = [rng.choice(list(board.legal_moves)) for board in boards]
+    legal_indices = [move_to_index(move) for move in moves]
+    yield Case(
+        "data.board_to_tensor",
+        lambda: [board_to_tensor(board) for board in boards],
+        items=len(boards),
+        number=5,
+    )
+    yield Case(
+        "data.index_to_move",
+        lambda: [index_to_move(i, b) for i, b in zip(legal_indices, boards)],
+        items=len(boards),
+        number=5,
+    )
+    # Indices that do not decode to a legal move hit the random fallback.
+    yield Case(
+        "data.index_to_move_fallback",
+        lambda: [index_to_move(4671, board) for board in boards],
+        items=len(boards),
+        number=5,
+    )
+
+    # A wrong flip would silently train on corrupted labels; check it against
+    # board.mirror() before timing it.
+    verify_against_mirror(boards)
+    flip_boards_batch = torch.stack([board_to_tensor(b) for b in boards])
+    flip_moves_batch = torch.tensor(legal_indices)
+    flip_outcomes_batch = torch.rand(len(boards))
+    yield Case(
+        "augment.flip_batch64",
+        lambda: flip_batch(
+            flip_boards_batch, flip_moves_batch, flip_outcomes_batch, prob=0.5
+        ),
+        items=len(boards),
+        number=20,
+    )
+
+    model = small_model()
+    for batch_size in (1, 8, 64):
+        batch = torch.stack([board_to_tensor(b) for b in boards[:batch_size]])
+
+        def forward(batch=batch):
+            with torch.inference_mode():
+                model(batch)
+
+        yield Case(
+            f"model.forward_batch{batch_size}", forward, items=batch_size, number=5
+        )
+
+    # A 100-move game: one batched pass per ANALYSIS_BATCH_SIZE positions vs.
+    # one forward pass per ply.
+    game = chess.Board()
+    while len(game.move_stack) < 200 and not game.is_game_over():
+        game.push(rng.choice(list(game.legal_moves)))
+    game_moves = list(game.move_stack)
+    yield Case(
+        f"analysis.game_{len(game_moves)}_plies_batched",
+        lambda: analyze_game(model, "cpu", chess.Board(), game_moves),
+        items=len(game_moves),
+        repeat=3,
+    )
+    yield Case(
+        f"analysis.game_{len(game_moves)}_plies_per_ply",
+        lambda: analyze_game(model, "cpu", chess.Board(), game_moves, batch_size=1),
+        items=len(game_moves),
+        repeat=3,
+    )
+
+    train_net = small_model()
+    train_net.train()
+    optimizer = optim.Adam(train_net.parameters(), lr=1e-4)
+    batch = torch.stack([board_to_tensor(b) for b in boards])
+    targets = torch.tensor(legal_indices)
+    outcomes = torch.rand(len(boards))
+    qualities = torch.randint(0, 5, (len(boards),))
+
+    def train_step():
+        optimizer.zero_grad()
+        policy, value, quality = train_net(batch)
+        loss = (
+            nn.NLLLoss()(policy, targets)
+            + nn.MSELoss()(value.squeeze(), outcomes)
+            + nn.CrossEntropyLoss()(quality, qualities)
+        )
+        loss.backward()
+        optimizer.step()
+
+    yield Case("train.step_batch64", train_step, items=len(boards), number=3)
+
+    # train_model end to end, DataLoader workers included.
+    from train import train_model
+
+    training_data = [
+        (board_to_tensor(b).numpy(), i, 0.5, "Average Step")
+        for b, i in zip(boards * 4, legal_indices * 4)
+    ]
+    yield Case(
+        "train.train_model_epoch",
+        lambda: train_model(
+            train_net, "cpu", training_data, epochs=1, batch_size=64, lr=1e-4
+        ),
+        items=len(training_data),
+        repeat=3,
+    )
+
+    # Training-thread stall per checkpoint: the old synchronous save versus
+    # the CPU snapshot CheckpointWriter takes before writing in the background.
+    torch.manual_seed(0)
+    net = ChessNet(num_residual_blocks=8, channels=128, head_channels=32)
+    net_optimizer = optim.Adam(net.parameters(), lr=1e-4)
+    with tempfile.TemporaryDirectory() as directory:
+        weights_path = os.path.join(directory, "model.pth")
+        yield Case(
+            "checkpoint.sync_save_model",
+            lambda: save_model(net, weights_path),
+            repeat=3,
+        )
+        yield Case(
+            "checkpoint.sync_full_state",
+            lambda: atomic_save(snapshot(net, net_optimizer), weights_path),
+            repeat=3,
+        )
+        writer = CheckpointWriter(directory, keep_last=2)
+        iteration = iter(range(1, 1000))
+        yield Case(
+            "checkpoint.async_stall",
+            lambda: writer.save(net, net_optimizer, iteration=next(iteration)),
+            repeat=3,
+            warmup=0,
+            # Let the previous write finish so only the snapshot is timed.
+            setup=writer.wait,
+        )
+        writer.close()
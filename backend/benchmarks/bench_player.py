@@ -0,0 +1,81 @@
+# benchmarks/bench_player.py
+
+import os
+import tempfile
+
+import chess
+
+from benchmarks.presets import (
+    FAKE_ENGINE_PATH,
+    sample_boards,
+    small_model,
+)
+from benchmarks.runner import Case
+from chess_app.labelling import Labeller
+from chess_app.model import save_model
+from chess_app.registry import ModelRegistry
+from chess_app.search import AlphaBetaSearcher
+
+GAME_PLIES = 80
+
+
+def cases():
+    from chess_app.utils import AIPlayer
+
+    model = small_model()
+    boards = sample_boards(32, seed=1)
+    player = AIPlayer(model=model, device="cpu", side=chess.WHITE, book_path=None)
+
+    def policy_moves():
+        for board in boards:
+            player.side = board.turn
+            player.get_best_move(board)
+
+    yield Case("player.policy_move", policy_moves, items=len(boards))
+
+    searcher = AlphaBetaSearcher(model, "cpu")
+
+    def search_positions():
+        for board in boards[:4]:
+            searcher.clear()
+            searcher.search(board, max_nodes=300, max_time=None)
+
+    yield Case("search.300_nodes", search_positions, items=4, repeat=3)
+
+    def full_game():
+        white = AIPlayer(model=model, device="cpu", side=chess.WHITE, book_path=None)
+        black = AIPlayer(
+            model_path=None,
+            device="cpu",
+            side=chess.BLACK,
+            engine_path=FAKE_ENGINE_PATH,
+            book_path=None,
+        )
+        board = chess.Board()
+        while not board.is_game_over() and len(board.move_stack) < GAME_PLIES:
+            mover = white if board.turn == white.side else black
+            board.push(mover.get_best_move(board))
+        black.close()
+
+    yield Case(f"player.full_game_{GAME_PLIES}_plies", full_game, repeat=3)
+
+    # Engine round trips per labelled sample; the fake engine answers
+    # instantly, so this is the labelling overhead, not search time.
+    labeller = Labeller(FAKE_ENGINE_PATH, workers=1)
+    samples = [(board, next(iter(board.legal_moves))) for board in boards]
+    yield Case(
+        "labelling.label_batch32",
+        lambda: labeller.label(samples),
+        items=len(samples),
+        repeat=3,
+    )
+    labeller.close()
+
+    # Hot reload: load + warm + swap of a new checkpoint, off the move path.
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "model.pth")
+        save_model(model, path)
+        registry = ModelRegistry(path, "cpu")
+        yield Case(
+            "registry.reload", lambda: registry.reload(path, wait=True), repeat=3
+        )
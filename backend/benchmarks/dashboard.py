@@ -0,0 +1,173 @@
+# benchmarks/dashboard.py
+
+"""
+Cost of one training dashboard refresh as the log grows, for the old JSON
+array that was re-read and re-plotted whole every interval and for the
+JSONL log tailed by TrainingSeries:
+
+    old        json.load of the whole file, the epoch/loss/elo lists and
+               the figure serialised for the browser
+    refresh    a refresh after `--append` new epochs: the tail read, the
+               cursor update and the extendData payload
+    new client a browser that connects late: the thinned whole figure
+    catch-up   what TrainingSeries spends reading an existing log the first
+               time, DASHBOARD_READ_BYTES per refresh
+
+plotly is not needed; figures are serialised as the trace dicts it sends.
+
+    python -m benchmarks.dashboard --entries 1000 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks.runner import machine_metadata, save_json
+from chess_app.traininglog import TrainingLog, TrainingSeries
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def entry(epoch):
+    return {
+        "epoch": epoch,
+        "ts": 1700000000.0 + epoch,
+        "loss": 3.0 / (1 + epoch / 1000),
+        "policy": 2.0 / (1 + epoch / 1000),
+        "value": 0.5 / (1 + epoch / 1000),
+        "quality": 0.5 / (1 + epoch / 1000),
+        "elo": 1500 + epoch / 100,
+    }
+
+
+def write_logs(directory, entries):
+    old_path = os.path.join(directory, f"old_{entries}.json")
+    new_path = os.path.join(directory, f"new_{entries}.jsonl")
+    rows = [entry(epoch) for epoch in range(1, entries + 1)]
+    with open(old_path, "w") as f:
+        json.dump(rows, f)
+    with open(new_path, "w") as f:
+        f.writelines(json.dumps(row) + "\n" for row in rows)
+    return old_path, new_path
+
+
+def figure_payload(epochs, losses, elos):
+    return json.dumps(
+        {
+            "data": [
+                {"type": "scatter", "x": epochs, "y": losses, "name": "Loss"},
+                {"type": "scatter", "x": epochs, "y": elos, "name": "Elo Rating"},
+            ]
+        }
+    )
+
+
+def old_refresh(path):
+    # What update_graph_live did every interval.
+    with open(path) as f:
+        data = json.load(f)
+    epochs = [row["epoch"] for row in data]
+    losses = [row["loss"] for row in data]
+    elos = [row["elo"] for row in data]
+    return len(figure_payload(epochs, losses, elos))
+
+
+def points_payload(points):
+    epochs = [point[0] for point in points]
+    return figure_payload(
+        epochs, [point[1] for point in points], [point[2] for point in points]
+    )
+
+
+def timed(fn, rounds):
+    samples = []
+    result = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def measure(directory, entries, args):
+    old_path, new_path = write_logs(directory, entries)
+    row = {"entries": entries}
+    old_rounds = max(1, min(args.rounds, 2_000_000 // entries))
+    row["old_ms"], row["old_bytes"] = timed(lambda: old_refresh(old_path), old_rounds)
+    row["old_ms"] *= 1000
+
+    series = TrainingSeries(new_path)
+    start = time.perf_counter()
+    full, points, cursor = series.update()
+    refreshes = 1
+    while series.tail.offset < os.path.getsize(new_path):
+        full, points, cursor = series.update(cursor)
+        refreshes += 1
+    row["catch_up_ms"] = (time.perf_counter() - start) * 1000
+    row["catch_up_refreshes"] = refreshes
+    full, points, cursor = series.update()
+
+    training_log = TrainingLog(new_path)
+    samples = []
+    sizes = []
+    for _ in range(args.rounds):
+        for _ in range(args.append):
+            training_log.append(**{k: v for k, v in entry(0).items() if k != "epoch"})
+        start = time.perf_counter()
+        full, points, cursor = series.update(cursor)
+        payload = points_payload(points) if points else ""
+        samples.append(time.perf_counter() - start)
+        sizes.append(len(payload))
+    row["refresh_ms"] = statistics.median(samples) * 1000
+    row["refresh_bytes"] = statistics.mean(sizes)
+    row["new_client_ms"], row["new_client_bytes"] = timed(
+        lambda: len(points_payload(series.update()[1])), args.rounds
+    )
+    row["new_client_ms"] *= 1000
+    row["points"] = len(series.series.points)
+    os.remove(old_path)
+    os.remove(new_path)
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Training dashboard refresh cost")
+    parser.add_argument(
+        "--entries", type=int, nargs="+", default=[1000, 10000, 100000, 1000000]
+    )
+    parser.add_argument("--append", type=int, default=1, help="epochs per refresh")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    rows = []
+    print(
+        f"{'Entries':>9}{'old ms':>10}{'old KB':>10}{'refresh ms':>12}"
+        f"{'refresh B':>11}{'new client ms':>15}{'catch-up s':>12}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for entries in args.entries:
+            row = measure(tmp, entries, args)
+            rows.append(row)
+            print(
+                f"{entries:>9}{row['old_ms']:>10.1f}{row['old_bytes'] / 1024:>10.0f}"
+                f"{row['refresh_ms']:>12.3f}{row['refresh_bytes']:>11.0f}"
+                f"{row['new_client_ms']:>15.2f}{row['catch_up_ms'] / 1000:>12.2f}"
+            )
+
+    result_path = os.path.join(
+        args.output, f"dashboard_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(
+        {"metadata": machine_metadata(), "arguments": vars(args), "results": rows},
+        result_path,
+    )
+    print(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
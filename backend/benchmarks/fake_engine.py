@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# benchmarks/fake_engine.py
+
+"""
+A tiny UCI engine for offline benchmarks and load tests. It answers every
+`go` immediately with a deterministic move (best capture by material, else
+a move picked from the position hash) so runs need no Stockfish binary and
+are repeatable. `go infinite` / `go ponder` wait for `stop`. FAKE_ENGINE_MOVETIME_MS makes
+every other `go` think for that long first, like a real search would.
+
+Point the app at it with CHESS_ENGINE_PATH=benchmarks/fake_engine.py.
+"""
+
+import os
+import sys
+import time
+import zlib
+
+import chess
+
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 300,
+    chess.BISHOP: 300,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0,
+}
+MOVETIME = float(os.environ.get("FAKE_ENGINE_MOVETIME_MS", 0)) / 1000
+
+
+def material(board):
+    score = 0
+    for piece in board.piece_map().values():
+        value = PIECE_VALUES[piece.piece_type]
+        score += value if piece.color == board.turn else -value
+    return score
+
+
+def ranked_moves(board):
+    seed = zlib.crc32(board.board_fen().encode()) & 0xFFFF
+
+    def key(move):
+        victim = board.piece_type_at(move.to_square)
+        capture = PIECE_VALUES[victim] if victim else 0
+        return (capture, (move.from_square * 64 + move.to_square + seed) % 97)
+
+    return sorted(board.legal_moves, key=key, reverse=True)
+
+
+def send(line):
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+
+def answer(board, multipv, final=True):
+    moves = ranked_moves(board)
+    if not moves:
+        send("info depth 0 score mate 0")
+        if final:
+            send("bestmove (none)")
+        return
+    base = material(board)
+    for rank, move in enumerate(moves[:multipv], start=1):
+        send(
+            f"info depth 1 seldepth 1 multipv {rank} score cp {base - rank} "
+            f"nodes 1 pv {move.uci()}"
+        )
+    if final:
+        send(f"bestmove {moves[0].uci()}")
+
+
+def main():
+    board = chess.Board()
+    multipv = 1
+    waiting = False
+    for line in sys.stdin:
+        tokens = line.split()
+        if not tokens:
+            continue
+        command = tokens[0]
+        if command == "uci":
+            send("id name FakeEngine")
+            send("id author ChessAI benchmarks")
+            send("option name Skill Level type spin default 20 min 0 max 20")
+            send("option name MultiPV type spin default 1 min 1 max 500")
+            send("option name Threads type spin default 1 min 1 max 512")
+            send("option name Hash type spin default 16 min 1 max 33554432")
+            send("option name Ponder type check default false")
+            send("uciok")
+        elif command == "isready":
+            send("readyok")
+        elif command == "setoption" and "MultiPV" in tokens:
+            multipv = int(tokens[-1])
+        elif command == "ucinewgame":
+            board = chess.Board()
+        elif command == "position":
+            if tokens[1] == "startpos":
+                board = chess.Board()
+                rest = tokens[2:]
+            else:
+                fen_end = tokens.index("moves") if "moves" in tokens else len(tokens)
+                board = chess.Board(" ".join(tokens[2:fen_end]))
+                rest = tokens[fen_end:]
+            if rest and rest[0] == "moves":
+                for uci in rest[1:]:
+                    board.push_uci(uci)
+        elif command == "go":
+            if "infinite" in tokens or "ponder" in tokens:
+                # Report once like a real engine would, then wait for stop.
+                answer(board, multipv, final=False)
+                waiting = True
+            else:
+                if MOVETIME:
+                    time.sleep(MOVETIME)
+                answer(board, multipv)
+        elif command in ("stop", "ponderhit"):
+            if waiting:
+                waiting = False
+                answer(board, multipv)
+        elif command == "quit":
+            break
+
+
+if __name__ == "__main__":
+    main()
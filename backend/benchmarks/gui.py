@@ -0,0 +1,187 @@
+# benchmarks/gui.py
+
+"""
+Desktop board rendering while watching a fast engine-vs-engine game
+(benchmarks/fake_engine.py's move choice, no think time):
+
+    sprites   loading the twelve pieces per call, as load_piece_images did
+              before the cache, against the per-size sprite cache, while
+              the window is resized between a few square sizes
+    frames    per-move frame time for a full repaint (draw_board) and for
+              the incremental refresh(), each flushed to the screen
+    squares   squares repainted per move by refresh()
+
+Frames need a display (e.g. `xvfb-run python -m benchmarks.gui`); without
+one only the sprite and square counts run. Placeholder PNGs are generated
+when the assets directory is missing.
+
+    python -m benchmarks.gui --plies 200
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import chess
+from PIL import Image, ImageDraw
+
+from benchmarks.fake_engine import ranked_moves
+from benchmarks.runner import machine_metadata, save_json
+from chess_app import board as board_module
+from chess_app.board import PIECE_FILENAMES, ChessBoard, piece_sprites
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SQUARE_SIZES = [60, 64, 72, 80]
+
+
+def placeholder_assets(directory):
+    for piece, filename in PIECE_FILENAMES.items():
+        image = Image.new("RGBA", (256, 256), (0, 0, 0, 0))
+        fill = (250, 250, 250, 255) if piece.isupper() else (20, 20, 20, 255)
+        draw = ImageDraw.Draw(image)
+        draw.ellipse((24, 24, 232, 232), fill=fill, outline=(128, 128, 128, 255))
+        draw.text((112, 112), piece, fill=(200, 0, 0, 255))
+        image.save(os.path.join(directory, filename))
+
+
+def load_uncached(square_size):
+    # What load_piece_images did on every call before the cache.
+    images = {}
+    for piece, filename in PIECE_FILENAMES.items():
+        image = Image.open(os.path.join(board_module.ASSETS_PATH, filename))
+        image = image.convert("RGBA").resize(
+            (square_size - 10, square_size - 10), Image.LANCZOS
+        )
+        background = Image.new("RGBA", image.size, (255, 255, 255, 0))
+        images[piece] = Image.alpha_composite(background, image)
+    return images
+
+
+def time_calls(fn, sizes, rounds):
+    samples = []
+    for _ in range(rounds):
+        for size in sizes:
+            start = time.perf_counter()
+            fn(size)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def play_game(plies):
+    board = chess.Board()
+    positions = []
+    while not board.is_game_over() and len(positions) < plies:
+        move = ranked_moves(board)[0]
+        board.push(move)
+        positions.append((board.copy(), (move.from_square, move.to_square)))
+    return positions
+
+
+def frame_times(view, positions, full, flush):
+    samples = []
+    for position, last_move in positions:
+        view.board = position
+        view.last_move = last_move
+        start = time.perf_counter()
+        if full:
+            view.draw_board()
+        else:
+            view.refresh()
+        flush()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[int(0.95 * (len(samples) - 1))] * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Desktop board rendering")
+    parser.add_argument("--plies", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        if not os.path.exists(
+            os.path.join(board_module.ASSETS_PATH, PIECE_FILENAMES["K"])
+        ):
+            placeholder_assets(tmp)
+            board_module.ASSETS_PATH = tmp
+            results["placeholder_assets"] = True
+
+        uncached = time_calls(load_uncached, SQUARE_SIZES, args.rounds)
+        piece_sprites(SQUARE_SIZES[0])  # decode the PNGs once
+        start = time.perf_counter()
+        for size in SQUARE_SIZES:
+            piece_sprites(size)
+        first_build = (time.perf_counter() - start) / len(SQUARE_SIZES)
+        cached = time_calls(piece_sprites, SQUARE_SIZES, args.rounds)
+        results["sprites"] = {
+            "uncached_ms": uncached * 1000,
+            "first_build_ms": first_build * 1000,
+            "cached_ms": cached * 1000,
+        }
+        print(
+            f"Sprites per resize: uncached {uncached * 1000:.2f} ms, first build "
+            f"{first_build * 1000:.2f} ms, cached {cached * 1000:.4f} ms"
+        )
+
+        positions = play_game(args.plies)
+        view = ChessBoard()
+        counts = []
+        for position, last_move in positions:
+            view.board = position
+            view.last_move = last_move
+            counts.append(view.refresh())
+        results["squares"] = {
+            "plies": len(positions),
+            "mean": statistics.mean(counts[1:]),
+            "max": max(counts[1:]),
+            "full": 64,
+        }
+        print(
+            f"Squares repainted per move over {len(positions)} plies: mean "
+            f"{results['squares']['mean']:.1f}, max {results['squares']['max']} "
+            f"(full repaint: 64)"
+        )
+
+        try:
+            import tkinter as tk
+
+            root = tk.Tk()
+        except Exception as e:
+            print(f"No display for frame times ({e}).")
+        else:
+            size = SQUARE_SIZES[0]
+            canvas = tk.Canvas(root, width=8 * size, height=8 * size)
+            canvas.pack()
+            view = ChessBoard(canvas=canvas)
+            view.draw_board()
+            root.update()
+            for name, full in (("full", True), ("incremental", False)):
+                results[name] = frame_times(view, positions, full, root.update)
+                print(
+                    f"Frame per move, {name}: median "
+                    f"{results[name]['median_ms']:.2f} ms, p95 "
+                    f"{results[name]['p95_ms']:.2f} ms"
+                )
+            root.destroy()
+
+    result_path = os.path.join(
+        args.output, f"gui_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(
+        {"metadata": machine_metadata(), "arguments": vars(args), "results": results},
+        result_path,
+    )
+    print(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
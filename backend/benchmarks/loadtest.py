@@ -0,0 +1,272 @@
+# benchmarks/loadtest.py
+
+"""
+Simulated players against a locally launched server (benchmarks/fake_engine.py
+and a small network). Each client plays whole games: start_game, then per
+turn get_board, a think pause, make_move with a random legal move, ai_move,
+and now and then undo_move twice to take the pair back. The number of
+clients ramps up in stages and each stage reports throughput, p50/p95/p99
+latency per route and how requests failed:
+
+    rejected   4xx; on api.py mostly clients colliding in its single game
+    errors     5xx and connection failures
+
+A stage is sustained while errors and rejections together stay under
+--max-error-rate and every route's p95 is under --slo-ms.
+
+    python -m benchmarks.loadtest --server flask asgi --clients 1 4 16 64
+    python -m benchmarks.loadtest --baseline results/loadtest_<earlier>.json
+
+api.py holds one game per process, so its clients share it; asgi_api.py
+gives each client its own game (?game=client-N).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.runner import load_json, machine_metadata, save_json
+from benchmarks.servers import BENCHMARK_DIR, Connection, Server, percentile
+from benchmarks.workers import write_checkpoint
+
+ROUTES = ["start_game", "get_board", "make_move", "ai_move", "undo_move"]
+
+
+class Stats:
+    def __init__(self):
+        # Every request once, whether it got a response or not.
+        self.requests = {route: 0 for route in ROUTES}
+        self.latencies = {route: [] for route in ROUTES}
+        self.rejected = {route: 0 for route in ROUTES}
+        self.errors = {route: 0 for route in ROUTES}
+        self.games = 0
+        self.moves = 0
+
+    def summary(self, elapsed):
+        routes = {}
+        for route in ROUTES:
+            latencies = self.latencies[route]
+            total = self.requests[route]
+            if not total:
+                continue
+            routes[route] = {
+                "requests": total,
+                "p50_ms": (percentile(latencies, 0.5) or 0) * 1000,
+                "p95_ms": (percentile(latencies, 0.95) or 0) * 1000,
+                "p99_ms": (percentile(latencies, 0.99) or 0) * 1000,
+                "rejected_rate": self.rejected[route] / total,
+                "error_rate": self.errors[route] / total,
+            }
+        requests = sum(row["requests"] for row in routes.values())
+        errors = sum(self.errors.values())
+        return {
+            "requests": requests,
+            "requests_per_second": requests / elapsed,
+            "moves_per_second": self.moves / elapsed,
+            "games_completed": self.games,
+            "error_rate": errors / requests if requests else 0.0,
+            "rejected_rate": sum(self.rejected.values()) / requests if requests else 0,
+            "routes": routes,
+        }
+
+
+class Player:
+    def __init__(self, index, port, args, stats, stop):
+        self.game = f"client-{index}"
+        self.connection = Connection(port)
+        self.args = args
+        self.stats = stats
+        self.stop = stop
+        self.rng = random.Random(index)
+
+    async def call(self, route, method, path, payload=None):
+        """The response body, or None when the request failed."""
+        self.stats.requests[route] += 1
+        start = time.perf_counter()
+        try:
+            status, _, body = await self.connection.request(method, path, payload)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            self.connection.close()
+            self.stats.errors[route] += 1
+            return None
+        self.stats.latencies[route].append(time.perf_counter() - start)
+        if status >= 500:
+            self.stats.errors[route] += 1
+        elif status >= 400:
+            self.stats.rejected[route] += 1
+        return body if status == 200 else None
+
+    async def think(self):
+        if self.args.think:
+            await asyncio.sleep(self.rng.expovariate(1 / self.args.think))
+
+    async def run(self):
+        query = f"?game={self.game}"
+        while not self.stop.is_set():
+            started = await self.call(
+                "start_game", "POST", f"/api/start_game/{self.args.mode}{query}"
+            )
+            if started is None:
+                await asyncio.sleep(0.1)
+                continue
+            for _ in range(self.args.max_moves):
+                if self.stop.is_set():
+                    break
+                board = await self.call("get_board", "GET", f"/api/get_board{query}")
+                if board is None or board.get("gameOver"):
+                    break
+                await self.think()
+                if not board["legalMoves"]:
+                    break
+                move = self.rng.choice(board["legalMoves"])
+                played = await self.call(
+                    "make_move", "POST", f"/api/make_move{query}", {"move": move}
+                )
+                if played is None:
+                    continue
+                if played.get("gameOver"):
+                    break
+                reply = await self.call("ai_move", "POST", f"/api/ai_move{query}")
+                if reply is None:
+                    continue
+                self.stats.moves += 1
+                if reply.get("gameOver"):
+                    break
+                if self.rng.random() < self.args.undo_rate:
+                    for _ in range(2):
+                        await self.call("undo_move", "POST", f"/api/undo_move{query}")
+            self.stats.games += 1
+        self.connection.close()
+
+
+async def run_stage(server, clients, args):
+    stats = Stats()
+    stop = asyncio.Event()
+    players = [Player(i, server.port, args, stats, stop) for i in range(clients)]
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(player.run()) for player in players]
+    await asyncio.sleep(args.duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    return stats.summary(elapsed)
+
+
+def sustained(stage, args):
+    # A rejected move in a client's own game is as much a failure as a 500.
+    failures = stage["error_rate"] + stage["rejected_rate"]
+    return failures <= args.max_error_rate and all(
+        route["p95_ms"] <= args.slo_ms for route in stage["routes"].values()
+    )
+
+
+def sustained_clients(stages):
+    """The most clients for which this and every smaller stage was sustained."""
+    best = 0
+    for stage in sorted(stages, key=lambda stage: stage["clients"]):
+        if not stage["sustained"]:
+            break
+        best = stage["clients"]
+    return best
+
+
+def print_stage(kind, stage, baseline=None):
+    line = (
+        f"{kind:<6}{stage['clients']:>6} clients  {stage['requests_per_second']:7.1f} "
+        f"req/s  {stage['moves_per_second']:6.1f} moves/s  errors "
+        f"{stage['error_rate']:6.2%}  rejected {stage['rejected_rate']:6.2%}"
+    )
+    if baseline:
+        ratio = stage["requests_per_second"] / max(
+            baseline["requests_per_second"], 1e-9
+        )
+        line += f"  ({ratio:.2f}x baseline req/s)"
+    print(line)
+    for route, row in stage["routes"].items():
+        line = (
+            f"{'':<14}{route:<11}p50 {row['p50_ms']:7.1f}  p95 {row['p95_ms']:7.1f}  "
+            f"p99 {row['p99_ms']:7.1f} ms"
+        )
+        base = (baseline or {}).get("routes", {}).get(route)
+        if base and base["p95_ms"] > 0:
+            line += f"  (p95 {row['p95_ms'] / base['p95_ms']:.2f}x baseline)"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent game load test")
+    parser.add_argument("--server", choices=["flask", "asgi"], nargs="+")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--duration", type=float, default=20.0, help="s per stage")
+    parser.add_argument("--think", type=float, default=0.5, help="mean think s")
+    parser.add_argument("--undo-rate", type=float, default=0.05)
+    parser.add_argument("--max-moves", type=int, default=60, help="per game")
+    parser.add_argument("--mode", default="user_vs_cai")
+    parser.add_argument("--movetime-ms", type=int, default=20)
+    parser.add_argument("--slo-ms", type=float, default=500.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--blocks", type=int, default=2)
+    parser.add_argument("--channels", type=int, default=32)
+    parser.add_argument("--head-channels", type=int, default=8)
+    parser.add_argument("--baseline", help="earlier loadtest JSON to compare with")
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+    servers = args.server or ["flask", "asgi"]
+
+    baseline = load_json(args.baseline) if args.baseline else None
+    if args.baseline and baseline is None:
+        print(f"No baseline at {args.baseline}")
+    baseline_stages = {
+        (row["server"], row["clients"]): row
+        for row in (baseline or {}).get("results", [])
+    }
+    if baseline:
+        print(f"Baseline: {baseline['metadata'].get('revision')} ({args.baseline})")
+
+    rows = []
+    summary = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.pth")
+        write_checkpoint(model_path, args.blocks, args.channels, args.head_channels)
+        for kind in servers:
+            server = Server(kind, args.movetime_ms, model_path)
+            try:
+                for clients in args.clients:
+                    stage = asyncio.run(run_stage(server, clients, args))
+                    stage["server"] = kind
+                    stage["clients"] = clients
+                    stage["rss_mb"], stage["threads"] = server.status()
+                    stage["sustained"] = sustained(stage, args)
+                    rows.append(stage)
+                    print_stage(kind, stage, baseline_stages.get((kind, clients)))
+            finally:
+                server.stop()
+            summary[kind] = sustained_clients(
+                [row for row in rows if row["server"] == kind]
+            )
+            print(
+                f"{kind}: sustained up to {summary[kind]} clients "
+                f"(p95 <= {args.slo_ms:.0f} ms, failures <= {args.max_error_rate:.0%})"
+            )
+
+    result_path = os.path.join(
+        args.output, f"loadtest_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(
+        {
+            "metadata": machine_metadata(),
+            "arguments": vars(args),
+            "sustained_clients": summary,
+            "results": rows,
+        },
+        result_path,
+    )
+    print(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# benchmarks/polling.py
+
+"""
+Bytes sent and server CPU for one minute of a client polling /api/get_board
+while a game is played, for each way of polling:
+
+    legacy    the old handler: FEN, legal moves and SAN rebuilt per poll
+    full      the versioned snapshot, full body every poll
+    etag      If-None-Match, so unchanged polls get a bodiless 304
+    compact   etag plus ?since=N&compact=1 (only changed fields)
+    longpoll  ?since=N&wait=S&compact=1, one request per change
+
+    python -m benchmarks.polling --poll-interval 1 --move-interval 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+os.environ.setdefault("CHESS_MODEL_PATH", os.path.join(BENCHMARK_DIR, "no_model.pth"))
+# Every move is logged; keep the console for the report.
+os.environ.setdefault("CHESS_LOG_LEVEL", "WARNING")
+
+import chess  # noqa: E402
+from flask import jsonify  # noqa: E402
+
+from benchmarks.runner import machine_metadata, save_json  # noqa: E402
+
+MODES = ["legacy", "full", "etag", "compact", "longpoll"]
+
+
+def response_bytes(response):
+    status = f"HTTP/1.1 {response.status}\r\n"
+    headers = "".join(f"{key}: {value}\r\n" for key, value in response.headers)
+    return len(status) + len(headers) + 2 + len(response.get_data())
+
+
+def run_minute(client, mode, opening_plies, poll_interval, move_interval):
+    """
+    Replays one minute: a move every `move_interval` seconds and, except for
+    long-polling, a poll every `poll_interval` seconds. Only the polls are
+    measured. Long-polls never wait here: each one is issued right after the
+    change it would have woken up for.
+    """
+    rng = random.Random(0)
+    client.post("/api/start_game/user_vs_user")
+    board = chess.Board()
+    for _ in range(opening_plies):
+        move = rng.choice(list(board.legal_moves))
+        board.push(move)
+        client.post("/api/make_move", json={"move": move.uci()})
+
+    etag = None
+    version = None
+    totals = {"requests": 0, "not_modified": 0, "bytes": 0, "cpu": 0.0}
+
+    def poll(url, headers=None):
+        nonlocal etag, version
+        start = time.process_time()
+        response = client.get(url, headers=headers or {})
+        totals["cpu"] += time.process_time() - start
+        totals["requests"] += 1
+        totals["bytes"] += response_bytes(response)
+        if response.status_code == 304:
+            totals["not_modified"] += 1
+        else:
+            etag = response.headers.get("ETag")
+            version = response.get_json()["version"] if mode != "legacy" else None
+
+    def conditional():
+        return {"If-None-Match": etag} if etag else {}
+
+    poll("/api/legacy_get_board" if mode == "legacy" else "/api/get_board")
+    ticks = int(60 / poll_interval)
+    moves_every = int(move_interval / poll_interval)
+    for tick in range(1, ticks + 1):
+        moved = tick % moves_every == 0 and not board.is_game_over()
+        if moved:
+            move = rng.choice(list(board.legal_moves))
+            board.push(move)
+            client.post("/api/make_move", json={"move": move.uci()})
+        if mode == "legacy":
+            poll("/api/legacy_get_board")
+        elif mode == "full":
+            poll("/api/get_board")
+        elif mode == "etag":
+            poll("/api/get_board", conditional())
+        elif mode == "compact":
+            poll(f"/api/get_board?since={version}&compact=1", conditional())
+        elif mode == "longpoll" and moved:
+            poll(f"/api/get_board?since={version}&wait=25&compact=1", conditional())
+    return totals
+
+
+def install_legacy_route(api):
+    # The handler as it was before versioned state, for the baseline.
+    def legacy_get_board():
+        board = api.current_board
+        return jsonify(
+            {
+                "fen": api.board_to_fen(board),
+                "legalMoves": api.get_legal_moves(board),
+                "moves": api.get_moves_san(board),
+                "gameOver": board.is_game_over(),
+                "turn": "white" if board.turn == chess.WHITE else "black",
+            }
+        )
+
+    api.app.add_url_rule("/api/legacy_get_board", view_func=legacy_get_board)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="get_board polling cost")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--move-interval", type=float, default=10.0)
+    parser.add_argument("--opening-plies", type=int, default=60)
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    import api
+
+    install_legacy_route(api)
+    client = api.app.test_client()
+
+    rows = []
+    print(f"{'Mode':<10}{'Requests':>9}{'304s':>6}{'KB/min':>9}{'CPU ms/min':>12}")
+    for mode in MODES:
+        totals = run_minute(
+            client,
+            mode,
+            args.opening_plies,
+            args.poll_interval,
+            args.move_interval,
+        )
+        rows.append({"mode": mode, **totals})
+        print(
+            f"{mode:<10}{totals['requests']:>9}{totals['not_modified']:>6}"
+            f"{totals['bytes'] / 1024:>9.1f}{totals['cpu'] * 1000:>12.1f}"
+        )
+    api.model_registry.close()
+
+    result_path = os.path.join(
+        args.output, f"polling_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(
+        {"metadata": machine_metadata(), "arguments": vars(args), "results": rows},
+        result_path,
+    )
+    print(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
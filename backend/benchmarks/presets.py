@@ -0,0 +1,39 @@
+# benchmarks/presets.py
+
+import os
+import random
+
+import chess
+import torch
+
+from chess_app.model import ChessNet
+
+FAKE_ENGINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "fake_engine.py"
+)
+
+# Small enough to run a full benchmark pass on a laptop CPU in seconds.
+SMALL_MODEL = {"num_residual_blocks": 2, "channels": 32, "head_channels": 8}
+
+
+def small_model(seed=0):
+    torch.manual_seed(seed)
+    model = ChessNet(**SMALL_MODEL)
+    model.eval()
+    return model
+
+
+def sample_boards(count, seed=0, max_plies=60):
+    """Deterministic positions reached by random play from the start."""
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        board = chess.Board()
+        for _ in range(rng.randint(0, max_plies)):
+            moves = list(board.legal_moves)
+            if not moves:
+                break
+            board.push(rng.choice(moves))
+        if not board.is_game_over():
+            boards.append(board)
+    return boards
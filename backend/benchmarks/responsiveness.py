@@ -0,0 +1,103 @@
+# benchmarks/responsiveness.py
+
+"""
+Event-loop stalls of the desktop app while the AI plays itself, with every
+search run inline on the Tk thread (as main.py did) and on the AIWorker.
+StallMonitor probes the loop every STALL_PROBE_MS; a stall is how late a
+probe ran, i.e. how long the window could not redraw or take a click.
+
+Runs on a bare Tcl interpreter, so no display is needed: the after() queue
+is the same one Tk uses. The AIPlayer searches (mode="search") with a
+checkpoint of the given size and a clock of --clock seconds per side, so a
+move takes what TimeManager budgets for it.
+
+    python -m benchmarks.responsiveness --plies 20 --clock 30
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tkinter
+
+import chess
+
+from benchmarks.runner import machine_metadata, save_json
+from benchmarks.servers import BENCHMARK_DIR
+from benchmarks.workers import write_checkpoint
+from chess_app.utils import AIPlayer
+from chess_app.worker import AIWorker, StallMonitor
+
+
+def play(root, player, plies, clock, worker=None):
+    monitor = StallMonitor(root)
+    board = chess.Board()
+    finished = []
+
+    def step():
+        if board.is_game_over() or len(board.move_stack) >= plies:
+            finished.append(True)
+            return
+        player.side = board.turn
+        if worker is None:
+            move_played(player.get_best_move(board, remaining=clock))
+        else:
+            position = board.copy()
+            worker.submit(
+                lambda: player.get_best_move(position, remaining=clock), move_played
+            )
+
+    def move_played(move):
+        board.push(move)
+        root.after(1, step)
+
+    root.after(1, step)
+    while not finished:
+        root.tk.dooneevent(0)
+    return monitor.report()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Desktop event-loop stalls")
+    parser.add_argument("--plies", type=int, default=20)
+    parser.add_argument("--clock", type=float, default=30.0, help="s per side")
+    parser.add_argument("--blocks", type=int, default=4)
+    parser.add_argument("--channels", type=int, default=64)
+    parser.add_argument("--head-channels", type=int, default=16)
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.pth")
+        write_checkpoint(model_path, args.blocks, args.channels, args.head_channels)
+        player = AIPlayer(
+            model_path=model_path,
+            device="cpu",
+            book_path=None,
+            mode="search",
+        )
+        root = tkinter.Tcl()
+        worker = AIWorker(root)
+        for name, run_on in (("inline", None), ("worker", worker)):
+            results[name] = play(root, player, args.plies, args.clock, run_on)
+            print(
+                f"{name:<8} max stall {results[name]['max_stall_ms']:8.1f} ms  "
+                f"mean {results[name]['mean_stall_ms']:7.1f} ms  "
+                f"{args.plies} plies in {results[name]['seconds']:.1f} s"
+            )
+        worker.shutdown()
+
+    result_path = os.path.join(
+        args.output, f"responsiveness_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(
+        {"metadata": machine_metadata(), "arguments": vars(args), "results": results},
+        result_path,
+    )
+    print(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
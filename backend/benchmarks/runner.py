@@ -0,0 +1,147 @@
+# benchmarks/runner.py
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+
+import torch
+
+
+class Case:
+    """
+    One benchmark: `fn` is called `number` times per repeat and the timings
+    are reported per item (e.g. per board, per position in a batch).
+    `setup`, if given, runs untimed before each repeat.
+    """
+
+    def __init__(self, name, fn, items=1, number=1, repeat=5, warmup=1, setup=None):
+        self.name = name
+        self.fn = fn
+        self.items = items
+        self.number = number
+        self.repeat = repeat
+        self.warmup = warmup
+        self.setup = setup
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_metadata():
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "cpu_count": os.cpu_count(),
+        "torch_threads": torch.get_num_threads(),
+    }
+
+
+def measure(case, repeat=None):
+    for _ in range(case.warmup):
+        case.fn()
+    samples = []
+    for _ in range(repeat or case.repeat):
+        if case.setup:
+            case.setup()
+        start = time.perf_counter()
+        for _ in range(case.number):
+            case.fn()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed / (case.number * case.items))
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "items": case.items,
+        "number": case.number,
+        "repeat": len(samples),
+    }
+
+
+def run_cases(cases, name_filter=None, repeat=None, log=print, suite=None):
+    """Returns (results, failures), failures mapping case name to the error."""
+    results = {}
+    failures = {}
+    for case in cases:
+        if name_filter and name_filter not in case.name:
+            continue
+        try:
+            results[case.name] = measure(case, repeat)
+        except Exception as e:
+            log(f"{case.name}: failed ({e})")
+            failures[case.name] = repr(e)
+            continue
+        results[case.name]["suite"] = suite
+        log(f"{case.name:<40}{format_seconds(results[case.name]['median']):>12}")
+    return results, failures
+
+
+def missing_cases(results, baseline, suites=None, name_filter=None):
+    """
+    Baseline cases this run should have measured but did not, e.g. a case
+    that was renamed or removed. Cases outside the selected suites or the
+    filter are not expected; baselines without suite names only count on
+    a run of every suite.
+    """
+    missing = []
+    for name, base in baseline.get("results", {}).items():
+        if name in results or (name_filter and name_filter not in name):
+            continue
+        if suites and base.get("suite") not in suites:
+            continue
+        missing.append(name)
+    return sorted(missing)
+
+
+def compare(results, baseline, threshold):
+    """Returns (name, baseline median, current median, ratio) for each regression."""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or base["median"] <= 0:
+            continue
+        ratio = stats["median"] / base["median"]
+        if ratio > 1.0 + threshold:
+            regressions.append((name, base["median"], stats["median"], ratio))
+    return regressions
+
+
+def format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def load_json(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_json(data, path):
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
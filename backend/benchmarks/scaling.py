@@ -0,0 +1,116 @@
+# benchmarks/scaling.py
+
+"""
+Data-parallel training throughput for 1..N local gloo processes on one
+machine (strong scaling: the same dataset split across more ranks).
+
+    python -m benchmarks.scaling --procs 1 2 4 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import torch
+import torch.optim as optim
+
+from benchmarks.presets import sample_boards
+from benchmarks.runner import machine_metadata, save_json
+from chess_app import distributed
+from chess_app.data import board_to_tensor, move_to_index
+from chess_app.model import ChessNet
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL = {"num_residual_blocks": 4, "channels": 64, "head_channels": 16}
+
+
+def make_training_data(samples):
+    boards = sample_boards(256, seed=2)
+    data = []
+    for i in range(samples):
+        board = boards[i % len(boards)]
+        move = list(board.legal_moves)[0]
+        data.append(
+            (board_to_tensor(board).numpy(), move_to_index(move), 0.5, "Average Step")
+        )
+    return data
+
+
+def measure(samples, epochs, batch_size, result_path):
+    from train import train_model
+
+    torch.manual_seed(0)
+    model = ChessNet(**MODEL)
+    optimizer = optim.Adam(model.parameters(), lr=1e-4)
+    training_data = make_training_data(samples)
+    # One untimed epoch for DataLoader workers, allocator and DDP buckets.
+    train_model(model, "cpu", training_data, 1, batch_size, optimizer=optimizer)
+    distributed.barrier()
+    start = time.perf_counter()
+    train_model(model, "cpu", training_data, epochs, batch_size, optimizer=optimizer)
+    distributed.barrier()
+    elapsed = time.perf_counter() - start
+    if distributed.is_main_process():
+        with open(result_path, "w") as f:
+            json.dump({"seconds": elapsed}, f)
+
+
+def run(procs, samples, epochs, batch_size):
+    with tempfile.TemporaryDirectory() as directory:
+        result_path = os.path.join(directory, "result.json")
+        if procs == 1:
+            measure(samples, epochs, batch_size, result_path)
+        else:
+            distributed.spawn(measure, procs, samples, epochs, batch_size, result_path)
+        with open(result_path, "r") as f:
+            return json.load(f)["seconds"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DDP scaling on one machine")
+    parser.add_argument("--procs", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--samples", type=int, default=4096)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    rows = []
+    baseline = None
+    print(f"{'Procs':>5}{'Seconds':>10}{'Samples/s':>12}{'Speedup':>9}{'Eff.':>7}")
+    for procs in args.procs:
+        seconds = run(procs, args.samples, args.epochs, args.batch_size)
+        throughput = args.samples * args.epochs / seconds
+        if baseline is None:
+            # Efficiency is relative to the first (smallest) process count.
+            baseline = (procs, throughput)
+        speedup = throughput / baseline[1]
+        efficiency = speedup * baseline[0] / procs
+        rows.append(
+            {
+                "procs": procs,
+                "seconds": seconds,
+                "samples_per_second": throughput,
+                "speedup": speedup,
+                "efficiency": efficiency,
+            }
+        )
+        print(
+            f"{procs:>5}{seconds:>10.2f}{throughput:>12.1f}{speedup:>9.2f}"
+            f"{efficiency:>7.0%}"
+        )
+
+    result_path = os.path.join(
+        args.output, f"scaling_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(
+        {"metadata": machine_metadata(), "model": MODEL, "results": rows}, result_path
+    )
+    print(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+# benchmarks/servers.py
+
+"""
+Flask (api.py, threaded) against ASGI (asgi_api.py under uvicorn), each run
+as a real server process on a local port:
+
+    reads       C clients polling /api/get_board: requests/s, p50/p95
+    spectators  N clients long-polling one game while a player asks for
+                engine moves: move latency, how long a move takes to reach
+                the spectators, server RSS and threads
+    games       (ASGI only) memory for M idle games held open
+
+Both servers use benchmarks/fake_engine.py with FAKE_ENGINE_MOVETIME_MS so
+an engine move blocks like a short real search.
+
+    python -m benchmarks.servers --spectators 100 500 --games 2000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.runner import machine_metadata, save_json
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+SERVERS = {
+    "flask": "import api; api.app.run(port={port}, threaded=True)",
+    "asgi": "import uvicorn; uvicorn.run('asgi_api:app', port={port}, "
+    "log_level='warning')",
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def process_status(pid):
+    """Resident memory (MB) and thread count of a server process."""
+    status = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            status[key] = value.split()
+    return int(status["VmRSS"][0]) / 1024, int(status["Threads"][0])
+
+
+class Connection:
+    """
+    One keep-alive HTTP/1.1 connection. A full client library costs more
+    CPU per request than the servers being measured, which on a small
+    machine turns the load generator into the bottleneck.
+    """
+
+    def __init__(self, port):
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None, headers=None):
+        for attempt in range(2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(
+                    "127.0.0.1", self.port
+                )
+            try:
+                return await self._send(method, path, payload, headers or {})
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server closed an idle keep-alive connection.
+                self.close()
+                if attempt:
+                    raise
+
+    async def _send(self, method, path, payload, headers):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        lines = [f"{method} {path} HTTP/1.1", "Host: 127.0.0.1"]
+        lines += [f"{key}: {value}" for key, value in headers.items()]
+        if payload is not None:
+            lines += ["Content-Type: application/json"]
+        lines += [f"Content-Length: {len(body)}", "", ""]
+        self.writer.write("\r\n".join(lines).encode() + body)
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        response_headers = {}
+        for line in header_lines:
+            key, _, value = line.partition(":")
+            response_headers[key.strip().lower()] = value.strip()
+        length = int(response_headers.get("content-length", 0))
+        data = await self.reader.readexactly(length) if length else b""
+        if response_headers.get("connection", "").lower() == "close":
+            self.close()
+        status = int(status_line.split()[1])
+        return status, response_headers, json.loads(data) if data else None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class Server:
+    def __init__(self, kind, movetime_ms, model_path=None):
+        self.kind = kind
+        self.port = free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        env = dict(os.environ)
+        env.update(
+            CHESS_MODEL_PATH=model_path or os.path.join(BENCHMARK_DIR, "no_model.pth"),
+            CHESS_ENGINE_PATH=os.path.join(BENCHMARK_DIR, "fake_engine.py"),
+            CHESS_LOG_LEVEL="WARNING",
+            FAKE_ENGINE_MOVETIME_MS=str(movetime_ms),
+        )
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", SERVERS[kind].format(port=self.port)],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                urllib.request.urlopen(self.url + "/metrics", timeout=1).close()
+                break
+            except (urllib.error.URLError, ConnectionError):
+                if time.monotonic() > deadline or self.process.poll() is not None:
+                    raise RuntimeError(f"{kind} server did not start")
+                time.sleep(0.2)
+
+    def status(self):
+        return process_status(self.process.pid)
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait(timeout=30)
+
+
+async def reads(server, clients, duration):
+    latencies = []
+    await Connection(server.port).request("POST", "/api/start_game/user_vs_user")
+    deadline = time.monotonic() + duration
+
+    async def poll():
+        connection = Connection(server.port)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            await connection.request("GET", "/api/get_board")
+            latencies.append(time.perf_counter() - start)
+        connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(poll() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    return {
+        "clients": clients,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+    }
+
+
+async def spectators(server, watchers, moves):
+    """
+    One game of the engine against itself, watched by `watchers` long-polls
+    that re-poll with ?since= after every update they receive.
+    """
+    player = Connection(server.port)
+    await player.request("POST", "/api/start_game/watch_cai_vs_stockfish")
+    # Start the engine before timing; the ASGI pool starts engines lazily.
+    await player.request("POST", "/api/ai_move")
+    _, _, board = await player.request("GET", "/api/get_board")
+    version = board["version"]
+    done = asyncio.Event()
+    # When the player saw each version; a spectator's lag is measured from
+    # there. Versions that land back to back reach a spectator in one
+    # compact response, so not every version is seen by everyone.
+    made = {}
+    lags = []
+    errors = 0
+
+    async def watch():
+        nonlocal errors
+        connection = Connection(server.port)
+        since = version
+        while not done.is_set():
+            try:
+                _, _, body = await connection.request(
+                    "GET", f"/api/get_board?since={since}&wait=5&compact=1"
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                errors += 1
+                continue
+            since = body["version"]
+            if since in made:
+                lags.append(max(0.0, time.perf_counter() - made[since]))
+        connection.close()
+
+    tasks = [asyncio.create_task(watch()) for _ in range(watchers)]
+    # Let every watcher park before the clock starts.
+    await asyncio.sleep(1.0 + watchers / 500)
+    rss, threads = server.status()
+
+    latencies = []
+    current = version
+    start = time.perf_counter()
+    for _ in range(moves):
+        move_start = time.perf_counter()
+        _, _, body = await player.request("POST", "/api/ai_move")
+        latencies.append(time.perf_counter() - move_start)
+        # api.py's move responses carry no version; each move is one.
+        current += 1
+        made[current] = time.perf_counter()
+        if body.get("gameOver"):
+            await player.request("POST", "/api/start_game/watch_cai_vs_stockfish")
+            _, _, board = await player.request("GET", "/api/get_board")
+            current = board["version"]
+    elapsed = time.perf_counter() - start
+    done.set()
+    await asyncio.gather(*tasks)
+    player.close()
+    return {
+        "spectators": watchers,
+        "moves_per_second": moves / elapsed,
+        "move_p50_ms": percentile(latencies, 0.5) * 1000,
+        "move_p95_ms": percentile(latencies, 0.95) * 1000,
+        "lag_p50_ms": (percentile(lags, 0.5) or 0) * 1000,
+        "lag_p95_ms": (percentile(lags, 0.95) or 0) * 1000,
+        "updates_per_move": len(lags) / (moves * watchers),
+        "watch_errors": errors,
+        "rss_mb": rss,
+        "threads": threads,
+    }
+
+
+async def idle_games(server, count):
+    rss_before, _ = server.status()
+
+    async def open_games(offset):
+        connection = Connection(server.port)
+        for i in range(offset, count, 32):
+            await connection.request(
+                "POST", f"/api/start_game/user_vs_user?game=idle{i}"
+            )
+            await connection.request(
+                "POST", f"/api/make_move?game=idle{i}", {"move": "e2e4"}
+            )
+        connection.close()
+
+    await asyncio.gather(*(open_games(offset) for offset in range(32)))
+    rss_after, threads = server.status()
+    connection = Connection(server.port)
+    sample = range(0, count, max(1, count // 100))
+    start = time.perf_counter()
+    for i in sample:
+        await connection.request("GET", f"/api/get_board?game=idle{i}")
+    lookup = (time.perf_counter() - start) / len(sample)
+    connection.close()
+    return {
+        "games": count,
+        "rss_mb": rss_after,
+        "kb_per_game": (rss_after - rss_before) * 1024 / count,
+        "threads": threads,
+        "get_board_ms": lookup * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flask vs ASGI server")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--spectators", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--moves", type=int, default=40)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--movetime-ms", type=int, default=50)
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    results = {}
+    for kind in SERVERS:
+        server = Server(kind, args.movetime_ms)
+        try:
+            rows = {"reads": asyncio.run(reads(server, args.clients, args.duration))}
+            row = rows["reads"]
+            print(
+                f"{kind:<6} reads       {row['requests_per_second']:8.0f} req/s  "
+                f"p50 {row['p50_ms']:6.1f} ms  p95 {row['p95_ms']:6.1f} ms"
+            )
+            rows["spectators"] = []
+            for watchers in args.spectators:
+                row = asyncio.run(spectators(server, watchers, args.moves))
+                rows["spectators"].append(row)
+                print(
+                    f"{kind:<6} {watchers:>5} watch  move p50 "
+                    f"{row['move_p50_ms']:6.1f} ms  p95 {row['move_p95_ms']:6.1f} ms  "
+                    f"lag p50 {row['lag_p50_ms']:6.1f} ms  p95 "
+                    f"{row['lag_p95_ms']:6.1f} ms  "
+                    f"{row['rss_mb']:6.1f} MB  {row['threads']:>5} threads  "
+                    f"{row['watch_errors']} errors"
+                )
+            if kind == "asgi" and args.games:
+                row = asyncio.run(idle_games(server, args.games))
+                rows["games"] = row
+                print(
+                    f"{kind:<6} {row['games']:>5} games  {row['kb_per_game']:.1f} KB "
+                    f"each  {row['rss_mb']:.1f} MB  get_board "
+                    f"{row['get_board_ms']:.2f} ms"
+                )
+            results[kind] = rows
+        finally:
+            server.stop()
+
+    result_path = os.path.join(
+        args.output, f"servers_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(
+        {"metadata": machine_metadata(), "arguments": vars(args), "results": results},
+        result_path,
+    )
+    print(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/tablebase.py
+
+"""
+Endgame tablebases: generation time and table size per material set, and
+the latency of probing a position (Tablebase.probe) and of choosing a move
+(Tablebase.best_move, one probe per legal move), over random legal
+positions with either side strong and either side to move. Also how long
+the early exit takes for a position with more pieces, which every
+AIPlayer move and self-play ply now pays.
+
+Every probed win is played out with best_move for both sides and must
+end in mate after exactly the probed number of plies.
+
+    python -m benchmarks.tablebase --materials KQK KRK KPK KBNK
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import chess
+
+from benchmarks.runner import machine_metadata, save_json
+from chess_app.config import Config
+from chess_app.tablebase import Tablebase, generate
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def random_position(letters, rng):
+    while True:
+        board = chess.Board(None)
+        strong = rng.choice([chess.WHITE, chess.BLACK])
+        squares = rng.sample(chess.SQUARES, 2 + len(letters))
+        board.set_piece_at(squares[0], chess.Piece(chess.KING, strong))
+        board.set_piece_at(squares[1], chess.Piece(chess.KING, not strong))
+        for letter, square in zip(letters, squares[2:]):
+            piece_type = chess.Piece.from_symbol(letter).piece_type
+            board.set_piece_at(square, chess.Piece(piece_type, strong))
+        board.turn = rng.choice([chess.WHITE, chess.BLACK])
+        if board.is_valid():
+            return board
+
+
+def median_us(fn, boards):
+    samples = []
+    for board in boards:
+        start = time.perf_counter()
+        fn(board)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def play_out(tablebase, board, limit=200):
+    plies = 0
+    while not board.is_game_over() and plies < limit:
+        board.push(tablebase.best_move(board))
+        plies += 1
+    return plies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Endgame tablebases")
+    parser.add_argument("--materials", nargs="+", default=Config.TABLEBASE_MATERIALS)
+    parser.add_argument("--positions", type=int, default=2000)
+    parser.add_argument("--verify", type=int, default=50, help="wins played out")
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    rng = random.Random(0)
+    rows = []
+    print(
+        f"{'Table':<7}{'Generate s':>11}{'MB':>7}{'Positions':>11}{'Longest':>9}"
+        f"{'Probe us':>10}{'Best move us':>14}{'Verified':>10}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        tablebase = Tablebase(tmp)
+        for name in args.materials:
+            row = generate(name, tmp)
+            boards = [random_position(name[1:-1], rng) for _ in range(args.positions)]
+            tablebase.probe(boards[0])  # map the file
+            row["probe_us"] = median_us(tablebase.probe, boards)
+            row["best_move_us"] = median_us(tablebase.best_move, boards)
+            wins = [board for board in boards if tablebase.probe(board)[0] == 1]
+            verified = 0
+            for board in wins[: args.verify]:
+                plies = tablebase.probe(board)[1]
+                if play_out(tablebase, board) != plies or not board.is_checkmate():
+                    raise RuntimeError(f"{name}: {board.fen()} not mated in {plies}")
+                verified += 1
+            row["verified_wins"] = verified
+            rows.append(row)
+            print(
+                f"{name:<7}{row['seconds']:>11.1f}{row['bytes'] / 2**20:>7.1f}"
+                f"{row['positions']:>11}{row['longest_mate_plies']:>9}"
+                f"{row['probe_us']:>10.1f}{row['best_move_us']:>14.1f}{verified:>10}"
+            )
+        full = [chess.Board()] * args.positions
+        uncovered = median_us(tablebase.probe, full)
+        print(f"Probe of a position with more pieces: {uncovered:.2f} us")
+
+    result_path = os.path.join(
+        args.output, f"tablebase_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(
+        {
+            "metadata": machine_metadata(),
+            "arguments": vars(args),
+            "uncovered_probe_us": uncovered,
+            "results": rows,
+        },
+        result_path,
+    )
+    print(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# benchmarks/telemetry.py
+
+"""
+Overhead of the training telemetry: train_model on synthetic samples with
+and without a TrainingTelemetry, interleaving runs so drift hits both
+alike, and the cost of a single lap() call. Also prints the summary table
+one telemetry-enabled run produces.
+
+    python -m benchmarks.telemetry --samples 2048 --rounds 10
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import chess
+import torch
+
+from benchmarks.runner import machine_metadata, save_json
+from chess_app.config import Config
+from chess_app.data import board_to_tensor, move_to_index
+from chess_app.model import ChessNet
+from chess_app.telemetry import TrainingTelemetry, format_summary
+from train import train_model
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def synthetic_samples(count, seed=0):
+    rng = random.Random(seed)
+    samples = []
+    board = chess.Board()
+    while len(samples) < count:
+        if board.is_game_over() or len(board.move_stack) > 80:
+            board = chess.Board()
+        move = rng.choice(list(board.legal_moves))
+        samples.append(
+            (
+                board_to_tensor(board).numpy(),
+                move_to_index(move),
+                rng.choice([0.0, 0.5, 1.0]),
+                "Average Step",
+            )
+        )
+        board.push(move)
+    return samples
+
+
+def lap_cost(calls):
+    telemetry = TrainingTelemetry()
+    mark = time.perf_counter()
+    start = time.perf_counter()
+    for _ in range(calls):
+        mark = telemetry.lap("forward", mark)
+    elapsed = time.perf_counter() - start
+    telemetry.close()
+    return elapsed / calls
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Training telemetry overhead")
+    parser.add_argument("--samples", type=int, default=2048)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--blocks", type=int, default=2)
+    parser.add_argument("--channels", type=int, default=32)
+    parser.add_argument("--head-channels", type=int, default=8)
+    parser.add_argument("--loader-workers", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    Config.DATALOADER_WORKERS = args.loader_workers
+    torch.manual_seed(0)
+    model = ChessNet(
+        num_residual_blocks=args.blocks,
+        channels=args.channels,
+        head_channels=args.head_channels,
+    )
+    data = synthetic_samples(args.samples)
+    steps = -(-args.samples // args.batch_size) * args.epochs
+
+    def run(telemetry):
+        start = time.perf_counter()
+        train_model(
+            model,
+            "cpu",
+            data,
+            epochs=args.epochs,
+            batch_size=args.batch_size,
+            telemetry=telemetry,
+        )
+        return (time.perf_counter() - start) / steps
+
+    run(None)  # warm up
+    off, on = [], []
+    summary = None
+    for round_index in range(args.rounds):
+        # Swap the order every round so neither side always runs second.
+        for enabled in (False, True) if round_index % 2 == 0 else (True, False):
+            if not enabled:
+                off.append(run(None))
+                continue
+            telemetry = TrainingTelemetry()
+            on.append(run(telemetry))
+            summary = telemetry.finish(0)
+            telemetry.close()
+
+    lap = lap_cost(100000)
+    results = {
+        "step_ms_off": statistics.median(off) * 1000,
+        "step_ms_on": statistics.median(on) * 1000,
+        # Run-to-run spread of the runs without telemetry, for scale.
+        "step_ms_off_stdev": statistics.stdev(off) * 1000,
+        "lap_ns": lap * 1e9,
+        "laps_per_step": 5,
+        "summary": summary,
+    }
+    results["overhead"] = results["step_ms_on"] / results["step_ms_off"] - 1
+    print(
+        f"Step without telemetry {results['step_ms_off']:.2f} ms, with "
+        f"{results['step_ms_on']:.2f} ms ({results['overhead']:+.2%}, stdev "
+        f"without {results['step_ms_off_stdev']:.2f} ms); "
+        f"lap() {results['lap_ns']:.0f} ns, 5 per step "
+        f"({5 * lap / statistics.median(off):.4%} of a step)"
+    )
+    for line in format_summary(summary):
+        print(line)
+
+    result_path = os.path.join(
+        args.output, f"telemetry_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(
+        {"metadata": machine_metadata(), "arguments": vars(args), "results": results},
+        result_path,
+    )
+    print(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
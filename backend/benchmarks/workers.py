@@ -0,0 +1,179 @@
+# benchmarks/workers.py
+
+"""
+Memory of a pre-fork deployment (serve.py) with 1, 4 and 8 workers, with
+each worker copying the weights (CHESS_MODEL_SHARED=0) and with every
+worker mapping the same checkpoint. Reported per worker:
+
+    RSS      resident pages, shared ones included in every process
+    PSS      shared pages divided between the processes mapping them
+    private  pages only this worker uses
+
+The sum of PSS over the master and workers is the deployment's real
+footprint. A checkpoint of the given size is written to a temporary file.
+
+    python -m benchmarks.workers --workers 1 4 8 --blocks 20 --channels 256
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.runner import machine_metadata, save_json
+from benchmarks.servers import BACKEND_DIR, BENCHMARK_DIR, Connection, free_port
+
+MODES = {"copy": "0", "shared": "1"}
+
+
+def smaps_rollup(pid):
+    """RSS, PSS and private memory of a process, in MB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss_mb": fields["Rss"],
+        "pss_mb": fields["Pss"],
+        "private_mb": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+def write_checkpoint(path, blocks, channels, head_channels):
+    import torch
+
+    from chess_app.model import ChessNet, save_model
+
+    torch.manual_seed(0)
+    model = ChessNet(
+        num_residual_blocks=blocks, channels=channels, head_channels=head_channels
+    )
+    save_model(model, path)
+    return sum(p.numel() * p.element_size() for p in model.parameters()) / 2**20
+
+
+async def exercise(port, requests):
+    # New connections, so the kernel spreads them over the workers.
+    async def analyze():
+        connection = Connection(port)
+        status, _, _ = await connection.request(
+            "POST", "/api/analyze_game", {"moves": ["e4", "e5", "Nf3", "Nc6"]}
+        )
+        connection.close()
+        return status
+
+    return await asyncio.gather(*(analyze() for _ in range(requests)))
+
+
+def measure(mode, workers, model_path, app):
+    port = free_port()
+    env = dict(os.environ)
+    env.update(
+        CHESS_MODEL_PATH=model_path,
+        CHESS_ENGINE_PATH=os.path.join(BENCHMARK_DIR, "fake_engine.py"),
+        CHESS_LOG_LEVEL="WARNING",
+        CHESS_MODEL_SHARED=MODES[mode],
+        CHESS_SERVE_APP=app,
+        CHESS_SERVE_WORKERS=str(workers),
+        CHESS_SERVE_PORT=str(port),
+    )
+    master = subprocess.Popen(
+        [sys.executable, "serve.py"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        # Workers load and warm the model before serving; wait until every
+        # one of them has settled.
+        deadline = time.monotonic() + 120 * workers
+        previous = None
+        while True:
+            time.sleep(2.0)
+            pids = children(master.pid)
+            rss = [round(smaps_rollup(pid)["rss_mb"]) for pid in pids]
+            if len(pids) == workers and rss == previous:
+                break
+            if time.monotonic() > deadline or master.poll() is not None:
+                raise RuntimeError(f"{workers} {mode} workers did not start")
+            previous = rss
+        statuses = asyncio.run(exercise(port, 4 * workers))
+        if any(status != 200 for status in statuses):
+            raise RuntimeError(f"analyze_game failed: {statuses}")
+        rows = [smaps_rollup(pid) for pid in children(master.pid)]
+        master_memory = smaps_rollup(master.pid)
+    finally:
+        master.terminate()
+        master.wait(timeout=60)
+    return {
+        "mode": mode,
+        "workers": workers,
+        "per_worker": rows,
+        "master": master_memory,
+        "rss_mb": sum(row["rss_mb"] for row in rows) / workers,
+        "pss_mb": sum(row["pss_mb"] for row in rows) / workers,
+        "private_mb": sum(row["private_mb"] for row in rows) / workers,
+        "total_pss_mb": sum(row["pss_mb"] for row in rows) + master_memory["pss_mb"],
+        "total_rss_mb": sum(row["rss_mb"] for row in rows) + master_memory["rss_mb"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="pre-fork worker memory")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--blocks", type=int, default=20)
+    parser.add_argument("--channels", type=int, default=256)
+    parser.add_argument("--head-channels", type=int, default=64)
+    parser.add_argument("--app", choices=["flask", "asgi"], default="flask")
+    parser.add_argument("--output", default=os.path.join(BENCHMARK_DIR, "results"))
+    args = parser.parse_args(argv if argv is not None else sys.argv[1:])
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.pth")
+        weights = write_checkpoint(
+            model_path, args.blocks, args.channels, args.head_channels
+        )
+        print(f"Checkpoint: {weights:.1f} MB of weights")
+        print(
+            f"{'Mode':<8}{'Workers':>8}{'RSS/worker':>12}{'PSS/worker':>12}"
+            f"{'Private':>10}{'Total PSS':>11}{'Total RSS':>11}"
+        )
+        for mode in MODES:
+            for workers in args.workers:
+                row = measure(mode, workers, model_path, args.app)
+                rows.append(row)
+                print(
+                    f"{mode:<8}{workers:>8}{row['rss_mb']:>12.0f}"
+                    f"{row['pss_mb']:>12.0f}{row['private_mb']:>10.0f}"
+                    f"{row['total_pss_mb']:>11.0f}{row['total_rss_mb']:>11.0f}"
+                )
+
+    result_path = os.path.join(
+        args.output, f"workers_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    save_json(
+        {
+            "metadata": machine_metadata(),
+            "arguments": vars(args),
+            "weights_mb": weights,
+            "results": rows,
+        },
+        result_path,
+    )
+    print(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
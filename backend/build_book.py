@@ -0,0 +1,63 @@
+# build_book.py
+
+import os
+import chess
+from chess_app.book import build_book
+from chess_app.model import build_model
+from chess_app.utils import get_device, Logger, AIPlayer
+from chess_app.config import Config
+
+
+def play_sample_game(model_path, book_path, engine_path, max_plies=120):
+    """Plays one game with the book enabled and returns the book statistics."""
+    player = AIPlayer(
+        model_path=model_path, engine_path=engine_path, book_path=book_path
+    )
+    board = chess.Board()
+    while not board.is_game_over() and len(board.move_stack) < max_plies:
+        player.side = board.turn
+        board.push(player.get_best_move(board))
+    player.close()
+    return player.book_stats.report()
+
+
+def main():
+    config = Config()
+    if not os.path.exists(config.LOG_DIR):
+        os.makedirs(config.LOG_DIR)
+
+    logger_instance = Logger()
+    logger = logger_instance.get_logger()
+
+    model = None
+    device = None
+    if os.path.exists(config.MODEL_PATH):
+        device = get_device()
+        model = build_model(config.MODEL_PATH, device)
+
+    positions, entries = build_book(
+        output_path=config.BOOK_PATH,
+        save_directory=config.SAVE_DIRECTORY,
+        max_ply=config.BOOK_MAX_PLY,
+        model=model,
+        device=device,
+        model_top_k=config.BOOK_MODEL_TOP_K,
+        model_weight=config.BOOK_MODEL_WEIGHT,
+    )
+    logger.info(
+        f"Wrote {entries} entries for {positions} positions to {config.BOOK_PATH}."
+    )
+    if not entries:
+        return
+
+    stats = play_sample_game(config.MODEL_PATH, config.BOOK_PATH, config.ENGINE_PATH)
+    logger.info(
+        f"Sample game: {stats['book_moves']}/{stats['moves']} moves from the book "
+        f"({stats['book_fraction']:.0%}). Book lookup {stats['avg_book_latency'] * 1000:.2f} ms "
+        f"vs {stats['avg_move_latency'] * 1000:.1f} ms per searched move, "
+        f"{stats['latency_saved']:.2f} s saved."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# build_tablebases.py
+
+import os
+from chess_app.tablebase import generate
+from chess_app.utils import Logger
+from chess_app.config import Config
+
+
+def main():
+    config = Config()
+    if not os.path.exists(config.LOG_DIR):
+        os.makedirs(config.LOG_DIR)
+
+    logger_instance = Logger()
+    logger = logger_instance.get_logger()
+
+    total_seconds = 0.0
+    total_bytes = 0
+    for name in config.TABLEBASE_MATERIALS:
+        # generate() logs each table's size and generation time.
+        stats = generate(name, config.TABLEBASE_DIR)
+        total_seconds += stats["seconds"]
+        total_bytes += stats["bytes"]
+    logger.info(
+        f"Wrote {len(config.TABLEBASE_MATERIALS)} tables to {config.TABLEBASE_DIR}: "
+        f"{total_bytes / 2**20:.1f} MB in {total_seconds:.1f} s."
+    )
+
+
+if __name__ == "__main__":
+    main()
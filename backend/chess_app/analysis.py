@@ -0,0 +1,176 @@
+# chess_app/analysis.py
+
+import io
+
+import chess
+import chess.pgn
+import torch
+
+from chess_app.config import Config
+from chess_app.data import board_to_tensor, move_to_index
+
+QUALITY_LABELS = ["Blunder", "Bad Step", "Average Step", "Good Step", "Great Step"]
+
+# Value drop (mover's expected score, 0..1) per marker, worst first.
+MARKERS = [
+    ("blunder", Config.ANALYSIS_BLUNDER_DROP, chess.pgn.NAG_BLUNDER),
+    ("mistake", Config.ANALYSIS_MISTAKE_DROP, chess.pgn.NAG_MISTAKE),
+    ("inaccuracy", Config.ANALYSIS_INACCURACY_DROP, chess.pgn.NAG_DUBIOUS_MOVE),
+]
+
+
+def parse_game(pgn=None, moves=None, fen=None):
+    """
+    The starting position and move list of a game given as PGN text, or as
+    a list of UCI / SAN moves from `fen` (default: the standard start).
+    Raises ValueError for unreadable games and illegal moves.
+    """
+    if pgn:
+        game = chess.pgn.read_game(io.StringIO(pgn))
+        if game is None:
+            raise ValueError("No game found in the PGN")
+        if game.errors:
+            raise ValueError(f"Invalid PGN: {game.errors[0]}")
+        return game.board(), list(game.mainline_moves())
+
+    board = chess.Board(fen) if fen else chess.Board()
+    start = board.copy()
+    parsed = []
+    for text in moves or []:
+        try:
+            move = chess.Move.from_uci(text)
+            if move not in board.legal_moves:
+                raise ValueError
+        except ValueError:
+            try:
+                move = board.parse_san(text)
+            except ValueError:
+                raise ValueError(
+                    f"Illegal move {text!r} at ply {len(parsed) + 1}"
+                ) from None
+        parsed.append(move)
+        board.push(move)
+    return start, parsed
+
+
+def _outcome_value(board):
+    outcome = board.outcome()
+    if outcome is None:
+        return None
+    if outcome.winner is None:
+        return 0.5
+    return 1.0 if outcome.winner == chess.WHITE else 0.0
+
+
+def evaluate_positions(model, device, boards, batch_size=Config.ANALYSIS_BATCH_SIZE):
+    """
+    Value, quality class and best legal policy move for every board, with one
+    forward pass per `batch_size` positions. Returns the per-board results
+    and the number of forward passes.
+    """
+    values, qualities, best_moves = [], [], []
+    passes = 0
+    model.eval()
+    for offset in range(0, len(boards), batch_size):
+        chunk = boards[offset : offset + batch_size]
+        batch = torch.stack([board_to_tensor(board) for board in chunk])
+        with torch.inference_mode():
+            policy, value, quality = model(batch.to(device))
+        passes += 1
+        policy = policy.cpu()
+        values.extend(value.squeeze(1).cpu().tolist())
+        qualities.extend(quality.argmax(1).cpu().tolist())
+        for row, board in zip(policy, chunk):
+            legal = list(board.legal_moves)
+            if not legal:
+                best_moves.append(None)
+                continue
+            indices = torch.tensor([move_to_index(m) for m in legal])
+            best_moves.append(legal[int(torch.argmax(row[indices]))])
+    return values, qualities, best_moves, passes
+
+
+def analyze_game(model, device, start, moves, batch_size=Config.ANALYSIS_BATCH_SIZE):
+    """
+    Annotates every ply of a game. The positions before each move and the
+    final position are evaluated together; a move's value drop is the
+    mover's expected score before it minus the score after it, taken from
+    White's-view values (finished games use the actual result at the end).
+    """
+    boards = [start.copy(stack=False)]
+    board = start.copy()
+    for move in moves:
+        board.push(move)
+        boards.append(board.copy(stack=False))
+    values, qualities, best_moves, passes = evaluate_positions(
+        model, device, boards, batch_size
+    )
+    final_value = _outcome_value(boards[-1])
+    if final_value is not None:
+        values[-1] = final_value
+
+    game = chess.pgn.Game()
+    if start.fen() != chess.STARTING_FEN:
+        game.setup(start)
+    node = game
+    plies = []
+    summary = {
+        color: {"moves": 0, "matched": 0, "blunder": 0, "mistake": 0, "inaccuracy": 0}
+        for color in ("white", "black")
+    }
+    board = start.copy()
+    for ply, move in enumerate(moves):
+        mover = "white" if board.turn == chess.WHITE else "black"
+        before, after = values[ply], values[ply + 1]
+        drop = before - after if board.turn == chess.WHITE else after - before
+        marker = marker_nag = None
+        for name, threshold, nag in MARKERS:
+            if drop >= threshold:
+                marker, marker_nag = name, nag
+                break
+        best = best_moves[ply]
+        entry = {
+            "ply": ply + 1,
+            "moveNumber": board.fullmove_number,
+            "side": mover,
+            "move": move.uci(),
+            "san": board.san(move),
+            "value": round(after, 4),
+            "valueDrop": round(drop, 4),
+            "quality": QUALITY_LABELS[qualities[ply]],
+            "bestMove": best.uci() if best else None,
+            "bestSan": board.san(best) if best else None,
+            "matchesBest": move == best,
+            "marker": marker,
+        }
+        plies.append(entry)
+
+        side = summary[mover]
+        side["moves"] += 1
+        side["matched"] += move == best
+        if marker:
+            side[marker] += 1
+
+        node = node.add_variation(move)
+        if marker_nag:
+            node.nags.add(marker_nag)
+        comment = f"v={after:.2f}"
+        if best and move != best:
+            comment += f", best {entry['bestSan']}"
+        node.comment = comment
+        board.push(move)
+
+    for side in summary.values():
+        side["accuracy"] = side["matched"] / side["moves"] if side["moves"] else None
+    result = board.result(claim_draw=True)
+    game.headers["Result"] = result
+    game.headers["Annotator"] = "ChessNet"
+    return {
+        "plies": plies,
+        "summary": summary,
+        "startValue": round(values[0], 4),
+        "result": result,
+        "pgn": str(game),
+        "forwardPasses": passes,
+        "positions": len(boards),
+    }
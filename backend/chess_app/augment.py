@@ -0,0 +1,93 @@
+# chess_app/augment.py
+
+import chess
+import torch
+from torch.utils.data import default_collate
+
+from chess_app.config import Config
+from chess_app.data import board_to_tensor, move_to_index
+
+# board_to_tensor planes: 0-5 white pieces, 6-11 black pieces, 12/13 white
+# king/queen-side castling, 14/15 black king/queen-side castling, 16 en
+# passant. Swapping colours exchanges the piece and castling planes; the
+# vertical flip puts every square (castling markers included) on its mirror.
+FLIP_PLANES = [6, 7, 8, 9, 10, 11, 0, 1, 2, 3, 4, 5, 14, 15, 12, 13, 16]
+
+
+def flip_boards(boards):
+    """Colour-flips a (N, 17, 8, 8) batch: the tensor of board.mirror()."""
+    return boards[:, FLIP_PLANES].flip(-2)
+
+
+def flip_moves(moves):
+    """Maps move_to_index values to the same move on the mirrored board."""
+    from_square = torch.div(moves, 73, rounding_mode="floor")
+    to_square = moves % 73
+    # Squares mirror vertically with sq ^ 56.
+    return (from_square ^ 56) * 73 + (to_square ^ 56)
+
+
+def flip_outcomes(outcomes):
+    """Outcomes are White's score (1 win, 0.5 draw, 0 loss); colours swap."""
+    return 1.0 - outcomes
+
+
+def flip_batch(boards, moves, outcomes, prob=Config.AUGMENT_FLIP_PROB):
+    """
+    Colour-flips a random subset of a training batch. Each sample is
+    replaced by its mirror with probability `prob`, so over epochs the
+    network sees both orientations of every position without storing them.
+    """
+    if prob <= 0:
+        return boards, moves, outcomes
+    mask = torch.rand(boards.shape[0], device=boards.device) < prob
+    if not mask.any():
+        return boards, moves, outcomes
+    boards = torch.where(mask[:, None, None, None], flip_boards(boards), boards)
+    moves = torch.where(mask, flip_moves(moves), moves)
+    outcomes = torch.where(mask, flip_outcomes(outcomes), outcomes)
+    return boards, moves, outcomes
+
+
+class FlipCollate:
+    """DataLoader collate_fn that augments each batch inside the loader workers."""
+
+    def __init__(self, prob=Config.AUGMENT_FLIP_PROB):
+        self.prob = prob
+
+    def __call__(self, samples):
+        boards, moves, outcomes, qualities = default_collate(samples)
+        boards, moves, outcomes = flip_batch(boards, moves, outcomes, self.prob)
+        return boards, moves, outcomes, qualities
+
+
+def verify_against_mirror(boards):
+    """
+    Checks flip_boards/flip_moves against python-chess's board.mirror() for
+    every legal move of the given positions. Raises AssertionError on the
+    first mismatch, otherwise returns the number of moves checked.
+    """
+    checked = 0
+    for board in boards:
+        mirrored = board.mirror()
+        flipped = flip_boards(board_to_tensor(board).unsqueeze(0))[0]
+        assert torch.equal(
+            flipped, board_to_tensor(mirrored)
+        ), f"Flipped planes differ from board.mirror() for {board.fen()}"
+        moves = list(board.legal_moves)
+        indices = torch.tensor([move_to_index(move) for move in moves])
+        for move, index in zip(moves, flip_moves(indices).tolist()):
+            mirrored_move = chess.Move(
+                chess.square_mirror(move.from_square),
+                chess.square_mirror(move.to_square),
+                move.promotion,
+            )
+            assert (
+                mirrored_move in mirrored.legal_moves
+            ), f"{move.uci()} has no mirror in {mirrored.fen()}"
+            assert index == move_to_index(mirrored_move), (
+                f"Index of {move.uci()} maps to {index}, expected "
+                f"{move_to_index(mirrored_move)} in {board.fen()}"
+            )
+            checked += 1
+    return checked
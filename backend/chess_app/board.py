@@ -2,54 +2,210 @@
 
 import chess
 import os
+from collections import OrderedDict
 from PIL import Image, ImageTk
 
+from chess_app.config import Config
+from chess_app.log import get_logger
+
+logger = get_logger("board")
+
+PIECE_FILENAMES = {
+    "P": "White_pawn.png",
+    "N": "White_knight.png",
+    "B": "White_bishop.png",
+    "R": "White_rook.png",
+    "Q": "White_queen.png",
+    "K": "White_king.png",
+    "p": "Black_pawn.png",
+    "n": "Black_knight.png",
+    "b": "Black_bishop.png",
+    "r": "Black_rook.png",
+    "q": "Black_queen.png",
+    "k": "Black_king.png",
+}
+ASSETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets")
+
+# Decoded PNGs, and the resized sprites per square size (most recent last).
+# Sprites have transparent backgrounds, so every theme draws the same ones.
+_sources = None
+_sprites = OrderedDict()
+
+
+def _source_images():
+    global _sources
+    if _sources is None:
+        _sources = {}
+        for piece, filename in PIECE_FILENAMES.items():
+            file_path = os.path.join(ASSETS_PATH, filename)
+            try:
+                with Image.open(file_path) as image:
+                    _sources[piece] = image.convert("RGBA")
+            except Exception as e:
+                logger.error("Error loading image %s: %s", file_path, e)
+                _sources[piece] = None
+    return _sources
+
+
+def piece_sprites(square_size):
+    """The twelve piece images sized for `square_size`, resized once per size."""
+    sprites = _sprites.get(square_size)
+    if sprites is not None:
+        _sprites.move_to_end(square_size)
+        return sprites
+    side = max(1, square_size - 10)
+    sprites = {
+        piece: image.resize((side, side), Image.LANCZOS) if image else None
+        for piece, image in _source_images().items()
+    }
+    _sprites[square_size] = sprites
+    while len(_sprites) > Config.SPRITE_CACHE_SIZES:
+        _sprites.popitem(last=False)
+    return sprites
+
 
 class ChessBoard:
     """
     ChessBoard is a class that displays the chessboard and pieces.
     It handles the drawing and resizing of the board and pieces,
     but without any direct UI interaction, now handled by the React frontend.
+
+    Every square keeps one rectangle and one image item on the canvas.
+    draw_board() recreates them (new size or first draw); refresh() only
+    reconfigures the squares whose colour or piece differs from what was
+    last drawn, which after a move, highlight change or undo is a handful.
+    Without a canvas only that bookkeeping runs.
     """
 
-    def __init__(self, app=None):
+    def __init__(self, app=None, canvas=None):
         self.app = app
+        self.canvas = canvas
+        self.board = chess.Board()
+        self.last_move = None
+        self.selected_square = None
+        self.show_coordinates = True
+        self.theme = Config.LIGHT_THEME
         self.piece_images = {}
         self.square_size = 60
-        self.load_piece_images()
+        # PhotoImages belong to one Tk interpreter, so they are cached per
+        # board; the PIL sprites behind them are shared by all boards.
+        self._photos = OrderedDict()
+        self._items = {}
+        self._drawn = {}
+        self.redrawn = 0  # squares repainted by the last refresh()
+        if canvas is not None:
+            self.load_piece_images()
 
     def load_piece_images(self):
-        piece_filenames = {
-            "P": "White_pawn.png",
-            "N": "White_knight.png",
-            "B": "White_bishop.png",
-            "R": "White_rook.png",
-            "Q": "White_queen.png",
-            "K": "White_king.png",
-            "p": "Black_pawn.png",
-            "n": "Black_knight.png",
-            "b": "Black_bishop.png",
-            "r": "Black_rook.png",
-            "q": "Black_queen.png",
-            "k": "Black_king.png",
-        }
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        assets_path = os.path.join(current_dir, "..", "assets")
-
         # If called before square_size is known, just use a default size
         if self.square_size <= 0:
             self.square_size = 60
 
-        for piece, filename in piece_filenames.items():
-            file_path = os.path.join(assets_path, filename)
-            try:
-                image = Image.open(file_path).convert("RGBA")
-                image = image.resize(
-                    (self.square_size - 10, self.square_size - 10), Image.LANCZOS
+        photos = self._photos.get(self.square_size)
+        if photos is None:
+            photos = {
+                piece: ImageTk.PhotoImage(sprite) if sprite else None
+                for piece, sprite in piece_sprites(self.square_size).items()
+            }
+            self._photos[self.square_size] = photos
+            while len(self._photos) > Config.SPRITE_CACHE_SIZES:
+                self._photos.popitem(last=False)
+        else:
+            self._photos.move_to_end(self.square_size)
+        self.piece_images = photos
+
+    def square_state(self, square):
+        piece = self.board.piece_at(square)
+        light = (chess.square_file(square) + chess.square_rank(square)) % 2 == 1
+        colour = self.theme["chessboard_light" if light else "chessboard_dark"]
+        if square == self.selected_square or (
+            self.last_move and square in self.last_move
+        ):
+            colour = self.theme["highlight_color"]
+        return colour, piece.symbol() if piece else None
+
+    def draw_board(self):
+        """Recreates every square; needed only for a new size or a new canvas."""
+        self._drawn = {}
+        self._items = {}
+        if self.canvas is not None:
+            self.canvas.delete("square", "piece", "coord")
+            self.load_piece_images()
+            size = self.square_size
+            for square in chess.SQUARES:
+                x = chess.square_file(square) * size
+                y = (7 - chess.square_rank(square)) * size
+                rect = self.canvas.create_rectangle(
+                    x, y, x + size, y + size, width=0, tags="square"
                 )
-                background = Image.new("RGBA", image.size, (255, 255, 255, 0))
-                combined = Image.alpha_composite(background, image)
-                self.piece_images[piece] = ImageTk.PhotoImage(combined)
-            except Exception as e:
-                print(f"Error loading image {file_path}: {e}")
-                self.piece_images[piece] = None
+                image = self.canvas.create_image(
+                    x + size // 2, y + size // 2, state="hidden", tags="piece"
+                )
+                self._items[square] = (rect, image)
+            self._draw_coordinates()
+        self.refresh()
+
+    def draw_pieces(self):
+        # The pieces are part of each square's state; kept for older callers.
+        self.refresh()
+
+    def refresh(self):
+        """Repaints the squares that changed since the last draw; returns how many."""
+        if self.canvas is not None and not self._items:
+            self.draw_board()
+            return self.redrawn
+        changed = 0
+        for square in chess.SQUARES:
+            state = self.square_state(square)
+            if self._drawn.get(square) == state:
+                continue
+            self._drawn[square] = state
+            changed += 1
+            if self.canvas is None:
+                continue
+            colour, piece = state
+            rect, image = self._items[square]
+            self.canvas.itemconfigure(rect, fill=colour)
+            photo = self.piece_images.get(piece) if piece else None
+            if photo:
+                self.canvas.itemconfigure(image, image=photo, state="normal")
+            else:
+                self.canvas.itemconfigure(image, state="hidden")
+        self.redrawn = changed
+        return changed
+
+    def resize(self, square_size):
+        if square_size != self.square_size:
+            self.square_size = square_size
+            self.draw_board()
+
+    def set_theme(self, theme):
+        # Square colours change, the sprites do not.
+        self.theme = theme
+        self.refresh()
+
+    def toggle_coordinates(self, show):
+        self.show_coordinates = show
+        if self.canvas is not None:
+            self.canvas.itemconfigure("coord", state="normal" if show else "hidden")
+
+    def _draw_coordinates(self):
+        size = self.square_size
+        state = "normal" if self.show_coordinates else "hidden"
+        for index in range(8):
+            self.canvas.create_text(
+                index * size + size - 3,
+                8 * size - 3,
+                text=chess.FILE_NAMES[index],
+                anchor="se",
+                state=state,
+                tags="coord",
+            )
+            self.canvas.create_text(
+                3,
+                (7 - index) * size + 3,
+                text=chess.RANK_NAMES[index],
+                anchor="nw",
+                state=state,
+                tags="coord",
+            )
@@ -0,0 +1,184 @@
+# chess_app/book.py
+
+import glob
+import os
+import random
+import struct
+from collections import defaultdict
+
+import chess
+import chess.pgn
+import chess.polyglot
+import torch
+
+from chess_app.config import Config
+from chess_app.data import board_to_tensor, move_to_index
+
+# Polyglot entries: 64-bit key, 16-bit move, 16-bit weight, 32-bit learn.
+ENTRY_STRUCT = struct.Struct(">QHHI")
+MAX_WEIGHT = 0xFFFF
+
+
+def polyglot_move(board, move):
+    """Encodes a move the way Polyglot books store it (castling as king-takes-rook)."""
+    to_square = move.to_square
+    if board.is_castling(move):
+        rank = chess.square_rank(move.from_square)
+        rook_file = 7 if board.is_kingside_castling(move) else 0
+        to_square = chess.square(rook_file, rank)
+    promotion = move.promotion - 1 if move.promotion else 0
+    return (
+        chess.square_file(to_square)
+        | chess.square_rank(to_square) << 3
+        | chess.square_file(move.from_square) << 6
+        | chess.square_rank(move.from_square) << 9
+        | promotion << 12
+    )
+
+
+def iter_saved_games(save_directory=Config.SAVE_DIRECTORY):
+    pattern = os.path.join(save_directory, "**", "*.pgn")
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        with open(path, "r") as f:
+            while True:
+                game = chess.pgn.read_game(f)
+                if game is None:
+                    break
+                yield game
+
+
+def collect_game_moves(games, max_ply=Config.BOOK_MAX_PLY):
+    """
+    Counts every (position, move) pair in the first max_ply plies using the
+    Polyglot weighting convention: 2 for a win, 1 for a draw, 0 for a loss
+    from the mover's point of view.
+    """
+    weights = defaultdict(lambda: defaultdict(int))
+    positions = {}
+    for game in games:
+        result = game.headers.get("Result", "*")
+        board = game.board()
+        for ply, move in enumerate(game.mainline_moves()):
+            if ply >= max_ply:
+                break
+            if result == "1-0":
+                score = 2 if board.turn == chess.WHITE else 0
+            elif result == "0-1":
+                score = 2 if board.turn == chess.BLACK else 0
+            else:
+                score = 1
+            key = chess.polyglot.zobrist_hash(board)
+            positions.setdefault(key, board.copy(stack=False))
+            weights[key][polyglot_move(board, move)] += score
+            board.push(move)
+    return weights, positions
+
+
+def add_model_choices(
+    weights, positions, model, device, top_k=3, scale=1, batch_size=256
+):
+    """Adds the network's top-k legal moves for every book position."""
+    model.eval()
+    keys = list(positions)
+    for start in range(0, len(keys), batch_size):
+        chunk = keys[start : start + batch_size]
+        boards = [positions[key] for key in chunk]
+        batch = torch.stack([board_to_tensor(board) for board in boards]).to(device)
+        with torch.no_grad():
+            policy, _, _ = model(batch)
+        probs = torch.exp(policy).cpu().numpy()
+        for key, board, move_probs in zip(chunk, boards, probs):
+            legal = list(board.legal_moves)
+            ranked = sorted(legal, key=lambda m: -move_probs[move_to_index(m)])
+            if not ranked:
+                continue
+            best = move_probs[move_to_index(ranked[0])] or 1.0
+            for move in ranked[:top_k]:
+                share = move_probs[move_to_index(move)] / best
+                weights[key][polyglot_move(board, move)] += max(1, round(scale * share))
+
+
+def write_book(weights, path):
+    entries = []
+    for key, moves in weights.items():
+        top = max(moves.values()) if moves else 0
+        factor = MAX_WEIGHT / top if top > MAX_WEIGHT else 1.0
+        for move, weight in moves.items():
+            weight = int(weight * factor)
+            if weight > 0:
+                entries.append((key, move, weight))
+    entries.sort(key=lambda entry: (entry[0], -entry[2]))
+    with open(path, "wb") as f:
+        for key, move, weight in entries:
+            f.write(ENTRY_STRUCT.pack(key, move, weight, 0))
+    return len(entries)
+
+
+def build_book(
+    output_path=Config.BOOK_PATH,
+    save_directory=Config.SAVE_DIRECTORY,
+    max_ply=Config.BOOK_MAX_PLY,
+    model=None,
+    device=None,
+    model_top_k=Config.BOOK_MODEL_TOP_K,
+    model_weight=Config.BOOK_MODEL_WEIGHT,
+):
+    weights, positions = collect_game_moves(iter_saved_games(save_directory), max_ply)
+    if model is not None:
+        add_model_choices(weights, positions, model, device, model_top_k, model_weight)
+    num_entries = write_book(weights, output_path)
+    return len(positions), num_entries
+
+
+class OpeningBook:
+    """
+    Weighted-random lookups in a Polyglot book. Returns None when the
+    position is not in the book so callers can fall back to the model or
+    engine.
+    """
+
+    def __init__(self, path, seed=None):
+        self.path = path
+        self.reader = chess.polyglot.open_reader(path)
+        self.random = random.Random(seed)
+
+    def choose(self, board):
+        try:
+            entry = self.reader.weighted_choice(board, random=self.random)
+        except IndexError:
+            return None
+        return entry.move
+
+    def close(self):
+        self.reader.close()
+
+
+class BookStats:
+    """Tracks how many moves a player answered from the book and how fast."""
+
+    def __init__(self):
+        self.book_moves = 0
+        self.book_time = 0.0
+        self.other_moves = 0
+        self.other_time = 0.0
+
+    def record(self, from_book, elapsed):
+        if from_book:
+            self.book_moves += 1
+            self.book_time += elapsed
+        else:
+            self.other_moves += 1
+            self.other_time += elapsed
+
+    def report(self):
+        total = self.book_moves + self.other_moves
+        avg_other = self.other_time / self.other_moves if self.other_moves else 0.0
+        avg_book = self.book_time / self.book_moves if self.book_moves else 0.0
+        return {
+            "moves": total,
+            "book_moves": self.book_moves,
+            "book_fraction": self.book_moves / total if total else 0.0,
+            "avg_book_latency": avg_book,
+            "avg_move_latency": avg_other,
+            "latency_saved": max(0.0, self.book_moves * (avg_other - avg_book)),
+        }
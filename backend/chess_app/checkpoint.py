@@ -0,0 +1,238 @@
+# chess_app/checkpoint.py
+
+import copy
+import glob
+import os
+import queue
+import random
+import re
+import threading
+import time
+
+import numpy as np
+import torch
+
+from chess_app.config import Config
+from chess_app.log import get_logger
+
+logger = get_logger("checkpoint")
+
+CHECKPOINT_PATTERN = re.compile(r"checkpoint_(\d+)\.pth$")
+
+
+def checkpoint_path(directory, iteration):
+    return os.path.join(directory, f"checkpoint_{iteration:06d}.pth")
+
+
+def list_checkpoints(directory):
+    """Training checkpoints in `directory`, oldest first."""
+    found = []
+    for path in glob.glob(os.path.join(directory, "checkpoint_*.pth")):
+        match = CHECKPOINT_PATTERN.search(os.path.basename(path))
+        if match:
+            found.append((int(match.group(1)), path))
+    return [path for _, path in sorted(found)]
+
+
+def latest_checkpoint(directory):
+    checkpoints = list_checkpoints(directory)
+    return checkpoints[-1] if checkpoints else None
+
+
+def _to_cpu(value):
+    if torch.is_tensor(value):
+        return value.detach().to("cpu", copy=True)
+    if isinstance(value, dict):
+        return {key: _to_cpu(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_cpu(item) for item in value)
+    return copy.deepcopy(value)
+
+
+def rng_state():
+    # Kept to tensors and plain types so torch.load's weights_only mode
+    # can read checkpoints back.
+    _, keys, position, has_gauss, cached_gaussian = np.random.get_state()
+    state = {
+        "python": random.getstate(),
+        "numpy": {
+            "keys": torch.from_numpy(keys.astype(np.int64)),
+            "position": int(position),
+            "has_gauss": int(has_gauss),
+            "cached_gaussian": float(cached_gaussian),
+        },
+        "torch": torch.get_rng_state(),
+    }
+    if torch.cuda.is_available():
+        state["cuda"] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def set_rng_state(state):
+    python_state = state["python"]
+    random.setstate((python_state[0], tuple(python_state[1]), python_state[2]))
+    numpy_state = state["numpy"]
+    np.random.set_state(
+        (
+            "MT19937",
+            numpy_state["keys"].numpy().astype(np.uint32),
+            numpy_state["position"],
+            numpy_state["has_gauss"],
+            numpy_state["cached_gaussian"],
+        )
+    )
+    torch.set_rng_state(state["torch"])
+    if "cuda" in state and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(state["cuda"])
+
+
+def snapshot(model, optimizer=None, scheduler=None, iteration=0, elo=None, extra=None):
+    """
+    Copies everything needed to resume into CPU memory. This is the only
+    part of a checkpoint the training thread waits for; the live model stays
+    on its device.
+    """
+    return {
+        "model": _to_cpu(model.state_dict()),
+        "arch": getattr(model, "arch", None),
+        "optimizer": _to_cpu(optimizer.state_dict()) if optimizer else None,
+        "scheduler": _to_cpu(scheduler.state_dict()) if scheduler else None,
+        "iteration": iteration,
+        "elo": elo,
+        "rng": rng_state(),
+        "extra": extra or {},
+        "saved_at": time.time(),
+    }
+
+
+def atomic_save(obj, path):
+    """Writes to a temporary file and renames it, so readers never see half a file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        torch.save(obj, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_checkpoint(path, model, optimizer=None, scheduler=None, device=None):
+    """
+    Restores a checkpoint written by CheckpointWriter into the given objects,
+    RNG state included, and returns the checkpoint dict (iteration, elo, ...).
+    """
+    state = torch.load(path, map_location="cpu")
+    model.load_state_dict(state["model"])
+    if device is not None:
+        model.to(device)
+    if optimizer is not None and state.get("optimizer"):
+        optimizer.load_state_dict(state["optimizer"])
+    if scheduler is not None and state.get("scheduler"):
+        scheduler.load_state_dict(state["scheduler"])
+    if state.get("rng"):
+        set_rng_state(state["rng"])
+    logger.info("Resumed from %s (iteration %d)", path, state.get("iteration", 0))
+    return state
+
+
+class CheckpointWriter:
+    """
+    Writes checkpoints from a background thread. save() takes a CPU snapshot
+    and returns; if the previous checkpoint is still being written, a newer
+    pending one replaces the older pending one rather than blocking training.
+    Only the last `keep_last` checkpoints are kept on disk.
+    """
+
+    def __init__(
+        self,
+        directory=Config.CHECKPOINT_DIR,
+        keep_last=Config.CHECKPOINT_KEEP_LAST,
+        weights_path=None,
+    ):
+        self.directory = directory
+        self.keep_last = keep_last
+        # Also refresh a weights-only file (e.g. MODEL_PATH) for the players.
+        self.weights_path = weights_path
+        self.pending = queue.Queue(maxsize=1)
+        self.idle = threading.Event()
+        self.idle.set()
+        self.lock = threading.Lock()
+        self.stall_times = []
+        self.write_times = []
+        self.dropped = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def save(
+        self, model, optimizer=None, scheduler=None, iteration=0, elo=None, extra=None
+    ):
+        start = time.perf_counter()
+        state = snapshot(model, optimizer, scheduler, iteration, elo, extra)
+        with self.lock:
+            self.idle.clear()
+            try:
+                self.pending.get_nowait()
+                self.dropped += 1
+            except queue.Empty:
+                pass
+            self.pending.put_nowait(state)
+        self.stall_times.append(time.perf_counter() - start)
+
+    def _run(self):
+        while True:
+            state = self.pending.get()
+            if state is None:
+                break
+            start = time.perf_counter()
+            try:
+                path = checkpoint_path(self.directory, state["iteration"])
+                atomic_save(state, path)
+                if self.weights_path:
+                    atomic_save(
+                        {"model": state["model"], "arch": state["arch"]},
+                        self.weights_path,
+                    )
+                self._prune()
+                logger.info("Checkpoint saved to %s", path)
+            except Exception as e:
+                self.error = e
+                logger.exception("Checkpoint write failed: %s", e)
+            self.write_times.append(time.perf_counter() - start)
+            with self.lock:
+                if self.pending.empty():
+                    self.idle.set()
+
+    def _prune(self):
+        if not self.keep_last:
+            return
+        for path in list_checkpoints(self.directory)[: -self.keep_last]:
+            os.remove(path)
+
+    def wait(self):
+        """Blocks until every checkpoint handed to save() is on disk."""
+        self.idle.wait()
+
+    def close(self):
+        self.wait()
+        self.pending.put(None)
+        self.thread.join()
+
+    def stats(self):
+        def summary(samples):
+            if not samples:
+                return {"count": 0, "mean": 0.0, "max": 0.0}
+            return {
+                "count": len(samples),
+                "mean": sum(samples) / len(samples),
+                "max": max(samples),
+            }
+
+        return {
+            "stall": summary(self.stall_times),
+            "write": summary(self.write_times),
+            "dropped": self.dropped,
+        }
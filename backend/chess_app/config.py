@@ -4,8 +4,10 @@ import os
 
 
 class Config:
-    MODEL_PATH = "chess_model.pth"  # Path to save/load the trained model
-    ENGINE_PATH = "/opt/homebrew/bin/stockfish"  # Make sure Stockfish is here
+    # Path to save/load the trained model
+    MODEL_PATH = os.environ.get("CHESS_MODEL_PATH", "chess_model.pth")
+    # Make sure Stockfish is here
+    ENGINE_PATH = os.environ.get("CHESS_ENGINE_PATH", "/opt/homebrew/bin/stockfish")
     SAVE_DIRECTORY = "saved_games"
     LOG_DIR = "logs"
     PLOTLY_LOG_DIR = "tensorboard_logs"
@@ -26,6 +28,175 @@ class Config:
     NUM_ITERATIONS = 5
     NUM_GAMES_PER_ITERATION = 100
     EPOCHS = 10
+    LR_STEP_SIZE = 5
+    LR_GAMMA = 0.1
+
+    # Training checkpoints (weights, optimizer, scheduler, RNG, Elo)
+    CHECKPOINT_DIR = "checkpoints"
+    CHECKPOINT_KEEP_LAST = 5
+    RESUME_TRAINING = True
+
+    # Data-parallel training: local processes when > 1 (torchrun's
+    # WORLD_SIZE takes precedence for multi-host runs)
+    TRAIN_PROCESSES = int(os.environ.get("CHESS_TRAIN_PROCESSES", "1"))
+    DIST_BACKEND = "gloo"
+    TRAIN_SEED = 0
+    DATALOADER_WORKERS = int(os.environ.get("CHESS_DATALOADER_WORKERS", "4"))
+
+    # Share of each training batch replaced by its colour-flipped mirror
+    # (chess_app/augment.py), 0 disables
+    AUGMENT_FLIP_PROB = 0.5
+
+    # Self-play labelling: move quality from engine centipawn loss, with a
+    # cheap multipv probe and the full node budget for critical positions
+    LABEL_MOVES = True
+    LABEL_ENGINE_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+    LABEL_PROBE_NODES = 2000
+    LABEL_MAX_NODES = 20000
+    LABEL_MULTIPV = 3
+    LABEL_OBVIOUS_GAP = 150  # best move this far ahead of the second: obvious
+    LABEL_DECIDED_SCORE = 1000  # no refinement once the game is decided
+    LABEL_MATE_SCORE = 10000
+    # Upper centipawn-loss bound per quality class; larger losses are blunders
+    LABEL_CPL_CLASSES = [
+        (10, "Great Step"),
+        (40, "Good Step"),
+        (100, "Average Step"),
+        (250, "Bad Step"),
+    ]
+    # Stockfish replies in self-play: fixed nodes, or None for the time
+    # managed SELFPLAY_TIME_CONTROL clock
+    SELFPLAY_REPLY_NODES = 20000
+
+    # Versioned board state for polling clients (/api/get_board)
+    BOARD_STATE_HISTORY = 64  # versions a compact response can diff against
+    BOARD_LONG_POLL_MAX = 25.0  # seconds a long-poll may wait for a change
+
+    # ASGI server (asgi_api.py): UCI engines shared by all games, threads for
+    # model inference, and games kept before the least recently used is dropped
+    ASGI_ENGINE_POOL = 2
+    ASGI_INFERENCE_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+    ASGI_MAX_GAMES = 10000
+
+    # Whole-game analysis (/api/analyze_game): positions per forward pass and
+    # the drop in the mover's expected score (0..1) for each marker
+    ANALYSIS_BATCH_SIZE = 128
+    ANALYSIS_BLUNDER_DROP = 0.3
+    ANALYSIS_MISTAKE_DROP = 0.15
+    ANALYSIS_INACCURACY_DROP = 0.08
+
+    # Distillation of the full network into a small student (distill.py)
+    DISTILL_STUDENT = {"num_residual_blocks": 6, "channels": 64, "head_channels": 32}
+    DISTILL_STUDENT_PATH = "chess_model_student.pth"
+    DISTILL_CACHE_PATH = "teacher_cache.npz"
+    DISTILL_MAX_POSITIONS = 200000
+    DISTILL_EVAL_POSITIONS = 1000  # held out for the agreement report
+    DISTILL_TOP_K = 8  # legal moves kept per position from the teacher policy
+    DISTILL_TEMPERATURE = 2.0
+    DISTILL_EPOCHS = 10
+    DISTILL_BATCH_SIZE = 256
+    DISTILL_LEARNING_RATE = 1e-3
+    DISTILL_REPORT = "distill_report.json"
+
+    # Hot model reload in the API server
+    MODEL_WATCH = True
+    MODEL_WATCH_INTERVAL = 5.0
+    MODEL_KEEP_PREVIOUS = True  # for rollback; one more copy of the weights
+    # Keep the parameters as the mmap'd pages of the checkpoint (CPU only), so
+    # processes serving the same file share one copy through the page cache.
+    # The file must be replaced atomically, as save_model and checkpoints do.
+    MODEL_SHARED_WEIGHTS = os.environ.get("CHESS_MODEL_SHARED", "0") == "1"
+
+    # Pre-fork deployment (serve.py): "flask" (api.py) or "asgi" (asgi_api.py)
+    # workers on one listening socket; each gets an equal share of the cores
+    # for inference threads
+    SERVE_APP = os.environ.get("CHESS_SERVE_APP", "flask")
+    SERVE_WORKERS = int(os.environ.get("CHESS_SERVE_WORKERS", os.cpu_count() or 1))
+    SERVE_HOST = "0.0.0.0"
+    SERVE_PORT = int(os.environ.get("CHESS_SERVE_PORT", 6009))
+
+    # Gauntlet (checkpoint vs checkpoint / engine level tournaments)
+    GAUNTLET_CHECKPOINT_DIR = CHECKPOINT_DIR
+    GAUNTLET_ENGINE_LEVELS = [1, 3, 5]
+    GAUNTLET_FORMAT = "round_robin"  # "round_robin" or "swiss"
+    GAUNTLET_GAMES_PER_PAIR = 2
+    GAUNTLET_SWISS_ROUNDS = 5
+    GAUNTLET_MAX_PLIES = 300
+    GAUNTLET_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+    GAUNTLET_RESULTS_FILE = "gauntlet_results.json"
+    GAUNTLET_ELO_ADVANTAGE = 32.8  # BayesElo default white advantage
+    GAUNTLET_ELO_DRAW = 97.3  # BayesElo default draw width
+    GAUNTLET_PRIOR_DRAWS = 2.0
+
+    # Opening book (Polyglot format) built from SAVE_DIRECTORY
+    BOOK_PATH = "opening_book.bin"
+    BOOK_MAX_PLY = 16
+    BOOK_MODEL_TOP_K = 3
+    BOOK_MODEL_WEIGHT = 1
+
+    # Endgame tablebases built by build_tablebases.py, memory-mapped when
+    # players and self-play probe them
+    TABLEBASE_ENABLED = True
+    TABLEBASE_DIR = "tablebases"
+    TABLEBASE_MATERIALS = ["KQK", "KRK", "KPK", "KBBK", "KBNK"]
+
+    # Native alpha-beta search over ChessNet (AIPlayer mode="search")
+    SEARCH_MAX_NODES = 20000
+    SEARCH_MAX_TIME = 5.0
+    SEARCH_MAX_DEPTH = 32
+    SEARCH_ASPIRATION_WINDOW = 50
+    SEARCH_QUIESCENCE_DEPTH = 6
+    SEARCH_TT_SIZE = 1 << 20  # also caps cached network values
+    SEARCH_PRIORS_SIZE = 1 << 14  # ~4 KB each: a prior for every legal move
+
+    # Clock management (seconds)
+    TIME_EXPECTED_MOVES = 40
+    TIME_MIN_MOVES_LEFT = 15
+    TIME_HARD_FACTOR = 3.0
+    TIME_MOVE_OVERHEAD = 0.05
+    TIME_EMERGENCY_SECONDS = 10
+    TIME_MIN_MOVE_TIME = 0.01
+    TIME_INCREMENT = 0
+    TIME_CONTROLS = [(60, 0), (180, 2), (300, 0), (900, 10)]
+    SELFPLAY_TIME_CONTROL = (60, 0.5)
+
+    # Pondering on the opponent's time in the API server
+    PONDER_ENABLED = True
+    PONDER_TOP_K = 3
+
+    # Test-suite runner (EPD / FEN positions with bm/am annotations)
+    SUITE_PATH = os.path.join(os.path.dirname(__file__), "puzzles.txt")
+    SUITE_BATCH_SIZE = 256
+    SUITE_TIME_BUDGETS = [0.1, 0.5, 1.0]
+    SUITE_ENGINE_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+    SUITE_RESULTS_DIR = "suite_results"
+
+    # Prometheus-text /metrics endpoint and per-stage latency histograms
+    METRICS_ENABLED = os.environ.get("CHESS_METRICS", "1") != "0"
+
+    # Logging: JSON lines in LOG_DIR/LOG_FILE, written by a background thread
+    LOG_FILE = "chess_ai.log"
+    LOG_LEVEL = os.environ.get("CHESS_LOG_LEVEL", "INFO")
+    LOG_RATE_LIMIT = 20  # identical INFO/DEBUG messages per window, 0 disables
+    LOG_RATE_WINDOW = 10.0
+
+    # Training metrics: JSONL in LOG_DIR, tailed by the dashboard, which
+    # reads at most DASHBOARD_READ_BYTES per refresh and plots at most
+    # DASHBOARD_MAX_POINTS (older epochs are thinned out)
+    TRAINING_LOG_FILE = "chess_ai_training.jsonl"
+    DASHBOARD_INTERVAL_MS = 5000
+    DASHBOARD_READ_BYTES = 8 * 1024 * 1024
+    DASHBOARD_MAX_POINTS = 2000
+
+    # Training telemetry: how often the peak-RSS sampler reads /proc (s)
+    TELEMETRY_RSS_INTERVAL = 0.5
+
+    # Desktop board: square sizes whose resized piece sprites are kept
+    SPRITE_CACHE_SIZES = 8
+    # Desktop AI worker: how often its results are picked up (ms), and the
+    # period of the probe that measures event-loop stalls
+    AI_WORKER_POLL_MS = 20
+    STALL_PROBE_MS = 50
 
     LIGHT_THEME = {
         "background": "#F5F5F5",
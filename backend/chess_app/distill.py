@@ -0,0 +1,267 @@
+# chess_app/distill.py
+
+import time
+
+import chess
+import chess.polyglot
+import numpy as np
+import torch
+import torch.nn.functional as F
+import torch.optim as optim
+from torch.utils.data import DataLoader
+
+from chess_app.book import iter_saved_games
+from chess_app.config import Config
+from chess_app.data import board_to_tensor, move_to_index
+from chess_app.log import get_logger
+
+logger = get_logger("distill")
+
+PLANES_SHAPE = (Config.NUM_CHANNELS, Config.BOARD_SIZE, Config.BOARD_SIZE)
+
+
+def collect_positions(
+    save_directory=Config.SAVE_DIRECTORY, max_positions=Config.DISTILL_MAX_POSITIONS
+):
+    """Distinct non-terminal positions from the saved games, in game order."""
+    seen = set()
+    boards = []
+    for game in iter_saved_games(save_directory):
+        board = game.board()
+        for move in game.mainline_moves():
+            key = chess.polyglot.zobrist_hash(board)
+            if key not in seen:
+                seen.add(key)
+                boards.append(board.copy(stack=False))
+                if max_positions and len(boards) >= max_positions:
+                    return boards
+            board.push(move)
+    return boards
+
+
+def unpack_boards(packed):
+    planes = np.unpackbits(packed, axis=-1, count=int(np.prod(PLANES_SHAPE)))
+    return torch.from_numpy(planes.reshape(-1, *PLANES_SHAPE).astype(np.float32))
+
+
+def cache_teacher(
+    teacher,
+    device,
+    boards,
+    path=Config.DISTILL_CACHE_PATH,
+    batch_size=Config.DISTILL_BATCH_SIZE,
+    top_k=Config.DISTILL_TOP_K,
+):
+    """
+    Runs the teacher once over `boards` in batches and writes its outputs to
+    an .npz file: packed board planes, the top_k legal moves with their
+    log-probabilities, the value and the quality logits. Storing only legal
+    moves keeps a position at ~180 bytes instead of a 4672-float policy.
+    """
+    count = len(boards)
+    packed = np.zeros((count, int(np.ceil(np.prod(PLANES_SHAPE) / 8))), np.uint8)
+    move_indices = np.full((count, top_k), -1, np.int16)
+    move_log_probs = np.full((count, top_k), -np.inf, np.float16)
+    values = np.zeros(count, np.float16)
+    qualities = np.zeros((count, 5), np.float16)
+
+    teacher.eval()
+    start = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        chunk = boards[offset : offset + batch_size]
+        batch = torch.stack([board_to_tensor(board) for board in chunk])
+        with torch.inference_mode():
+            policy, value, quality = teacher(batch.to(device))
+        policy = policy.cpu()
+        for row, board in enumerate(chunk):
+            i = offset + row
+            # The 17 planes are all 0/1, so a position fits in 136 bytes.
+            packed[i] = np.packbits(batch[row].numpy().astype(np.uint8))
+            legal = torch.tensor([move_to_index(m) for m in board.legal_moves])
+            scores = policy[row, legal]
+            k = min(top_k, len(legal))
+            top = torch.topk(scores, k)
+            move_indices[i, :k] = legal[top.indices].numpy()
+            move_log_probs[i, :k] = top.values.numpy()
+        values[offset : offset + len(chunk)] = value.squeeze(1).cpu().numpy()
+        qualities[offset : offset + len(chunk)] = quality.cpu().numpy()
+    elapsed = time.perf_counter() - start
+
+    np.savez(
+        path,
+        boards=packed,
+        move_indices=move_indices,
+        move_log_probs=move_log_probs,
+        values=values,
+        qualities=qualities,
+    )
+    logger.info(
+        "Cached teacher outputs for %d positions in %.1f s (%.0f positions/s)",
+        count,
+        elapsed,
+        count / elapsed if elapsed > 0 else 0.0,
+    )
+    return path
+
+
+class TeacherCache(torch.utils.data.Dataset):
+    def __init__(self, path=Config.DISTILL_CACHE_PATH):
+        with np.load(path) as cache:
+            self.boards = cache["boards"]
+            self.move_indices = torch.from_numpy(cache["move_indices"].astype(np.int64))
+            self.move_log_probs = torch.from_numpy(
+                cache["move_log_probs"].astype(np.float32)
+            )
+            self.values = torch.from_numpy(cache["values"].astype(np.float32))
+            self.qualities = torch.from_numpy(cache["qualities"].astype(np.float32))
+
+    def __len__(self):
+        return len(self.boards)
+
+    def __getitem__(self, idx):
+        return (
+            unpack_boards(self.boards[idx])[0],
+            self.move_indices[idx],
+            self.move_log_probs[idx],
+            self.values[idx],
+            self.qualities[idx],
+        )
+
+
+def distillation_loss(
+    outputs, move_indices, move_log_probs, values, qualities, temperature
+):
+    """
+    Cross-entropy against the teacher's softened policy over its cached
+    moves, KL on the quality head and MSE on the value. The T^2 factor keeps
+    gradient scale independent of the temperature.
+    """
+    policy, value, quality = outputs
+    valid = move_indices >= 0
+    teacher_policy = torch.softmax(
+        (move_log_probs / temperature).masked_fill(~valid, float("-inf")), dim=1
+    )
+    student_policy = torch.log_softmax(policy / temperature, dim=1)
+    student_moves = student_policy.gather(1, move_indices.clamp(min=0))
+    loss_policy = -(teacher_policy * student_moves * valid).sum(1).mean()
+
+    loss_quality = F.kl_div(
+        torch.log_softmax(quality / temperature, dim=1),
+        torch.softmax(qualities / temperature, dim=1),
+        reduction="batchmean",
+    )
+    loss_value = F.mse_loss(value.squeeze(1), values)
+    scale = temperature**2
+    return loss_policy * scale, loss_value, loss_quality * scale
+
+
+def train_student(
+    student,
+    device,
+    cache,
+    epochs=Config.DISTILL_EPOCHS,
+    batch_size=Config.DISTILL_BATCH_SIZE,
+    lr=Config.DISTILL_LEARNING_RATE,
+    temperature=Config.DISTILL_TEMPERATURE,
+    logger=None,
+):
+    dataloader = DataLoader(
+        cache,
+        batch_size=batch_size,
+        shuffle=True,
+        num_workers=Config.DATALOADER_WORKERS,
+    )
+    optimizer = optim.Adam(student.parameters(), lr=lr)
+    scheduler = optim.lr_scheduler.CosineAnnealingLR(optimizer, T_max=epochs)
+
+    student.to(device)
+    student.train()
+    for epoch in range(epochs):
+        totals = np.zeros(3)
+        for batch in dataloader:
+            boards, move_indices, move_log_probs, values, qualities = [
+                tensor.to(device) for tensor in batch
+            ]
+            optimizer.zero_grad()
+            losses = distillation_loss(
+                student(boards),
+                move_indices,
+                move_log_probs,
+                values,
+                qualities,
+                temperature,
+            )
+            sum(losses).backward()
+            optimizer.step()
+            totals += [loss.item() for loss in losses]
+        scheduler.step()
+        if logger:
+            policy, value, quality = totals / len(dataloader)
+            logger.info(
+                f"Epoch [{epoch + 1}/{epochs}], Policy: {policy:.4f}, "
+                f"Value: {value:.4f}, Quality: {quality:.4f}"
+            )
+    student.eval()
+    return student
+
+
+def top_moves(model, device, boards, batch_size=Config.DISTILL_BATCH_SIZE):
+    """Best legal policy move, value and quality class for every board."""
+    moves, values, qualities = [], [], []
+    model.eval()
+    for offset in range(0, len(boards), batch_size):
+        chunk = boards[offset : offset + batch_size]
+        batch = torch.stack([board_to_tensor(board) for board in chunk])
+        with torch.inference_mode():
+            policy, value, quality = model(batch.to(device))
+        policy = policy.cpu()
+        for row, board in zip(policy, chunk):
+            legal = list(board.legal_moves)
+            indices = torch.tensor([move_to_index(m) for m in legal])
+            moves.append(legal[int(torch.argmax(row[indices]))])
+        values.extend(value.squeeze(1).cpu().tolist())
+        qualities.extend(quality.argmax(1).cpu().tolist())
+    return moves, values, qualities
+
+
+def move_latency(model, device, boards):
+    """Median seconds for one single-position forward pass and move pick."""
+    samples = []
+    for board in boards:
+        start = time.perf_counter()
+        top_moves(model, device, [board])
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples))
+
+
+def compare(student, teacher, device, boards, latency_positions=50):
+    """Student vs. teacher agreement on held-out boards, and move latency."""
+    student_moves, student_values, student_qualities = top_moves(
+        student, device, boards
+    )
+    teacher_moves, teacher_values, teacher_qualities = top_moves(
+        teacher, device, boards
+    )
+    count = len(boards)
+    # Warm both nets so the first timed pass does not pay for allocation.
+    top_moves(student, device, boards[:1])
+    top_moves(teacher, device, boards[:1])
+    student_latency = move_latency(student, device, boards[:latency_positions])
+    teacher_latency = move_latency(teacher, device, boards[:latency_positions])
+    return {
+        "positions": count,
+        "move_agreement": sum(s == t for s, t in zip(student_moves, teacher_moves))
+        / count,
+        "quality_agreement": sum(
+            s == t for s, t in zip(student_qualities, teacher_qualities)
+        )
+        / count,
+        "value_mae": float(
+            np.mean(np.abs(np.array(student_values) - np.array(teacher_values)))
+        ),
+        "student_latency": student_latency,
+        "teacher_latency": teacher_latency,
+        "speedup": teacher_latency / student_latency if student_latency else 0.0,
+        "student_parameters": sum(p.numel() for p in student.parameters()),
+        "teacher_parameters": sum(p.numel() for p in teacher.parameters()),
+    }
@@ -0,0 +1,117 @@
+# chess_app/distributed.py
+
+import inspect
+import os
+import random
+import socket
+
+import numpy as np
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch.nn.parallel import DistributedDataParallel
+
+from chess_app.config import Config
+
+
+def is_distributed():
+    return dist.is_available() and dist.is_initialized()
+
+
+def rank():
+    return dist.get_rank() if is_distributed() else 0
+
+
+def world_size():
+    return dist.get_world_size() if is_distributed() else 1
+
+
+def is_main_process():
+    return rank() == 0
+
+
+def launched_with_torchrun():
+    """True when RANK/WORLD_SIZE come from torchrun (single or multi host)."""
+    return int(os.environ.get("WORLD_SIZE", "1")) > 1
+
+
+def init_from_env(backend=Config.DIST_BACKEND):
+    """Joins the process group described by torchrun's environment variables."""
+    dist.init_process_group(backend=backend)
+    _limit_threads(int(os.environ.get("LOCAL_WORLD_SIZE", dist.get_world_size())))
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _limit_threads(local_processes):
+    # N processes each using every core for intra-op threads would
+    # oversubscribe the machine; split the cores between them.
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // local_processes))
+
+
+def _worker(local_rank, nprocs, backend, port, fn, args):
+    os.environ["MASTER_ADDR"] = "127.0.0.1"
+    os.environ["MASTER_PORT"] = str(port)
+    dist.init_process_group(backend=backend, rank=local_rank, world_size=nprocs)
+    _limit_threads(nprocs)
+    try:
+        fn(*args)
+    finally:
+        dist.destroy_process_group()
+
+
+def spawn(fn, nprocs, *args, backend=Config.DIST_BACKEND):
+    """Runs fn(*args) in `nprocs` local processes joined in one process group."""
+    mp.spawn(_worker, args=(nprocs, backend, _free_port(), fn, args), nprocs=nprocs)
+
+
+def seed_everything(seed):
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    torch.manual_seed(seed)
+
+
+def wrap_model(model):
+    """
+    DDP over the gloo backend. Buffers are not broadcast from rank 0 on every
+    forward; average_buffers() reconciles BatchNorm statistics instead.
+    """
+    if "forward_sync_buffers" in inspect.signature(DistributedDataParallel).parameters:
+        return DistributedDataParallel(model, forward_sync_buffers=False)
+    return DistributedDataParallel(model, broadcast_buffers=False)
+
+
+def average_buffers(model):
+    """Averages BatchNorm running statistics across ranks."""
+    size = float(world_size())
+    for buffer in model.buffers():
+        if buffer.dtype.is_floating_point:
+            dist.all_reduce(buffer.data, op=dist.ReduceOp.SUM)
+            buffer.data /= size
+
+
+def all_reduce_mean(values):
+    """Element-wise mean of a list of floats across ranks."""
+    if not is_distributed():
+        return list(values)
+    tensor = torch.tensor(values, dtype=torch.float64)
+    dist.all_reduce(tensor, op=dist.ReduceOp.SUM)
+    return (tensor / world_size()).tolist()
+
+
+def all_gather(obj):
+    """Every rank's `obj`, in rank order (picklable objects only)."""
+    if not is_distributed():
+        return [obj]
+    gathered = [None] * world_size()
+    dist.all_gather_object(gathered, obj)
+    return gathered
+
+
+def barrier():
+    if is_distributed():
+        dist.barrier()
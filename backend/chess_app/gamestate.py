@@ -0,0 +1,128 @@
+# chess_app/gamestate.py
+
+import math
+import threading
+import uuid
+from collections import OrderedDict
+
+import chess
+
+from chess_app.config import Config
+
+# Fields a compact response repeats only when they changed.
+DIFF_FIELDS = ("fen", "legalMoves", "gameOver", "turn", "winner")
+
+
+def long_poll_timeout(wait, limit=Config.BOARD_LONG_POLL_MAX):
+    """
+    Seconds a ?wait= long-poll may block: 0 (no waiting) for a missing,
+    negative or non-finite value, at most `limit` otherwise. NaN compares
+    false with everything, so min() alone would let it through unbounded.
+    """
+    if wait is None or not math.isfinite(wait) or wait <= 0:
+        return 0.0
+    return min(wait, limit)
+
+
+class GameState:
+    """
+    Versioned snapshots of the API's game. Every change to the board calls
+    update(), which renders the state once and bumps the version; polls are
+    then answered from the stored snapshot. The SAN history is extended
+    incrementally rather than replayed from the first move.
+
+    The ETag is weak because the full and compact bodies of one version are
+    different encodings of the same state.
+    """
+
+    def __init__(self, history=Config.BOARD_STATE_HISTORY):
+        self.game_id = uuid.uuid4().hex[:8]
+        self.history = history
+        self.version = 0
+        self.snapshots = OrderedDict()
+        self.condition = threading.Condition()
+        self._root_fen = None
+        self._stack = []
+        self._san = []
+        self.update(chess.Board())
+
+    def update(self, board):
+        with self.condition:
+            self._extend_san(board)
+            outcome = board.outcome()
+            self.version += 1
+            self.snapshots[self.version] = {
+                "version": self.version,
+                "root": self._root_fen,
+                "fen": board.fen(),
+                "legalMoves": [move.uci() for move in board.legal_moves],
+                "moves": tuple(self._san),
+                "gameOver": outcome is not None,
+                "turn": "white" if board.turn == chess.WHITE else "black",
+                "winner": str(outcome.winner) if outcome else None,
+            }
+            while len(self.snapshots) > self.history:
+                self.snapshots.popitem(last=False)
+            self.condition.notify_all()
+            return self.version
+
+    def _extend_san(self, board):
+        stack = board.move_stack
+        root_fen = board.root().fen() if stack else board.fen()
+        common = 0
+        if root_fen == self._root_fen:
+            limit = min(len(stack), len(self._stack))
+            while common < limit and stack[common] == self._stack[common]:
+                common += 1
+        # Walk back from the current position to the shared prefix and
+        # render only the plies after it.
+        temp = board.copy()
+        for _ in range(len(stack) - common):
+            temp.pop()
+        san = self._san[:common]
+        for move in stack[common:]:
+            san.append(temp.san(move))
+            temp.push(move)
+        self._root_fen = root_fen
+        self._stack = list(stack)
+        self._san = san
+
+    def current(self):
+        with self.condition:
+            return self.snapshots[self.version]
+
+    def etag(self, version):
+        return f"{self.game_id}-{version}"
+
+    def wait(self, since, timeout):
+        """The first snapshot newer than `since`, or the current one on timeout."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.version > since, timeout)
+            return self.snapshots[self.version]
+
+    def response(self, snapshot, since=None, compact=False):
+        """
+        The full body, or with `compact` only what changed since version
+        `since`: the diff fields that differ and the SAN moves after the
+        common prefix ("movesFrom" is that prefix length). Versions that
+        have left the history get the full body.
+        """
+        base = self.snapshots.get(since) if compact else None
+        if base is None or base["root"] != snapshot["root"]:
+            body = {key: value for key, value in snapshot.items() if key != "root"}
+            body["moves"] = list(snapshot["moves"])
+            return body
+
+        body = {"version": snapshot["version"], "since": since}
+        for key in DIFF_FIELDS:
+            if snapshot[key] != base[key]:
+                body[key] = snapshot[key]
+        old, new = base["moves"], snapshot["moves"]
+        common = 0
+        limit = min(len(old), len(new))
+        while common < limit and old[common] == new[common]:
+            common += 1
+        if common != len(old) or common != len(new):
+            body["movesFrom"] = common
+            body["moves"] = list(new[common:])
+        return body
@@ -0,0 +1,308 @@
+# chess_app/gauntlet.py
+
+import glob
+import json
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import chess
+import numpy as np
+
+from chess_app.config import Config
+
+
+class Participant:
+    """
+    A gauntlet entrant: either a saved ChessNet checkpoint or a Stockfish
+    skill level. The id changes whenever a checkpoint file is rewritten, so
+    cached results are only reused for the exact weights that produced them.
+    """
+
+    def __init__(self, kind, target):
+        self.kind = kind
+        self.target = target
+        if kind == "model":
+            stat = os.stat(target)
+            name = os.path.splitext(os.path.basename(target))[0]
+            self.id = f"{name}@{stat.st_size:x}{int(stat.st_mtime):x}"
+        elif kind == "engine":
+            self.id = f"stockfish-{target}"
+        else:
+            raise ValueError(f"Unknown participant kind: {kind}")
+
+    def spec(self):
+        return (self.kind, self.target)
+
+    @staticmethod
+    def discover(checkpoint_dir, engine_levels, extra_checkpoints=()):
+        participants = []
+        paths = sorted(glob.glob(os.path.join(checkpoint_dir, "*.pth")))
+        for path in list(extra_checkpoints) + paths:
+            if os.path.exists(path) and path not in [p.target for p in participants]:
+                participants.append(Participant("model", path))
+        for level in engine_levels:
+            participants.append(Participant("engine", level))
+        return participants
+
+
+class ResultCache:
+    """Finished games keyed by pairing, persisted as JSON between runs."""
+
+    def __init__(self, path):
+        self.path = path
+        self.results = {}
+        if path and os.path.exists(path):
+            with open(path, "r") as f:
+                self.results = json.load(f)
+
+    def __contains__(self, key):
+        return key in self.results
+
+    def add(self, key, white, black, score):
+        self.results[key] = {"white": white, "black": black, "score": score}
+
+    def games(self, ids=None):
+        for record in self.results.values():
+            if ids is None or (record["white"] in ids and record["black"] in ids):
+                yield record["white"], record["black"], record["score"]
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.results, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+# Players are expensive to build (model load / engine spawn), so each worker
+# process keeps the ones it has already created. Engine subprocesses exit on
+# their own once the worker's pipes close.
+_WORKER_PLAYERS = {}
+
+
+def _get_player(spec, engine_path):
+    if spec not in _WORKER_PLAYERS:
+        from chess_app.utils import AIPlayer
+
+        kind, target = spec
+        if kind == "model":
+            player = AIPlayer(model_path=target, engine_path=engine_path)
+        else:
+            player = AIPlayer(model_path=None, engine_path=engine_path)
+            player.set_difficulty(target)
+        _WORKER_PLAYERS[spec] = player
+    return _WORKER_PLAYERS[spec]
+
+
+def play_game(white_spec, black_spec, engine_path, max_plies):
+    """Plays one game and returns the score from White's point of view."""
+    white = _get_player(white_spec, engine_path)
+    black = _get_player(black_spec, engine_path)
+    white.side = chess.WHITE
+    black.side = chess.BLACK
+    board = chess.Board()
+    while not board.is_game_over(claim_draw=True) and len(board.move_stack) < max_plies:
+        player = white if board.turn == chess.WHITE else black
+        player.side = board.turn
+        board.push(player.get_best_move(board))
+
+    outcome = board.outcome(claim_draw=True)
+    if outcome is None or outcome.winner is None:
+        return 0.5
+    return 1.0 if outcome.winner == chess.WHITE else 0.0
+
+
+def round_robin_pairings(participants, games_per_pair):
+    pairings = []
+    for i, a in enumerate(participants):
+        for b in participants[i + 1 :]:
+            for game in range(games_per_pair):
+                white, black = (a, b) if game % 2 == 0 else (b, a)
+                low, high = sorted([a.id, b.id])
+                pairings.append((f"rr:{low}|{high}:{game}", white, black))
+    return pairings
+
+
+def swiss_pairings(participants, round_num, cache):
+    """
+    Pairs participants with similar scores, avoiding rematches where
+    possible. Scores come from every cached game among the field.
+    """
+    ids = {p.id for p in participants}
+    points = {p.id: 0.0 for p in participants}
+    met = set()
+    for white, black, score in cache.games(ids):
+        points[white] += score
+        points[black] += 1.0 - score
+        met.add(frozenset((white, black)))
+
+    standings = sorted(participants, key=lambda p: (-points[p.id], p.id))
+    pairings = []
+    unpaired = list(standings)
+    while len(unpaired) > 1:
+        first = unpaired.pop(0)
+        opponent_idx = next(
+            (
+                idx
+                for idx, other in enumerate(unpaired)
+                if frozenset((first.id, other.id)) not in met
+            ),
+            0,
+        )
+        second = unpaired.pop(opponent_idx)
+        white, black = (first, second) if round_num % 2 == 0 else (second, first)
+        pairings.append((f"swiss:{round_num}:{white.id}|{black.id}", white, black))
+    return pairings
+
+
+def play_pairings(pairings, cache, engine_path, max_plies, workers, logger=None):
+    pending = [p for p in pairings if p[0] not in cache]
+    if logger:
+        logger.info(
+            f"{len(pairings) - len(pending)} of {len(pairings)} games cached, "
+            f"playing {len(pending)} on {workers} workers."
+        )
+    if not pending:
+        return
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {
+            executor.submit(
+                play_game, white.spec(), black.spec(), engine_path, max_plies
+            ): (key, white, black)
+            for key, white, black in pending
+        }
+        for future in as_completed(futures):
+            key, white, black = futures[future]
+            try:
+                score = future.result()
+            except Exception as e:
+                if logger:
+                    logger.error(f"Game {white.id} vs {black.id} failed: {e}")
+                continue
+            cache.add(key, white.id, black.id, score)
+            # Saved after every game so an interrupted run loses nothing.
+            cache.save()
+            if logger:
+                logger.info(f"{white.id} vs {black.id}: {score}")
+
+
+def fit_ratings(
+    ids,
+    games,
+    advantage=Config.GAUNTLET_ELO_ADVANTAGE,
+    draw_elo=Config.GAUNTLET_ELO_DRAW,
+    prior_draws=Config.GAUNTLET_PRIOR_DRAWS,
+    anchor_rating=Config.INITIAL_ELO,
+    iterations=50,
+):
+    """
+    Maximum-likelihood ratings under the BayesElo model, fitted with Newton
+    steps over whole win/draw/loss count matrices (row = White, column =
+    Black). Returns (ratings, standard errors) as dicts keyed by id, with
+    the mean rating pinned to anchor_rating.
+    """
+    n = len(ids)
+    index = {pid: i for i, pid in enumerate(ids)}
+    wins = np.zeros((n, n))
+    draws = np.zeros((n, n))
+    losses = np.zeros((n, n))
+    for white, black, score in games:
+        i, j = index[white], index[black]
+        if score == 1.0:
+            wins[i, j] += 1
+        elif score == 0.0:
+            losses[i, j] += 1
+        else:
+            draws[i, j] += 1
+
+    # BayesElo-style prior: virtual draws between every pair that has met.
+    played = (wins + draws + losses) > 0
+    played = played | played.T
+    draws = draws + prior_draws / 4.0 * played
+
+    scale = math.log(10) / 400.0
+    delta = scale * draw_elo
+    ratings = np.zeros(n)
+    hessian = -np.eye(n)
+    for _ in range(iterations):
+        x = scale * (ratings[:, None] - ratings[None, :] + advantage)
+        p_win = 1.0 / (1.0 + np.exp(-(x - delta)))
+        p_loss = 1.0 / (1.0 + np.exp(x + delta))
+        p_draw = np.clip(1.0 - p_win - p_loss, 1e-12, None)
+        a = p_win * (1.0 - p_win)
+        b = p_loss * (1.0 - p_loss)
+        d_draw = (b - a) / p_draw
+        d2_draw = (-a * (1.0 - 2.0 * p_win) - b * (1.0 - 2.0 * p_loss)) / p_draw
+
+        g_x = wins * (1.0 - p_win) - losses * (1.0 - p_loss) + draws * d_draw
+        h_x = -wins * a - losses * b + draws * (d2_draw - d_draw**2)
+        np.fill_diagonal(g_x, 0.0)
+        np.fill_diagonal(h_x, 0.0)
+
+        gradient = scale * (g_x.sum(axis=1) - g_x.sum(axis=0))
+        hessian = -(scale**2) * (h_x + h_x.T)
+        np.fill_diagonal(hessian, (scale**2) * (h_x.sum(axis=1) + h_x.sum(axis=0)))
+
+        # Ratings are only defined up to a constant; the rank-one term
+        # removes that direction so the system is solvable.
+        step = np.linalg.solve(hessian - np.ones((n, n)) - 1e-9 * np.eye(n), -gradient)
+        ratings += step
+        ratings -= ratings.mean()
+        if np.max(np.abs(step)) < 1e-4:
+            break
+
+    covariance = np.linalg.pinv(-hessian)
+    errors = np.sqrt(np.clip(np.diag(covariance), 0.0, None))
+    ratings += anchor_rating
+    return (
+        {pid: float(ratings[i]) for pid, i in index.items()},
+        {pid: float(errors[i]) for pid, i in index.items()},
+    )
+
+
+def run_gauntlet(
+    participants,
+    fmt=Config.GAUNTLET_FORMAT,
+    games_per_pair=Config.GAUNTLET_GAMES_PER_PAIR,
+    swiss_rounds=Config.GAUNTLET_SWISS_ROUNDS,
+    results_file=Config.GAUNTLET_RESULTS_FILE,
+    engine_path=Config.ENGINE_PATH,
+    max_plies=Config.GAUNTLET_MAX_PLIES,
+    workers=Config.GAUNTLET_WORKERS,
+    logger=None,
+):
+    cache = ResultCache(results_file)
+    if fmt == "round_robin":
+        pairings = round_robin_pairings(participants, games_per_pair)
+        play_pairings(pairings, cache, engine_path, max_plies, workers, logger)
+    elif fmt == "swiss":
+        for round_num in range(swiss_rounds):
+            if logger:
+                logger.info(f"Swiss round {round_num + 1}/{swiss_rounds}")
+            pairings = swiss_pairings(participants, round_num, cache)
+            play_pairings(pairings, cache, engine_path, max_plies, workers, logger)
+    else:
+        raise ValueError(f"Unknown gauntlet format: {fmt}")
+
+    ids = [p.id for p in participants]
+    games = list(cache.games(set(ids)))
+    ratings, errors = fit_ratings(ids, games)
+    standings = []
+    for pid in sorted(ids, key=lambda pid: -ratings[pid]):
+        played = [g for g in games if pid in (g[0], g[1])]
+        points = sum(s if w == pid else 1.0 - s for w, _, s in played)
+        standings.append(
+            {
+                "id": pid,
+                "rating": ratings[pid],
+                "error": errors[pid],
+                "games": len(played),
+                "points": points,
+            }
+        )
+    return standings
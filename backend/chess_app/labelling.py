@@ -0,0 +1,138 @@
+# chess_app/labelling.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import chess
+import chess.engine
+
+from chess_app.config import Config
+from chess_app.log import get_logger
+
+logger = get_logger("labelling")
+
+
+def quality_from_cpl(cpl, classes=Config.LABEL_CPL_CLASSES):
+    """Maps a centipawn loss to one of ChessDatasetTrain's quality labels."""
+    for limit, label in classes:
+        if cpl <= limit:
+            return label
+    return "Blunder"
+
+
+def _score(info, turn):
+    return info["score"].pov(turn).score(mate_score=Config.LABEL_MATE_SCORE)
+
+
+class Labeller:
+    """
+    Labels (board, move) pairs with a quality class derived from the
+    centipawn loss of the move against the engine's best line.
+
+    Every position starts with a cheap multipv probe. Forced moves skip the
+    engine entirely, and positions whose best move stands out (or whose
+    game is already decided) keep the probe result. Everything else is
+    critical and is analysed again with the full node budget. A played move
+    outside the multipv lines is scored on its own with root_moves.
+    Positions are spread over `workers` engine processes.
+    """
+
+    def __init__(
+        self,
+        engine_path=Config.ENGINE_PATH,
+        workers=Config.LABEL_ENGINE_WORKERS,
+        probe_nodes=Config.LABEL_PROBE_NODES,
+        max_nodes=Config.LABEL_MAX_NODES,
+        multipv=Config.LABEL_MULTIPV,
+    ):
+        self.engine_path = engine_path
+        self.workers = workers
+        self.probe_nodes = probe_nodes
+        self.max_nodes = max_nodes
+        self.multipv = multipv
+        self.engines = []
+        self.lock = threading.Lock()
+        self.counts = {"positions": 0, "forced": 0, "obvious": 0, "critical": 0}
+        self.engine_seconds = 0.0
+        self.nodes = 0
+
+    def _engine(self, worker):
+        while len(self.engines) <= worker:
+            self.engines.append(chess.engine.SimpleEngine.popen_uci(self.engine_path))
+        return self.engines[worker]
+
+    def label(self, positions):
+        """Quality labels for a list of (board, move) pairs, in order."""
+        if not positions:
+            return []
+        labels = [None] * len(positions)
+        workers = max(1, min(self.workers, len(positions)))
+        # Engines are started here, not in the pool, so each worker owns one.
+        engines = [self._engine(worker) for worker in range(workers)]
+
+        def run(worker):
+            for i in range(worker, len(positions), workers):
+                board, move = positions[i]
+                labels[i] = quality_from_cpl(self._cpl(engines[worker], board, move))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(run, range(workers)))
+        return labels
+
+    def _analyse(self, engine, board, nodes, **kwargs):
+        start = time.perf_counter()
+        infos = engine.analyse(board, chess.engine.Limit(nodes=nodes), **kwargs)
+        elapsed = time.perf_counter() - start
+        if isinstance(infos, dict):
+            infos = [infos]
+        with self.lock:
+            self.engine_seconds += elapsed
+            self.nodes += max(info.get("nodes", 0) for info in infos)
+        return infos
+
+    def _is_obvious(self, infos, turn):
+        best = _score(infos[0], turn)
+        if abs(best) >= Config.LABEL_DECIDED_SCORE or len(infos) < 2:
+            return True
+        return best - _score(infos[1], turn) >= Config.LABEL_OBVIOUS_GAP
+
+    def _cpl(self, engine, board, move):
+        if board.legal_moves.count() == 1:
+            self._count("forced")
+            return 0
+        turn = board.turn
+        nodes = self.probe_nodes
+        infos = self._analyse(engine, board, nodes, multipv=self.multipv)
+        if self._is_obvious(infos, turn):
+            self._count("obvious")
+        else:
+            self._count("critical")
+            nodes = self.max_nodes
+            infos = self._analyse(engine, board, nodes, multipv=self.multipv)
+
+        best = _score(infos[0], turn)
+        for info in infos:
+            if info.get("pv") and info["pv"][0] == move:
+                return max(0, best - _score(info, turn))
+        played = self._analyse(engine, board, nodes, root_moves=[move])
+        return max(0, best - _score(played[0], turn))
+
+    def _count(self, key):
+        with self.lock:
+            self.counts["positions"] += 1
+            self.counts[key] += 1
+
+    def stats(self):
+        positions = self.counts["positions"]
+        return dict(
+            self.counts,
+            engine_seconds=self.engine_seconds,
+            nodes=self.nodes,
+            seconds_per_sample=self.engine_seconds / positions if positions else 0.0,
+        )
+
+    def close(self):
+        for engine in self.engines:
+            engine.quit()
+        self.engines = []
@@ -0,0 +1,199 @@
+# chess_app/log.py
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+from chess_app.config import Config
+
+LOGGER_NAME = "ChessAI"
+
+# Attributes every LogRecord has; anything else came in through `extra=`.
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; `extra=` fields are kept as top-level keys."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value if isinstance(value, _PLAIN_TYPES) else str(value)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets at most `limit` identical INFO/DEBUG messages (same logger and
+    formatted text) through per `window` seconds; warnings and errors always
+    pass. The first record after a window that had drops carries a
+    `suppressed` count. Windows that ended over a window ago are pruned once
+    per window, so one-off messages do not accumulate.
+    """
+
+    def __init__(self, limit=Config.LOG_RATE_LIMIT, window=Config.LOG_RATE_WINDOW):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.windows = {}
+        self.next_prune = time.monotonic() + window
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if self.limit <= 0 or record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.levelno, record.getMessage())
+        now = time.monotonic()
+        with self.lock:
+            if now >= self.next_prune:
+                self._prune(now)
+            start, count, suppressed = self.windows.get(key, (now, 0, 0))
+            if now - start >= self.window:
+                start, count = now, 0
+            count += 1
+            if count > self.limit:
+                self.windows[key] = (start, count, suppressed + 1)
+                return False
+            self.windows[key] = (start, count, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+    def _prune(self, now):
+        # Ended windows are kept one more window so a message that comes
+        # back can still report its drops.
+        self.windows = {
+            key: entry
+            for key, entry in self.windows.items()
+            if now - entry[0] < 2 * self.window
+        }
+        self.next_prune = now + self.window
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    The stock QueueHandler formats the message in the calling thread. Records
+    here stay in-process, so %-style arguments that are plain values are left
+    for the listener thread to format; anything else (boards, moves) is
+    formatted now so later mutation cannot change the message.
+    """
+
+    def prepare(self, record):
+        if record.args and not all(
+            isinstance(arg, _PLAIN_TYPES) for arg in record.args
+        ):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Writes to sys.stdout as it is at emit time, so redirects still apply."""
+
+    def __init__(self):
+        logging.Handler.__init__(self)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+
+def setup_logging(level=None):
+    """
+    Installs the queue handler on the ChessAI logger and starts the listener
+    thread that owns the console and file handlers. Safe to call repeatedly.
+    """
+    global _listener
+    with _setup_lock:
+        logger = logging.getLogger(LOGGER_NAME)
+        if _listener is not None:
+            return logger
+
+        os.makedirs(Config.LOG_DIR, exist_ok=True)
+        console = ConsoleHandler()
+        console.setLevel(logging.INFO)
+        console.setFormatter(
+            logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        )
+        log_file = logging.FileHandler(os.path.join(Config.LOG_DIR, Config.LOG_FILE))
+        log_file.setFormatter(JsonFormatter())
+
+        records = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(records)
+        queue_handler.addFilter(RateLimitFilter())
+        logger.addHandler(queue_handler)
+        logger.setLevel(level or Config.LOG_LEVEL)
+        logger.propagate = False
+
+        _listener = logging.handlers.QueueListener(
+            records, console, log_file, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return logger
+
+
+def shutdown_logging():
+    """Drains the queue and stops the listener thread."""
+    global _listener
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        logger = logging.getLogger(LOGGER_NAME)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+
+
+def _reset_after_fork():
+    # The listener thread does not survive fork(). Drop the inherited queue
+    # handler so the child's next get_logger() starts a listener of its own.
+    global _listener, _setup_lock
+    _setup_lock = threading.Lock()
+    if _listener is None:
+        return
+    _listener = None
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_logger(name=None):
+    """
+    Returns the ChessAI logger, or a child of it for a module:
+
+        logger = get_logger("api")
+        logger.debug("Making move: %s", move_uci)
+
+    Pass arguments separately rather than as an f-string, so a message below
+    the configured level costs only a level check.
+    """
+    setup_logging()
+    if name:
+        return logging.getLogger(f"{LOGGER_NAME}.{name}")
+    return logging.getLogger(LOGGER_NAME)
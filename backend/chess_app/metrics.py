@@ -0,0 +1,298 @@
+# chess_app/metrics.py
+
+import bisect
+import os
+import resource
+import threading
+import time
+
+from chess_app.config import Config
+
+# Upper bounds in seconds; the request path spans microseconds to seconds.
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return "{" + body + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            items = sorted(self.values.items())
+        for label_values, value in items:
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram in the Prometheus sense. Observations only
+    touch one bucket counter under a lock; cumulative sums are built when
+    the endpoint is scraped.
+    """
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                # Per-bucket counts (+Inf last), sum, count.
+                series = self.series[label_values] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                    0,
+                ]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def quantile(self, q, *label_values):
+        """Bucket upper bound containing the q-th observation, for quick reports."""
+        with self.lock:
+            series = self.series.get(label_values)
+            if not series or not series[2]:
+                return None
+            counts, _, total = series[0][:], series[1], series[2]
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            items = sorted(
+                (key, (counts[:], total, count))
+                for key, (counts, total, count) in self.series.items()
+            )
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(
+                    self.labels, label_values, ("le", _format_value(float(bound)))
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge:
+    """A value read at scrape time from a callback, e.g. RSS or live games."""
+
+    def __init__(self, name, help_text, callback):
+        self.name = name
+        self.help = help_text
+        self.callback = callback
+
+    def render(self):
+        try:
+            value = self.callback()
+        except Exception:
+            return []
+        if value is None:
+            return []
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {_format_value(value)}",
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+        self.enabled = Config.METRICS_ENABLED
+
+    def counter(self, name, help_text, labels=()):
+        metric = Counter(name, help_text, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, help_text, labels, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, name, help_text, callback):
+        metric = Gauge(name, help_text, callback)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    "chess_request_duration_seconds",
+    "HTTP request latency by endpoint.",
+    labels=("endpoint", "method"),
+)
+REQUESTS = REGISTRY.counter(
+    "chess_requests_total",
+    "HTTP requests by endpoint and status code.",
+    labels=("endpoint", "method", "status"),
+)
+ERRORS = REGISTRY.counter(
+    "chess_request_errors_total",
+    "Requests that ended in a 5xx response.",
+    labels=("endpoint",),
+)
+STAGE_LATENCY = REGISTRY.histogram(
+    "chess_stage_duration_seconds",
+    "Latency of each stage of the request path.",
+    labels=("stage",),
+)
+MOVES = REGISTRY.counter(
+    "chess_ai_moves_total",
+    "AI moves by how they were chosen (tablebase, book, policy, search, engine, ponder).",
+    labels=("source",),
+)
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        STAGE_LATENCY.observe(time.perf_counter() - self.start, self.name)
+        return False
+
+
+def stage(name):
+    """
+    Times a block into chess_stage_duration_seconds{stage=name}:
+
+        with stage("model_forward"):
+            policy, value, quality = model(batch)
+    """
+    if not REGISTRY.enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def record_request(endpoint, method, status, elapsed):
+    if not REGISTRY.enabled:
+        return
+    REQUEST_LATENCY.observe(elapsed, endpoint, method)
+    REQUESTS.inc(endpoint, method, str(status))
+    if status >= 500:
+        ERRORS.inc(endpoint)
+
+
+def record_move(source):
+    if REGISTRY.enabled:
+        MOVES.inc(source)
+
+
+def process_rss_bytes():
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current RSS, but better than nothing off Linux.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def model_bytes(model):
+    if model is None:
+        return 0
+    total = sum(p.numel() * p.element_size() for p in model.parameters())
+    total += sum(b.numel() * b.element_size() for b in model.buffers())
+    return total
+
+
+REGISTRY.gauge(
+    "chess_process_resident_memory_bytes",
+    "Resident set size of the server process.",
+    process_rss_bytes,
+)
+REGISTRY.gauge(
+    "chess_process_threads",
+    "Live Python threads (request, ponder and engine I/O threads).",
+    threading.active_count,
+)
@@ -1,10 +1,16 @@
 # chess_app/model.py
 
+import os
+
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import numpy as np
 
+from chess_app.log import get_logger
+
+logger = get_logger("model")
+
 
 class ResidualBlock(nn.Module):
     def __init__(self, channels):
@@ -24,41 +30,56 @@ class ResidualBlock(nn.Module):
 
 
 class ChessNet(nn.Module):
-    def __init__(self, board_size=8, num_channels=17, num_residual_blocks=256):
+    def __init__(
+        self,
+        board_size=8,
+        num_channels=17,
+        num_residual_blocks=256,
+        channels=512,
+        head_channels=256,
+    ):
         super(ChessNet, self).__init__()
         self.board_size = board_size
         self.num_channels = num_channels
-
-        self.conv1 = nn.Conv2d(num_channels, 512, kernel_size=3, padding=1)
-        self.bn1 = nn.BatchNorm2d(512)
+        # Saved with the weights so checkpoints of any size can be rebuilt.
+        self.arch = {
+            "board_size": board_size,
+            "num_channels": num_channels,
+            "num_residual_blocks": num_residual_blocks,
+            "channels": channels,
+            "head_channels": head_channels,
+        }
+
+        self.conv1 = nn.Conv2d(num_channels, channels, kernel_size=3, padding=1)
+        self.bn1 = nn.BatchNorm2d(channels)
         self.relu = nn.ReLU(inplace=True)
 
         self.residual_blocks = nn.Sequential(
-            *[ResidualBlock(512) for _ in range(num_residual_blocks)]
+            *[ResidualBlock(channels) for _ in range(num_residual_blocks)]
         )
 
-        self.attention = nn.MultiheadAttention(embed_dim=512, num_heads=8)
+        self.attention = nn.MultiheadAttention(embed_dim=channels, num_heads=8)
 
         # Policy head
-        self.policy_conv = nn.Conv2d(512, 256, 1)
-        self.policy_bn = nn.BatchNorm2d(256)
+        self.policy_conv = nn.Conv2d(channels, head_channels, 1)
+        self.policy_bn = nn.BatchNorm2d(head_channels)
         self.policy_relu = nn.ReLU(inplace=True)
         self.policy_fc = nn.Linear(
-            256 * board_size * board_size, board_size * board_size * 73
+            head_channels * board_size * board_size, board_size * board_size * 73
         )
 
         # Value head
-        self.value_conv = nn.Conv2d(512, 256, 1)
-        self.value_bn = nn.BatchNorm2d(256)
+        self.value_conv = nn.Conv2d(channels, head_channels, 1)
+        self.value_bn = nn.BatchNorm2d(head_channels)
         self.value_relu = nn.ReLU(inplace=True)
-        self.value_fc1 = nn.Linear(256 * board_size * board_size, 1024)
+        self.value_fc1 = nn.Linear(head_channels * board_size * board_size, 1024)
         self.value_fc2 = nn.Linear(1024, 1)
 
         # Quality head
-        self.quality_conv = nn.Conv2d(512, 256, 1)
-        self.quality_bn = nn.BatchNorm2d(256)
+        self.quality_conv = nn.Conv2d(channels, head_channels, 1)
+        self.quality_bn = nn.BatchNorm2d(head_channels)
         self.quality_relu = nn.ReLU(inplace=True)
-        self.quality_fc1 = nn.Linear(256 * board_size * board_size, 256)
+        self.quality_fc1 = nn.Linear(head_channels * board_size * board_size, 256)
         self.quality_fc2 = nn.Linear(256, 5)  # 5 classes
 
         self.dropout = nn.Dropout(p=0.3)
@@ -115,15 +136,48 @@ class ChessNet(nn.Module):
             return move_quality_mapping.get(quality_index, "Average Step")
 
 
+def model_from_state(state):
+    """
+    An untrained ChessNet shaped like the weights in `state`. Files without
+    "arch" (plain state dicts) predate it and use the default architecture.
+    """
+    return ChessNet(**(state.get("arch") or {}))
+
+
 def load_model(model, path, device):
     state_dict = torch.load(path, map_location=device)
+    # Training checkpoints (chess_app.checkpoint) and save_model() keep the
+    # weights under "model".
+    if isinstance(state_dict.get("model"), dict):
+        state_dict = state_dict["model"]
     model.load_state_dict(state_dict)
     model.to(device)
     model.eval()
-    print(f"Model loaded from {path}")
+    logger.info("Model loaded from %s", path)
+
+
+def build_model(path, device):
+    """Loads a checkpoint of any architecture (teacher, student, ...)."""
+    state = torch.load(path, map_location="cpu")
+    model = model_from_state(state)
+    if isinstance(state.get("model"), dict):
+        state = state["model"]
+    model.load_state_dict(state)
+    model.to(device)
+    model.eval()
+    logger.info("Model loaded from %s", path)
+    return model
 
 
 def save_model(model, path):
-    model.cpu()
-    torch.save(model.state_dict(), path)
-    print(f"Model saved to {path}")
+    # Copy the weights off the device rather than moving the live model.
+    state = {
+        "model": {
+            key: value.detach().cpu() for key, value in model.state_dict().items()
+        },
+        "arch": getattr(model, "arch", None),
+    }
+    tmp_path = f"{path}.tmp"
+    torch.save(state, tmp_path)
+    os.replace(tmp_path, path)
+    logger.info("Model saved to %s", path)
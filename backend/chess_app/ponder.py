@@ -0,0 +1,130 @@
+# chess_app/ponder.py
+
+import threading
+import time
+
+import chess
+import chess.engine
+import torch
+
+from chess_app.config import Config
+from chess_app.data import board_to_tensor, move_to_index
+from chess_app.log import get_logger
+
+logger = get_logger("ponder")
+
+
+class Ponderer:
+    """
+    Thinks on the opponent's time. After the AI moves, the most likely
+    replies are predicted (policy head, or engine multipv) and the AI's
+    answer to each is computed in a background thread and cached for the
+    current game. The request thread must call resolve() before it uses the
+    player again, which cancels any speculative work still running.
+    """
+
+    def __init__(self, player, top_k=Config.PONDER_TOP_K):
+        self.player = player
+        self.top_k = top_k
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+
+    def start(self, board):
+        """Starts pondering a position where the opponent is to move."""
+        self.cancel()
+        if board.is_game_over():
+            return
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run, args=(board.copy(), self.stop_event), daemon=True
+        )
+        self.thread.start()
+
+    def cancel(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def resolve(self, board):
+        """
+        Called with the position after the opponent's real move. Stops the
+        background work and reports whether the reply was anticipated.
+        """
+        self.cancel()
+        with self.lock:
+            hit = board.fen() in self.cache
+            if hit:
+                self.hits += 1
+                self.time_saved += self.cache[board.fen()][1]
+            else:
+                self.misses += 1
+                self.cache.clear()
+        return hit
+
+    def take(self, board):
+        """Returns the pondered move for this position, if any, and forgets it."""
+        with self.lock:
+            entry = self.cache.pop(board.fen(), None)
+            self.cache.clear()
+        return entry[0] if entry else None
+
+    def reset(self):
+        self.cancel()
+        with self.lock:
+            self.cache.clear()
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / probes if probes else 0.0,
+            "avgLatencySaved": self.time_saved / self.hits if self.hits else 0.0,
+            "totalLatencySaved": self.time_saved,
+        }
+
+    def _predict_replies(self, board):
+        legal = list(board.legal_moves)
+        if self.player.model is not None and not self.player.engine:
+            self.player.model.eval()
+            with torch.no_grad():
+                policy, _, _ = self.player.model(
+                    board_to_tensor(board).unsqueeze(0).to(self.player.device)
+                )
+            log_probs = policy[0].cpu().numpy()
+            legal.sort(key=lambda move: -log_probs[move_to_index(move)])
+            return legal[: self.top_k]
+        if self.player.engine:
+            infos = self.player.engine.analyse(
+                board,
+                chess.engine.Limit(depth=max(1, self.player.difficulty_level - 1)),
+                multipv=self.top_k,
+            )
+            return [info["pv"][0] for info in infos if info.get("pv")]
+        return []
+
+    def _think(self, board, stop_event):
+        move = self.player.get_best_move(board, stop_event=stop_event, speculative=True)
+        return None if stop_event.is_set() else move
+
+    def _run(self, board, stop_event):
+        try:
+            for reply in self._predict_replies(board):
+                if stop_event.is_set():
+                    return
+                child = board.copy()
+                child.push(reply)
+                start = time.perf_counter()
+                move = self._think(child, stop_event)
+                if move is None:
+                    return
+                with self.lock:
+                    self.cache[child.fen()] = (move, time.perf_counter() - start)
+        except Exception as e:
+            logger.warning("Pondering stopped: %s", e)
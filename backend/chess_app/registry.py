@@ -0,0 +1,215 @@
+# chess_app/registry.py
+
+import os
+import threading
+import time
+
+import chess
+import torch
+
+from chess_app.config import Config
+from chess_app.data import board_to_tensor
+from chess_app.log import get_logger
+from chess_app.metrics import model_bytes, process_rss_bytes
+from chess_app.model import model_from_state
+
+logger = get_logger("registry")
+
+
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return f"{int(stat.st_mtime_ns):x}-{stat.st_size:x}"
+
+
+class ModelVersion:
+    def __init__(self, number, model, path, fingerprint, load_seconds):
+        self.number = number
+        self.model = model
+        self.path = path
+        self.fingerprint = fingerprint
+        self.load_seconds = load_seconds
+        self.loaded_at = time.time()
+        self.bytes = model_bytes(model)
+
+    def describe(self):
+        return {
+            "version": self.number,
+            "path": self.path,
+            "fingerprint": self.fingerprint,
+            "loadedAt": self.loaded_at,
+            "loadSeconds": round(self.load_seconds, 3),
+            "bytes": self.bytes,
+        }
+
+
+class ModelRegistry:
+    """
+    Holds the network the API plays with. New weights are loaded and warmed
+    in a background thread and then swapped in with a single assignment, so
+    a move already running keeps the model object it started with and the
+    next move picks up the new one. The previous version is kept for
+    rollback, which bounds resident weights at three copies during a swap
+    (current, previous, incoming).
+
+    With `shared` weights on the CPU the parameters are the checkpoint's own
+    mmap'd pages rather than a copy, so every process serving the same file
+    (serve.py workers) maps one copy through the page cache.
+    """
+
+    def __init__(
+        self,
+        path=Config.MODEL_PATH,
+        device=None,
+        keep_previous=Config.MODEL_KEEP_PREVIOUS,
+        model_factory=None,
+        shared=None,
+    ):
+        self.path = path
+        # Builds the network for each load; by default it is shaped from the
+        # checkpoint's own "arch" entry.
+        self.model_factory = model_factory
+        self.device = device if device else torch.device("cpu")
+        self.keep_previous = keep_previous
+        if shared is None:
+            shared = Config.MODEL_SHARED_WEIGHTS
+        self.shared = shared and self.device.type == "cpu"
+        self.current = None
+        self.previous = None
+        self.versions = 0
+        self.loading = False
+        self.last_error = None
+        self.last_swap = {}
+        self.lock = threading.Lock()
+        self.watcher = None
+        self.stop_event = threading.Event()
+        if path and os.path.exists(path):
+            self.reload(path, wait=True)
+
+    def get(self):
+        return self.current
+
+    def reload(self, path=None, wait=False):
+        """
+        Loads `path` (default: the watched path) and swaps it in. Returns
+        False if a load is already running.
+        """
+        path = path or self.path
+        with self.lock:
+            if self.loading:
+                return False
+            self.loading = True
+        if wait:
+            self._load(path)
+        else:
+            threading.Thread(target=self._load, args=(path,), daemon=True).start()
+        return True
+
+    def _load(self, path):
+        start = time.perf_counter()
+        rss_before = process_rss_bytes()
+        peak = rss_before
+        try:
+            fingerprint = file_fingerprint(path)
+            # mmap keeps the checkpoint out of anonymous memory while it is
+            # copied into the parameters.
+            state = torch.load(path, map_location="cpu", mmap=True)
+            # Shared weights replace every tensor, so build without
+            # allocating or initialising any.
+            with torch.device("meta" if self.shared else "cpu"):
+                if self.model_factory:
+                    model = self.model_factory()
+                else:
+                    model = model_from_state(state)
+            peak = max(peak, process_rss_bytes())
+            if isinstance(state.get("model"), dict):
+                state = state["model"]
+            model.load_state_dict(state, assign=self.shared)
+            del state
+            peak = max(peak, process_rss_bytes())
+            model.to(self.device)
+            model.eval()
+            self._warm(model)
+            peak = max(peak, process_rss_bytes())
+        except Exception as e:
+            self.last_error = f"{path}: {e}"
+            logger.exception("Model reload from %s failed: %s", path, e)
+            with self.lock:
+                self.loading = False
+            return
+
+        with self.lock:
+            self.versions += 1
+            version = ModelVersion(
+                self.versions, model, path, fingerprint, time.perf_counter() - start
+            )
+            if self.keep_previous and self.current is not None:
+                self.previous = self.current
+            self.current = version
+            self.loading = False
+            self.last_error = None
+        self.last_swap = {
+            "rssBefore": rss_before,
+            "rssPeak": peak,
+            "rssAfter": process_rss_bytes(),
+            "peakIncrease": peak - rss_before,
+            "modelBytes": version.bytes,
+        }
+        logger.info(
+            "Model version %d loaded from %s in %.2f s (RSS peak +%.1f MB)",
+            version.number,
+            path,
+            version.load_seconds,
+            (peak - rss_before) / 2**20,
+        )
+
+    def _warm(self, model):
+        # The first forward pass allocates workspaces; pay for it here
+        # rather than in the first move after the swap.
+        with torch.no_grad():
+            model(board_to_tensor(chess.Board()).unsqueeze(0).to(self.device))
+
+    def rollback(self):
+        """Swaps the previous version back in. Returns False if there is none."""
+        with self.lock:
+            if self.previous is None:
+                return False
+            self.current, self.previous = self.previous, self.current
+        logger.info("Rolled back to model version %d", self.current.number)
+        return True
+
+    def watch(self, interval=Config.MODEL_WATCH_INTERVAL):
+        """Polls the model path and reloads whenever the file is replaced."""
+        if self.watcher is not None:
+            return
+        self.watcher = threading.Thread(
+            target=self._watch, args=(interval,), daemon=True
+        )
+        self.watcher.start()
+
+    def _watch(self, interval):
+        seen = self.current.fingerprint if self.current else None
+        while not self.stop_event.wait(interval):
+            try:
+                fingerprint = file_fingerprint(self.path)
+            except OSError:
+                continue
+            if fingerprint != seen and not self.loading:
+                seen = fingerprint
+                logger.info("Model file %s changed, reloading", self.path)
+                self.reload(self.path)
+
+    def close(self):
+        self.stop_event.set()
+        if self.watcher is not None:
+            self.watcher.join()
+            self.watcher = None
+
+    def stats(self):
+        current, previous = self.current, self.previous
+        return {
+            "current": current.describe() if current else None,
+            "previous": previous.describe() if previous else None,
+            "loading": self.loading,
+            "lastError": self.last_error,
+            "lastSwap": self.last_swap,
+        }
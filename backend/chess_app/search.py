@@ -0,0 +1,378 @@
+# chess_app/search.py
+
+import time
+
+import chess
+import chess.polyglot
+import torch
+
+from chess_app.config import Config
+from chess_app.data import board_to_tensor, move_to_index
+
+MATE_SCORE = 100000
+MATE_THRESHOLD = MATE_SCORE - 1000
+# The value head is trained on 1.0 / 0.5 / 0.0 (White win / draw / Black
+# win), so 0.5 maps to a score of zero and each side of it to +/-1000.
+VALUE_SCALE = 1000
+EXACT, LOWER, UPPER = 0, 1, 2
+PIECE_VALUES = {
+    chess.PAWN: 1,
+    chess.KNIGHT: 3,
+    chess.BISHOP: 3,
+    chess.ROOK: 5,
+    chess.QUEEN: 9,
+    chess.KING: 0,
+}
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult:
+    def __init__(self, move, score, depth, nodes, elapsed, pv):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.pv = pv
+
+    @property
+    def nps(self):
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (
+            f"SearchResult(move={self.move}, score={self.score}, depth={self.depth}, "
+            f"nodes={self.nodes}, nps={self.nps:.0f})"
+        )
+
+
+class AlphaBetaSearcher:
+    """
+    Iterative-deepening principal variation search over ChessNet. The value
+    head scores leaves and the policy head orders moves; all children of a
+    node are evaluated in one batched forward pass and cached by Zobrist key.
+    """
+
+    def __init__(
+        self,
+        model,
+        device,
+        max_nodes=Config.SEARCH_MAX_NODES,
+        max_time=Config.SEARCH_MAX_TIME,
+        max_depth=Config.SEARCH_MAX_DEPTH,
+        aspiration_window=Config.SEARCH_ASPIRATION_WINDOW,
+        quiescence_depth=Config.SEARCH_QUIESCENCE_DEPTH,
+        tt_size=Config.SEARCH_TT_SIZE,
+        priors_size=Config.SEARCH_PRIORS_SIZE,
+    ):
+        self.model = model
+        self.device = device
+        self.max_nodes = max_nodes
+        self.max_time = max_time
+        self.max_depth = max_depth
+        self.aspiration_window = aspiration_window
+        self.quiescence_depth = quiescence_depth
+        self.tt_size = tt_size
+        self.priors_size = priors_size
+        self.tt = {}
+        self.values = {}
+        self.priors = {}
+        self.nodes = 0
+        self.evaluations = 0
+        self.deadline = None
+        self.node_limit = None
+        # Set by callers (e.g. pondering) to abort a search from another thread.
+        self.stop_event = None
+
+    def clear(self):
+        self.tt.clear()
+        self.values.clear()
+        self.priors.clear()
+
+    # Evaluation
+
+    def _evaluate(self, boards, with_priors=False):
+        """Runs one forward pass for every board not already cached."""
+        pending = []
+        for board in boards:
+            key = chess.polyglot.zobrist_hash(board)
+            if key not in self.values or (with_priors and key not in self.priors):
+                pending.append((key, board))
+        if not pending:
+            return
+        # Like the TT, the caches are cleared when full; they outlive a
+        # search, so an AIPlayer would otherwise grow with every move.
+        if len(self.values) + len(pending) > self.tt_size:
+            self.values.clear()
+        if with_priors and len(self.priors) + len(pending) > self.priors_size:
+            self.priors.clear()
+
+        batch = torch.stack([board_to_tensor(board) for _, board in pending])
+        with torch.inference_mode():
+            policy, value, _ = self.model(batch.to(self.device))
+        policy = policy.cpu().numpy()
+        value = value.squeeze(1).cpu().numpy()
+        self.evaluations += len(pending)
+
+        for (key, board), log_probs, v in zip(pending, policy, value):
+            self.values[key] = int((2.0 * float(v) - 1.0) * VALUE_SCALE)
+            if with_priors:
+                self.priors[key] = {
+                    move: float(log_probs[move_to_index(move)])
+                    for move in board.legal_moves
+                }
+
+    def _static_eval(self, board, key):
+        if key not in self.values:
+            self._evaluate([board])
+        score = self.values[key]
+        return score if board.turn == chess.WHITE else -score
+
+    def _prefetch(self, board, moves, with_priors=False):
+        # A batched forward pass is the slowest step of a node; do not start
+        # one after the deadline.
+        self._check_time()
+        children = []
+        for move in moves:
+            board.push(move)
+            children.append(board.copy(stack=False))
+            board.pop()
+        self._evaluate(children, with_priors)
+
+    # Limits
+
+    def _check_limits(self):
+        self.nodes += 1
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchTimeout()
+        # Every node: each can run a forward pass, which costs far more than
+        # a perf_counter() call.
+        self._check_time()
+
+    def _check_time(self):
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout()
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise SearchTimeout()
+
+    # Move ordering
+
+    def _ordered_moves(self, board, key, tt_move):
+        priors = self.priors.get(key, {})
+        moves = list(board.legal_moves)
+
+        def score(move):
+            if move == tt_move:
+                return float("inf")
+            if move in priors:
+                return priors[move]
+            # Without a prior, prefer captures of valuable pieces.
+            victim = board.piece_type_at(move.to_square)
+            return -100.0 + (PIECE_VALUES[victim] if victim else 0)
+
+        moves.sort(key=score, reverse=True)
+        return moves
+
+    def _ordered_captures(self, board):
+        def mvv_lva(move):
+            victim = board.piece_type_at(move.to_square) or chess.PAWN
+            attacker = board.piece_type_at(move.from_square)
+            return PIECE_VALUES[victim] * 10 - PIECE_VALUES[attacker]
+
+        return sorted(board.generate_legal_captures(), key=mvv_lva, reverse=True)
+
+    # Transposition table
+
+    def _tt_store(self, key, depth, score, flag, move, ply):
+        if len(self.tt) >= self.tt_size and key not in self.tt:
+            self.tt.clear()
+        # Mate scores are stored relative to this node, not the root.
+        if score > MATE_THRESHOLD:
+            score += ply
+        elif score < -MATE_THRESHOLD:
+            score -= ply
+        self.tt[key] = (depth, score, flag, move)
+
+    def _tt_probe(self, key, ply):
+        entry = self.tt.get(key)
+        if entry is None:
+            return None
+        depth, score, flag, move = entry
+        if score > MATE_THRESHOLD:
+            score -= ply
+        elif score < -MATE_THRESHOLD:
+            score += ply
+        return depth, score, flag, move
+
+    # Search
+
+    def _quiesce(self, board, alpha, beta, ply, qdepth):
+        self._check_limits()
+        key = chess.polyglot.zobrist_hash(board)
+        stand_pat = self._static_eval(board, key)
+        if stand_pat >= beta or qdepth >= self.quiescence_depth:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        captures = self._ordered_captures(board)
+        self._prefetch(board, captures)
+        for move in captures:
+            board.push(move)
+            score = -self._quiesce(board, -beta, -alpha, ply + 1, qdepth + 1)
+            board.pop()
+            if score >= beta:
+                return score
+            alpha = max(alpha, score)
+        return alpha
+
+    def _pvs(self, board, depth, alpha, beta, ply):
+        self._check_limits()
+        if ply > 0 and (
+            board.is_insufficient_material()
+            or board.halfmove_clock >= 100
+            or board.is_repetition(2)
+        ):
+            return 0
+
+        key = chess.polyglot.zobrist_hash(board)
+        original_alpha = alpha
+        tt_move = None
+        entry = self._tt_probe(key, ply)
+        if entry is not None:
+            tt_depth, tt_score, tt_flag, tt_move = entry
+            if ply > 0 and tt_depth >= depth:
+                if tt_flag == EXACT:
+                    return tt_score
+                if tt_flag == LOWER:
+                    alpha = max(alpha, tt_score)
+                elif tt_flag == UPPER:
+                    beta = min(beta, tt_score)
+                if alpha >= beta:
+                    return tt_score
+
+        if depth <= 0:
+            # Quiescence does not see mates, so catch them at the horizon.
+            if board.is_checkmate():
+                return -MATE_SCORE + ply
+            return self._quiesce(board, alpha, beta, ply, 0)
+
+        moves = self._ordered_moves(board, key, tt_move)
+        if not moves:
+            return -MATE_SCORE + ply if board.is_check() else 0
+        # Children at the frontier only need values; deeper children also
+        # need priors so their own moves can be ordered.
+        self._prefetch(board, moves, with_priors=depth > 1)
+
+        best_score = -MATE_SCORE
+        best_move = moves[0]
+        for i, move in enumerate(moves):
+            board.push(move)
+            if i == 0:
+                score = -self._pvs(board, depth - 1, -beta, -alpha, ply + 1)
+            else:
+                score = -self._pvs(board, depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < score < beta:
+                    score = -self._pvs(board, depth - 1, -beta, -alpha, ply + 1)
+            board.pop()
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self._tt_store(key, depth, best_score, flag, best_move, ply)
+        return best_score
+
+    def _principal_variation(self, board, max_length):
+        pv = []
+        board = board.copy()
+        seen = set()
+        while len(pv) < max_length:
+            key = chess.polyglot.zobrist_hash(board)
+            entry = self.tt.get(key)
+            if entry is None or key in seen or entry[3] not in board.legal_moves:
+                break
+            seen.add(key)
+            pv.append(entry[3])
+            board.push(entry[3])
+        return pv
+
+    def search(self, board, max_nodes=None, max_time=None, soft_time=None):
+        """
+        Searches until the node budget, the hard time limit, or max_depth is
+        reached. A new iteration is not started once soft_time has passed
+        (by default half the hard limit). Returns the result of the deepest
+        completed iteration.
+        """
+        max_nodes = max_nodes if max_nodes is not None else self.max_nodes
+        max_time = max_time if max_time is not None else self.max_time
+        if soft_time is None and max_time is not None:
+            soft_time = max_time / 2.0
+
+        start = time.perf_counter()
+        self.nodes = 0
+        self.node_limit = max_nodes
+        self.deadline = start + max_time if max_time is not None else None
+        board = board.copy()
+
+        legal_moves = list(board.legal_moves)
+        if not legal_moves:
+            return SearchResult(None, 0, 0, 0, 0.0, [])
+        self._evaluate([board], with_priors=True)
+        root_key = chess.polyglot.zobrist_hash(board)
+        best = SearchResult(
+            self._ordered_moves(board, root_key, None)[0], 0, 0, 0, 0.0, []
+        )
+
+        score = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                if depth > 1 and self.aspiration_window:
+                    delta = self.aspiration_window
+                    alpha, beta = score - delta, score + delta
+                    while True:
+                        score = self._pvs(board, depth, alpha, beta, 0)
+                        if score <= alpha:
+                            alpha = max(-MATE_SCORE, alpha - delta)
+                        elif score >= beta:
+                            beta = min(MATE_SCORE, beta + delta)
+                        else:
+                            break
+                        delta *= 2
+                else:
+                    score = self._pvs(board, depth, -MATE_SCORE, MATE_SCORE, 0)
+            except SearchTimeout:
+                break
+
+            entry = self.tt.get(root_key)
+            elapsed = time.perf_counter() - start
+            if entry is not None and entry[3] in legal_moves:
+                best = SearchResult(
+                    entry[3],
+                    score,
+                    depth,
+                    self.nodes,
+                    elapsed,
+                    self._principal_variation(board, depth),
+                )
+            if abs(score) > MATE_THRESHOLD or len(legal_moves) == 1:
+                break
+            if soft_time is not None and elapsed >= soft_time:
+                break
+
+        best.nodes = self.nodes
+        best.elapsed = time.perf_counter() - start
+        self.deadline = None
+        self.node_limit = None
+        return best
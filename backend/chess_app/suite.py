@@ -0,0 +1,172 @@
+# chess_app/suite.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import chess
+import chess.engine
+import torch
+
+from chess_app.config import Config
+from chess_app.data import board_to_tensor, move_to_index
+
+
+class SuitePosition:
+    def __init__(self, board, name, best_moves=(), avoid_moves=()):
+        self.board = board
+        self.name = name
+        self.best_moves = list(best_moves)
+        self.avoid_moves = list(avoid_moves)
+
+    @property
+    def annotated(self):
+        return bool(self.best_moves or self.avoid_moves)
+
+    def is_solved(self, move):
+        if self.best_moves:
+            return move in self.best_moves
+        return move not in self.avoid_moves
+
+
+def load_suite(path):
+    """
+    Reads a test suite with one position per line. EPD lines may carry bm
+    (best move) / am (avoid move) / id opcodes; plain six-field FEN lines
+    are accepted but cannot be scored.
+    """
+    positions = []
+    with open(path, "r") as f:
+        for line_num, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if ";" not in line and len(line.split()) == 6:
+                board, ops = chess.Board(line), {}
+            else:
+                board, ops = chess.Board.from_epd(line)
+            positions.append(
+                SuitePosition(
+                    board,
+                    ops.get("id", f"line {line_num}"),
+                    ops.get("bm", []),
+                    ops.get("am", []),
+                )
+            )
+    return positions
+
+
+def solve_with_model(model, device, positions, batch_size=Config.SUITE_BATCH_SIZE):
+    """Top legal policy move for every position, one forward pass per chunk."""
+    model.eval()
+    moves = []
+    for start in range(0, len(positions), batch_size):
+        chunk = positions[start : start + batch_size]
+        batch = torch.stack([board_to_tensor(p.board) for p in chunk]).to(device)
+        with torch.no_grad():
+            policy, _, _ = model(batch)
+        policy = policy.cpu()
+        for row, position in zip(policy, chunk):
+            legal = list(position.board.legal_moves)
+            if not legal:
+                moves.append(None)
+                continue
+            indices = torch.tensor([move_to_index(m) for m in legal])
+            moves.append(legal[int(torch.argmax(row[indices]))])
+    return moves
+
+
+def solve_with_search(searcher, positions, time_budget):
+    moves = []
+    for position in positions:
+        # Fresh tables per position keep results independent of run order.
+        searcher.clear()
+        result = searcher.search(position.board, max_time=time_budget, max_nodes=None)
+        moves.append(result.move)
+    return moves
+
+
+def solve_with_engines(engine_path, positions, time_budget, workers):
+    """Solves positions in parallel, one engine process per worker thread."""
+    local = threading.local()
+    engines = []
+    engines_lock = threading.Lock()
+
+    def solve(position):
+        if not hasattr(local, "engine"):
+            local.engine = chess.engine.SimpleEngine.popen_uci(engine_path)
+            with engines_lock:
+                engines.append(local.engine)
+        result = local.engine.play(position.board, chess.engine.Limit(time=time_budget))
+        return result.move
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(solve, positions))
+    finally:
+        for engine in engines:
+            engine.quit()
+
+
+def score_run(solver, budget, positions, solve):
+    start = time.perf_counter()
+    moves = solve(positions)
+    elapsed = time.perf_counter() - start
+    scored = [(p, m) for p, m in zip(positions, moves) if p.annotated]
+    solved = sum(p.is_solved(m) for p, m in scored)
+    return {
+        "solver": solver,
+        "budget": budget,
+        "positions": len(positions),
+        "scored": len(scored),
+        "solved": solved,
+        "solve_rate": solved / len(scored) if scored else 0.0,
+        "positions_per_second": len(positions) / elapsed if elapsed > 0 else 0.0,
+        "failed": [p.name for p, m in scored if not p.is_solved(m)],
+    }
+
+
+def run_suite(
+    positions,
+    model=None,
+    device=None,
+    searcher=None,
+    engine_path=None,
+    time_budgets=Config.SUITE_TIME_BUDGETS,
+    workers=Config.SUITE_ENGINE_WORKERS,
+):
+    """
+    Scores every available solver. The policy network is a single point;
+    search and engine solvers are run once per time budget to give a
+    solve-rate-vs-time curve.
+    """
+    report = []
+    if model is not None:
+        report.append(
+            score_run(
+                "policy",
+                None,
+                positions,
+                lambda ps: solve_with_model(model, device, ps),
+            )
+        )
+    for budget in time_budgets:
+        if searcher is not None:
+            report.append(
+                score_run(
+                    "search",
+                    budget,
+                    positions,
+                    lambda ps: solve_with_search(searcher, ps, budget),
+                )
+            )
+        if engine_path:
+            report.append(
+                score_run(
+                    "engine",
+                    budget,
+                    positions,
+                    lambda ps: solve_with_engines(engine_path, ps, budget, workers),
+                )
+            )
+    return report
@@ -0,0 +1,453 @@
+# chess_app/tablebase.py
+
+import os
+import time
+
+import chess
+import numpy as np
+
+from chess_app.config import Config
+from chess_app.log import get_logger
+
+logger = get_logger("tablebase")
+
+# Table values are int8 from the side to move: +d wins with mate in d plies,
+# -(d + 1) is mated in d plies (-1: checkmated), 0 draws.
+ILLEGAL = -128
+PIECE_LETTERS = "QRBNP"
+PIECE_TYPES = {
+    "Q": chess.QUEEN,
+    "R": chess.ROOK,
+    "B": chess.BISHOP,
+    "N": chess.KNIGHT,
+    "P": chess.PAWN,
+}
+
+_BIT = np.array([1 << square for square in range(64)], dtype=np.uint64)
+_ROOK_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+_BISHOP_DIRECTIONS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+_KING_STEPS = _ROOK_DIRECTIONS + _BISHOP_DIRECTIONS
+_KNIGHT_STEPS = [(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)]
+
+
+def _geometry():
+    """
+    Move targets per piece type and square (-1 padded), which squares each
+    type attacks on an empty board, and the squares between two aligned
+    squares as a bitboard.
+    """
+    targets = {}
+    attacks = {}
+    between = np.zeros((64, 64), dtype=np.uint64)
+    for piece_type, directions, sliding in (
+        (chess.KING, _KING_STEPS, False),
+        (chess.KNIGHT, _KNIGHT_STEPS, False),
+        (chess.ROOK, _ROOK_DIRECTIONS, True),
+        (chess.BISHOP, _BISHOP_DIRECTIONS, True),
+        (chess.QUEEN, _KING_STEPS, True),
+    ):
+        squares = []
+        for square in range(64):
+            reachable = []
+            for df, dr in directions:
+                file, rank = chess.square_file(square), chess.square_rank(square)
+                passed = 0
+                while True:
+                    file, rank = file + df, rank + dr
+                    if not (0 <= file < 8 and 0 <= rank < 8):
+                        break
+                    target = chess.square(file, rank)
+                    reachable.append(target)
+                    if sliding:
+                        between[square, target] = passed
+                        passed |= 1 << target
+                    else:
+                        break
+            squares.append(reachable)
+        width = max(len(reachable) for reachable in squares)
+        targets[piece_type] = np.full((64, width), -1, dtype=np.int64)
+        attacks[piece_type] = np.zeros((64, 64), dtype=bool)
+        for square, reachable in enumerate(squares):
+            targets[piece_type][square, : len(reachable)] = reachable
+            attacks[piece_type][square, reachable] = True
+    attacks[chess.PAWN] = np.zeros((64, 64), dtype=bool)
+    for square in range(8, 56):
+        for df in (-1, 1):
+            file = chess.square_file(square) + df
+            if 0 <= file < 8:
+                attacks[chess.PAWN][square, square + 8 + df] = True
+    return targets, attacks, between
+
+
+_TARGETS, _ATTACKS, _BETWEEN = _geometry()
+
+
+def _attacked(piece_type, square, target, occupied):
+    """Whether a white piece on `square` attacks `target` (numpy arrays)."""
+    return _ATTACKS[piece_type][square, target] & (
+        (_BETWEEN[square, target] & occupied) == 0
+    )
+
+
+class Material:
+    """
+    A material set with a bare defending king, e.g. "KBNK", normalised so
+    the stronger side is white. Positions are indexed by
+    (white king, black king, pieces...) squares, with the board flipped so
+    the white king sits on files a-d, and without pawns also on ranks 1-4.
+    """
+
+    def __init__(self, name):
+        letters = name[1:-1]
+        if (
+            not name.startswith("K")
+            or not name.endswith("K")
+            or not letters
+            or any(letter not in PIECE_TYPES for letter in letters)
+        ):
+            raise ValueError(f"Unknown material {name}")
+        if len(letters) > 1 and any(letter not in "BN" for letter in letters):
+            # Generation scores every capture of a white piece as a draw,
+            # which holds only while any one piece left alone cannot win.
+            raise ValueError(f"{name}: only one piece, or two minor pieces")
+        self.name = name
+        self.letters = letters
+        self.pieces = [PIECE_TYPES[letter] for letter in letters]
+        self.pawns = chess.PAWN in self.pieces
+        self.kings = [
+            square
+            for square in range(64)
+            if chess.square_file(square) < 4
+            and (self.pawns or chess.square_rank(square) < 4)
+        ]
+        self.king_slot = np.full(64, -1, dtype=np.int64)
+        self.king_slot[self.kings] = np.arange(len(self.kings))
+        self.size = len(self.kings) * 64 ** (1 + len(self.pieces))
+
+    def decode(self, index):
+        pieces = []
+        for _ in self.pieces:
+            index, square = np.divmod(index, 64)
+            pieces.insert(0, square)
+        slot, black_king = np.divmod(index, 64)
+        return np.array(self.kings, dtype=np.int64)[slot], black_king, pieces
+
+    def index(self, white_king, black_king, pieces):
+        flip = np.where(white_king & 7 >= 4, 7, 0)
+        if not self.pawns:
+            flip |= np.where(white_king >= 32, 56, 0)
+        index = self.king_slot[white_king ^ flip] * 64 + (black_king ^ flip)
+        for square in pieces:
+            index = index * 64 + (square ^ flip)
+        return index
+
+    def index_one(self, white_king, black_king, pieces):
+        """index() for one position, without numpy overhead."""
+        flip = 7 if white_king & 7 >= 4 else 0
+        if not self.pawns and white_king >= 32:
+            flip |= 56
+        index = self.kings.index(white_king ^ flip) * 64 + (black_king ^ flip)
+        for square in pieces:
+            index = index * 64 + (square ^ flip)
+        return index
+
+
+def material_name(letters):
+    return "K" + "".join(sorted(letters, key=PIECE_LETTERS.index)) + "K"
+
+
+def table_path(directory, name):
+    return os.path.join(directory, f"{name}.npy")
+
+
+def generate(name, directory=Config.TABLEBASE_DIR):
+    """
+    Builds the table for `name` by retrograde analysis and writes it to
+    `directory`, generating the tables pawn promotions lead to first.
+    Returns generation statistics.
+    """
+    material = Material(name)
+    start = time.perf_counter()
+    promotions = {}
+    if material.pawns:
+        for letter in "QR":
+            # Minor-piece promotions only reach drawn material.
+            sub_name = material_name(material.letters.replace("P", letter))
+            path = table_path(directory, sub_name)
+            if not os.path.exists(path):
+                generate(sub_name, directory)
+            promotions[letter] = (Material(sub_name), np.load(path, mmap_mode="r"))
+
+    index = np.arange(material.size, dtype=np.int64)
+    white_king, black_king, pieces = material.decode(index)
+    del index
+    squares = [white_king, black_king] + pieces
+    occupied = np.zeros(material.size, dtype=np.uint64)
+    for square in squares:
+        occupied |= _BIT[square]
+    white_occupied = occupied & ~_BIT[black_king]
+
+    legal = ~_ATTACKS[chess.KING][white_king, black_king]
+    for i, first in enumerate(squares):
+        for second in squares[i + 1 :]:
+            legal &= first != second
+    for piece_type, square in zip(material.pieces, pieces):
+        if piece_type == chess.PAWN:
+            legal &= (square >= 8) & (square < 56)
+    in_check = np.zeros(material.size, dtype=bool)
+    for piece_type, square in zip(material.pieces, pieces):
+        in_check |= _attacked(piece_type, square, black_king, occupied)
+    # A bare king can only "check" the white king from next door, which
+    # `legal` already rules out.
+    white_legal = legal & ~in_check
+    black_legal = legal
+
+    def successors(new_white_king, new_black_king, new_pieces, possible, legal_after):
+        safe = [np.where(possible, square, 0) for square in new_pieces]
+        successor = material.index(
+            np.where(possible, new_white_king, 0),
+            np.where(possible, new_black_king, 0),
+            safe,
+        )
+        possible = possible & legal_after[successor]
+        return np.where(possible, successor, -1).astype(np.int32)
+
+    # White moves: black-to-move successors, and promotion exits holding
+    # the black-to-move distance to mate in the promoted table (-1: draw).
+    white_moves = []
+    white_exits = []
+    for target in _TARGETS[chess.KING][white_king].T:
+        possible = white_legal & (target >= 0)
+        target = np.where(possible, target, 0)
+        possible &= (white_occupied & _BIT[target]) == 0
+        white_moves.append(
+            successors(target, black_king, pieces, possible, black_legal)
+        )
+    for k, (piece_type, square) in enumerate(zip(material.pieces, pieces)):
+        if piece_type == chess.PAWN:
+            single = square + 8
+            possible = white_legal & ((occupied & _BIT[np.minimum(single, 63)]) == 0)
+            promoting = possible & (single >= 56)
+            for letter, (sub_material, sub_table) in promotions.items():
+                sub_pieces = list(pieces)
+                sub_pieces[k] = np.where(promoting, single, 0)
+                sub_index = sub_material.index(
+                    np.where(promoting, white_king, 0),
+                    np.where(promoting, black_king, 0),
+                    sub_pieces,
+                )
+                value = sub_table[1][sub_index].astype(np.int16)
+                exit_dtm = np.where((value < 0) & (value != ILLEGAL), -value - 1, -1)
+                white_exits.append(np.where(promoting, exit_dtm, -2).astype(np.int16))
+            for target, possible in (
+                (single, possible & ~promoting),
+                (
+                    square + 16,
+                    possible
+                    & (square < 16)
+                    & ((occupied & _BIT[np.minimum(square + 16, 63)]) == 0),
+                ),
+            ):
+                moved = list(pieces)
+                moved[k] = target
+                white_moves.append(
+                    successors(white_king, black_king, moved, possible, black_legal)
+                )
+            continue
+        for target in _TARGETS[piece_type][square].T:
+            possible = white_legal & (target >= 0)
+            target = np.where(possible, target, 0)
+            possible &= (occupied & _BIT[target]) == 0
+            possible &= (_BETWEEN[square, target] & occupied) == 0
+            moved = list(pieces)
+            moved[k] = target
+            white_moves.append(
+                successors(white_king, black_king, moved, possible, black_legal)
+            )
+
+    # Black king moves; taking a white piece reaches drawn material.
+    black_moves = []
+    black_draws = np.zeros(material.size, dtype=bool)
+    for target in _TARGETS[chess.KING][black_king].T:
+        possible = black_legal & (target >= 0)
+        target = np.where(possible, target, 0)
+        capture = np.zeros(material.size, dtype=bool)
+        for k, square in enumerate(pieces):
+            taken = possible & (square == target)
+            capture |= taken
+            safe = ~_ATTACKS[chess.KING][white_king, target]
+            after = occupied & ~_BIT[black_king]
+            for m, (piece_type, other) in enumerate(zip(material.pieces, pieces)):
+                if m != k:
+                    safe &= ~_attacked(piece_type, other, target, after)
+            black_draws |= taken & safe
+        black_moves.append(
+            successors(white_king, target, pieces, possible & ~capture, white_legal)
+        )
+    del occupied, white_occupied, squares, white_king, black_king, pieces
+
+    black_has_move = black_draws.copy()
+    for successor in black_moves:
+        black_has_move |= successor >= 0
+    white_dtm = np.full(material.size, -1, dtype=np.int16)
+    black_dtm = np.full(material.size, -1, dtype=np.int16)
+    black_dtm[black_legal & ~black_has_move & in_check] = 0
+    white_open = white_legal.copy()
+    black_open = black_legal & black_has_move & ~black_draws
+    del in_check, black_has_move, black_draws
+
+    plies = 1
+    while True:
+        # White mates in `plies` if some move reaches a black loss one sooner.
+        candidates = np.flatnonzero(white_open)
+        wins = np.zeros(len(candidates), dtype=bool)
+        for successor in white_moves:
+            reached = successor[candidates]
+            wins |= (reached >= 0) & (black_dtm[np.maximum(reached, 0)] == plies - 1)
+        for exit_dtm in white_exits:
+            wins |= exit_dtm[candidates] == plies - 1
+        won = candidates[wins]
+        white_dtm[won] = plies
+        white_open[won] = False
+        # Black is mated in plies + 1 once every move reaches a white win.
+        candidates = np.flatnonzero(black_open)
+        lost = np.ones(len(candidates), dtype=bool)
+        longest = np.zeros(len(candidates), dtype=np.int16)
+        for successor in black_moves:
+            reached = successor[candidates]
+            dtm = np.where(reached >= 0, white_dtm[np.maximum(reached, 0)], 0)
+            lost &= dtm >= 0
+            longest = np.maximum(longest, dtm)
+        mated = candidates[lost]
+        black_dtm[mated] = longest[lost] + 1
+        black_open[mated] = False
+        if not len(mated):
+            break
+        plies += 2
+
+    os.makedirs(directory, exist_ok=True)
+    path = table_path(directory, name)
+    partial = path + ".tmp.npy"
+    table = np.lib.format.open_memmap(
+        partial, mode="w+", dtype=np.int8, shape=(2, material.size)
+    )
+    table[0] = np.where(white_legal, np.maximum(white_dtm, 0), ILLEGAL)
+    table[1] = np.where(
+        black_legal, np.where(black_dtm >= 0, -black_dtm - 1, 0), ILLEGAL
+    )
+    table.flush()
+    del table
+    os.replace(partial, path)
+    stats = {
+        "name": name,
+        "seconds": time.perf_counter() - start,
+        "bytes": os.path.getsize(path),
+        "positions": int(white_legal.sum() + black_legal.sum()),
+        "white_wins": int((white_dtm > 0).sum()),
+        "longest_mate_plies": int(max(white_dtm.max(), black_dtm.max())),
+    }
+    logger.info(
+        "Generated %s: %d positions, %d won for white to move, longest mate %d "
+        "plies, %.1f MB in %.1f s",
+        name,
+        stats["positions"],
+        stats["white_wins"],
+        stats["longest_mate_plies"],
+        stats["bytes"] / 2**20,
+        stats["seconds"],
+    )
+    return stats
+
+
+class Tablebase:
+    """
+    Probes the tables in `directory`, memory-mapped on first use, so every
+    player and process shares them through the page cache. Positions
+    outside the tables (more pieces, castling rights, missing files)
+    probe as None.
+    """
+
+    def __init__(self, directory=Config.TABLEBASE_DIR):
+        self.directory = directory
+        self.tables = {}
+
+    def _table(self, name):
+        if name not in self.tables:
+            path = table_path(self.directory, name)
+            table = None
+            if os.path.exists(path):
+                table = (Material(name), np.load(path, mmap_mode="r"))
+            self.tables[name] = table
+        return self.tables[name]
+
+    def value(self, board):
+        """The raw table value for the side to move, or None."""
+        if chess.popcount(board.occupied) > 4 or board.castling_rights:
+            return None
+        if chess.popcount(board.occupied_co[chess.BLACK]) == 1:
+            strong = chess.WHITE
+        elif chess.popcount(board.occupied_co[chess.WHITE]) == 1:
+            strong = chess.BLACK
+        else:
+            return None
+        pieces = [
+            (PIECE_LETTERS.index(piece.symbol().upper()), square)
+            for square, piece in board.piece_map().items()
+            if piece.piece_type != chess.KING
+        ]
+        pieces.sort()
+        entry = self._table(
+            material_name(PIECE_LETTERS[letter] for letter, _ in pieces)
+        )
+        if entry is None:
+            return None
+        material, table = entry
+        flip = 0 if strong == chess.WHITE else 56
+        index = material.index_one(
+            board.king(strong) ^ flip,
+            board.king(not strong) ^ flip,
+            [square ^ flip for _, square in pieces],
+        )
+        value = int(table[0 if board.turn == strong else 1, index])
+        return None if value == ILLEGAL else value
+
+    def probe(self, board):
+        """(wdl, plies to mate) for the side to move, wdl 1/0/-1, or None."""
+        value = self.value(board)
+        if value is None:
+            return None
+        if value > 0:
+            return 1, value
+        if value < 0:
+            return -1, -value - 1
+        return 0, 0
+
+    def best_move(self, board):
+        """The fastest win, a draw, or the longest resistance; None if not covered."""
+        if self.value(board) is None:
+            return None
+        best = None
+        best_key = None
+        for move in board.legal_moves:
+            board.push(move)
+            # Positions the tables leave out here (a captured piece,
+            # a minor promotion) are draws.
+            result = self.probe(board) or (0, 0)
+            board.pop()
+            wdl, plies = -result[0], result[1]
+            key = (wdl, -plies if wdl > 0 else plies if wdl < 0 else 0)
+            if best_key is None or key > best_key:
+                best, best_key = move, key
+        return best
+
+
+_shared = {}
+
+
+def open_tablebase(directory=Config.TABLEBASE_DIR):
+    """The process-wide Tablebase for `directory`, or None when disabled."""
+    if not Config.TABLEBASE_ENABLED:
+        return None
+    if directory not in _shared:
+        _shared[directory] = Tablebase(directory)
+    return _shared[directory]
@@ -0,0 +1,202 @@
+# chess_app/telemetry.py
+
+import os
+import resource
+import threading
+import time
+
+from chess_app.config import Config
+from chess_app.metrics import process_rss_bytes
+
+# Stages of one optimisation step, in the order train_model laps them.
+STEP_STAGES = ("data_wait", "to_device", "forward", "backward", "optimizer")
+SELF_PLAY_STAGES = ("model", "engine", "labelling")
+
+
+class MemorySampler(threading.Thread):
+    """
+    Samples the process RSS every `interval` seconds from /proc and keeps
+    the peak since the last reset(). One file read per sample, unlike
+    tracemalloc, which hooks every Python allocation and misses the tensor
+    memory that dominates training anyway.
+    """
+
+    def __init__(self, interval=Config.TELEMETRY_RSS_INTERVAL):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        rss = process_rss_bytes()
+        if rss > self.peak:
+            self.peak = rss
+        return rss
+
+    def reset(self):
+        self.peak = 0
+        return self.sample()
+
+    def stop(self):
+        self.stopped.set()
+
+
+class TrainingTelemetry:
+    """
+    Where one training iteration spends its time: self-play (model, engine,
+    labelling), each part of an optimisation step, checkpointing, plus
+    throughput and peak memory. Stages are accumulated as plain floats, a
+    perf_counter call each, so it stays on in production runs.
+
+    train_model laps the step stages:
+
+        mark = telemetry.lap("forward", mark)
+
+    On a GPU the stage times are host-side: kernels run asynchronously and
+    their time lands in the stage that waits for them (loss.item() in
+    "optimizer").
+    """
+
+    def __init__(self, tensorboard_logger=None, sampler=None):
+        self.tensorboard_logger = tensorboard_logger
+        self.sampler = sampler or MemorySampler()
+        if not self.sampler.is_alive():
+            self.sampler.start()
+        self.start_iteration()
+
+    def start_iteration(self):
+        self.seconds = {}
+        self.counts = {}
+        self.started = time.perf_counter()
+        self.sampler.reset()
+
+    def lap(self, stage, since):
+        now = time.perf_counter()
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + now - since
+        return now
+
+    def add(self, stage, seconds):
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def timed(self, stage):
+        return _Timed(self, stage)
+
+    def finish(self, iteration, self_play_stats=None):
+        """Summary of the iteration; also written to TensorBoard."""
+        stats = self_play_stats or {}
+        wall = time.perf_counter() - self.started
+        self_play = self.seconds.get("self_play", 0.0)
+        step_seconds = sum(self.seconds.get(stage, 0.0) for stage in STEP_STAGES)
+        steps = self.counts.get("steps", 0)
+        games = stats.get("games", 0)
+        summary = {
+            "iteration": iteration,
+            "wall_seconds": wall,
+            "games_per_minute": games / self_play * 60 if self_play else 0.0,
+            "self_play_samples_per_second": (
+                stats.get("samples", 0) / self_play if self_play else 0.0
+            ),
+            "train_samples_per_second": (
+                self.counts.get("samples", 0) / step_seconds if step_seconds else 0.0
+            ),
+            "data_wait_fraction": (
+                self.seconds.get("data_wait", 0.0) / step_seconds
+                if step_seconds
+                else 0.0
+            ),
+            "step_ms": {
+                stage: self.seconds.get(stage, 0.0) / steps * 1000 if steps else 0.0
+                for stage in STEP_STAGES
+            },
+            "stage_seconds": {
+                "self_play": self_play,
+                "model": stats.get("model_seconds", 0.0),
+                "engine": stats.get("engine_seconds", 0.0),
+                "labelling": stats.get("label_seconds", 0.0),
+                "training": step_seconds,
+                "checkpoint": self.seconds.get("checkpoint", 0.0),
+            },
+            "games": games,
+            "steps": steps,
+            "peak_rss_mb": self.sampler.peak / 2**20,
+            "max_rss_mb": _max_rss_bytes() / 2**20,
+        }
+        if self.tensorboard_logger:
+            metrics = {
+                "Telemetry/games_per_minute": summary["games_per_minute"],
+                "Telemetry/self_play_samples_per_second": summary[
+                    "self_play_samples_per_second"
+                ],
+                "Telemetry/train_samples_per_second": summary[
+                    "train_samples_per_second"
+                ],
+                "Telemetry/data_wait_fraction": summary["data_wait_fraction"],
+                "Telemetry/peak_rss_mb": summary["peak_rss_mb"],
+            }
+            for stage, value in summary["step_ms"].items():
+                metrics[f"Telemetry/step_ms/{stage}"] = value
+            for stage, value in summary["stage_seconds"].items():
+                metrics[f"Telemetry/seconds/{stage}"] = value
+            self.tensorboard_logger.log_metrics(metrics, iteration)
+        return summary
+
+    def close(self):
+        self.sampler.stop()
+
+
+class _Timed:
+    __slots__ = ("telemetry", "stage", "start")
+
+    def __init__(self, telemetry, stage):
+        self.telemetry = telemetry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.telemetry.lap(self.stage, self.start)
+        return False
+
+
+def _max_rss_bytes():
+    # Lifetime peak of the process, kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+def format_summary(summary):
+    """The iteration summary as a small table, one string per line."""
+    stages = summary["stage_seconds"]
+    wall = summary["wall_seconds"]
+    lines = [
+        f"Iteration {summary['iteration'] + 1} telemetry ({wall:.1f} s wall):",
+        f"  {'stage':<12}{'seconds':>10}{'share':>8}",
+    ]
+    for stage, seconds in stages.items():
+        share = seconds / wall if wall else 0.0
+        # model, engine and labelling are parts of self_play
+        name = f"  {stage}" if stage in SELF_PLAY_STAGES else stage
+        lines.append(f"  {name:<12}{seconds:>10.2f}{share:>8.1%}")
+    step = summary["step_ms"]
+    lines.append(
+        "  step ms: "
+        + ", ".join(f"{stage} {value:.2f}" for stage, value in step.items())
+        + f" ({summary['steps']} steps)"
+    )
+    lines.append(
+        f"  {summary['games_per_minute']:.1f} games/min, "
+        f"{summary['self_play_samples_per_second']:.1f} self-play samples/s, "
+        f"{summary['train_samples_per_second']:.1f} train samples/s, "
+        f"data-loader wait {summary['data_wait_fraction']:.1%}, "
+        f"peak RSS {summary['peak_rss_mb']:.0f} MB"
+    )
+    return lines
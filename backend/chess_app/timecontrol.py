@@ -0,0 +1,133 @@
+# chess_app/timecontrol.py
+
+import random
+
+import numpy as np
+
+from chess_app.config import Config
+
+
+class TimeBudget:
+    """
+    Per-move allowance in seconds. A search should not start a new iteration
+    after `soft` and must stop by `hard`.
+    """
+
+    def __init__(self, soft, hard, emergency=False):
+        self.soft = soft
+        self.hard = hard
+        self.emergency = emergency
+
+    def __repr__(self):
+        return f"TimeBudget(soft={self.soft:.3f}, hard={self.hard:.3f}, emergency={self.emergency})"
+
+
+class TimeManager:
+    """
+    Splits the remaining clock over the moves the game is still expected to
+    last, spends most of the increment, and switches to a thin emergency
+    budget when the clock runs low.
+    """
+
+    def __init__(
+        self,
+        expected_moves=Config.TIME_EXPECTED_MOVES,
+        min_moves_left=Config.TIME_MIN_MOVES_LEFT,
+        hard_factor=Config.TIME_HARD_FACTOR,
+        move_overhead=Config.TIME_MOVE_OVERHEAD,
+        emergency_seconds=Config.TIME_EMERGENCY_SECONDS,
+        min_time=Config.TIME_MIN_MOVE_TIME,
+    ):
+        self.expected_moves = expected_moves
+        self.min_moves_left = min_moves_left
+        self.hard_factor = hard_factor
+        self.move_overhead = move_overhead
+        self.emergency_seconds = emergency_seconds
+        self.min_time = min_time
+
+    def allocate(self, remaining, increment=0.0, move_number=1, moves_to_go=None):
+        # Never plan to use time that lag and bookkeeping will eat.
+        usable = max(0.0, remaining - self.move_overhead)
+        if moves_to_go is None:
+            moves_to_go = max(self.min_moves_left, self.expected_moves - move_number)
+
+        if remaining < max(self.emergency_seconds, 5 * increment):
+            soft = usable / (moves_to_go * 2) + increment * 0.5
+            hard = min(usable * 0.1 + increment * 0.5, usable)
+            soft = min(soft, hard)
+            return TimeBudget(
+                max(self.min_time, soft), max(self.min_time, hard), emergency=True
+            )
+
+        soft = usable / moves_to_go + increment * 0.8
+        hard = min(soft * self.hard_factor, usable * 0.25 + increment)
+        soft = min(soft, hard)
+        return TimeBudget(max(self.min_time, soft), max(self.min_time, hard))
+
+
+def simulate_game(num_plies, base, increment, manager, rng, usage_spread=0.4):
+    """
+    Replays a game of num_plies under one time control. Each move uses its
+    soft budget scaled by a random factor (searches rarely stop exactly on
+    time), capped at the hard limit, plus the manager's move overhead.
+    Returns per-side move times and whether either side flagged.
+    """
+    clocks = [base, base]
+    move_times = [[], []]
+    emergency_moves = 0
+    flagged = False
+    for ply in range(num_plies):
+        side = ply % 2
+        budget = manager.allocate(clocks[side], increment, ply // 2 + 1)
+        emergency_moves += budget.emergency
+        used = budget.soft * rng.uniform(1 - usage_spread, 1 + usage_spread)
+        used = min(used, budget.hard) + manager.move_overhead
+        clocks[side] -= used
+        move_times[side].append(used)
+        if clocks[side] < 0:
+            flagged = True
+            break
+        clocks[side] += increment
+    return move_times, clocks, flagged, emergency_moves
+
+
+def simulate_time_controls(game_lengths, time_controls, manager=None, seed=0):
+    """
+    Replays every game length (in plies) under each (base, increment) time
+    control and summarises flag-falls and time usage.
+    """
+    manager = manager or TimeManager()
+    rng = random.Random(seed)
+    report = []
+    for base, increment in time_controls:
+        flag_falls = 0
+        emergency = 0
+        total_moves = 0
+        per_move = []
+        usage = []
+        for num_plies in game_lengths:
+            move_times, clocks, flagged, emergency_moves = simulate_game(
+                num_plies, base, increment, manager, rng
+            )
+            flag_falls += flagged
+            emergency += emergency_moves
+            for side in (0, 1):
+                per_move.extend(move_times[side])
+                total_moves += len(move_times[side])
+                budget = base + increment * len(move_times[side])
+                usage.append(sum(move_times[side]) / budget if budget else 0.0)
+
+        per_move = np.array(per_move) if per_move else np.zeros(1)
+        report.append(
+            {
+                "time_control": f"{base:g}+{increment:g}",
+                "games": len(game_lengths),
+                "flag_falls": flag_falls,
+                "emergency_fraction": emergency / total_moves if total_moves else 0.0,
+                "move_time_p50": float(np.percentile(per_move, 50)),
+                "move_time_p90": float(np.percentile(per_move, 90)),
+                "move_time_max": float(per_move.max()),
+                "clock_used_mean": float(np.mean(usage)) if usage else 0.0,
+            }
+        )
+    return report
@@ -0,0 +1,162 @@
+# chess_app/traininglog.py
+
+import json
+import os
+import threading
+import time
+
+from chess_app.config import Config
+from chess_app.log import get_logger
+
+logger = get_logger("traininglog")
+
+
+class TrainingLog:
+    """
+    Append-only JSONL of per-epoch training metrics, one object per line.
+    Epochs are numbered across iterations and resumed runs: the count
+    continues from the last line already in the file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.epoch = self._last_epoch()
+
+    def append(self, **metrics):
+        self.epoch += 1
+        entry = {"epoch": self.epoch, "ts": round(time.time(), 3)}
+        entry.update(metrics)
+        # One write of a whole line, so a tailing reader never sees half of
+        # one for longer than it takes to arrive.
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+        return entry
+
+    def _last_epoch(self):
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 64 * 1024))
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return 0
+        for line in reversed(lines):
+            try:
+                return int(json.loads(line)["epoch"])
+            except (ValueError, KeyError, TypeError):
+                continue
+        return 0
+
+
+class LogTail:
+    """
+    Reads a growing JSONL file from a remembered offset. Each read() parses
+    only bytes appended since the last one, at most `max_bytes` of them, so
+    a reader that starts on a long log catches up over a few calls instead
+    of stalling on one. A file that shrinks or is replaced is read again
+    from the start.
+    """
+
+    def __init__(self, path, max_bytes=Config.DASHBOARD_READ_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.offset = 0
+        self.inode = None
+        self.partial = b""
+
+    def read(self):
+        """(entries, restarted): new complete entries; restarted if the file was."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return [], False
+        restarted = False
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            restarted = self.inode is not None
+            self.inode = stat.st_ino
+            self.offset = 0
+            self.partial = b""
+        if stat.st_size == self.offset:
+            return [], restarted
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(min(stat.st_size - self.offset, self.max_bytes))
+        self.offset += len(data)
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        entries = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                logger.warning("Skipping malformed line in %s", self.path)
+        return entries, restarted
+
+
+class DownsampledSeries:
+    """
+    At most `max_points` points for display: every `stride`-th point added.
+    When full, every other point is dropped and the stride doubles, so a
+    long run keeps an evenly thinned history at a fixed size. `generation`
+    changes whenever points already handed out are dropped.
+    """
+
+    def __init__(self, max_points=Config.DASHBOARD_MAX_POINTS):
+        self.max_points = max_points
+        self.generation = 0
+        self.clear()
+
+    def clear(self):
+        self.points = []
+        self.stride = 1
+        self.seen = 0
+        self.generation += 1
+
+    def add(self, point):
+        if self.seen % self.stride == 0:
+            self.points.append(point)
+            if len(self.points) > self.max_points:
+                self.points = self.points[::2]
+                self.stride *= 2
+                self.generation += 1
+        self.seen += 1
+
+
+class TrainingSeries:
+    """
+    The dashboard's view of the training log, shared by all its clients.
+    Each client keeps a cursor (series generation and points already sent)
+    and gets only newer points, or the whole thinned series when its cursor
+    is from an older generation.
+    """
+
+    def __init__(self, path, max_points=Config.DASHBOARD_MAX_POINTS):
+        self.tail = LogTail(path)
+        self.series = DownsampledSeries(max_points)
+        self.lock = threading.Lock()
+
+    def poll(self):
+        with self.lock:
+            entries, restarted = self.tail.read()
+            if restarted:
+                self.series.clear()
+            for entry in entries:
+                self.series.add((entry["epoch"], entry.get("loss"), entry.get("elo")))
+
+    def update(self, cursor=None):
+        """(full, points, cursor); full means points replace what the client has."""
+        self.poll()
+        with self.lock:
+            generation = self.series.generation
+            points = self.series.points
+            sent = len(points)
+            new_cursor = {"generation": generation, "sent": sent}
+            if (
+                not cursor
+                or cursor["generation"] != generation
+                or cursor["sent"] > sent
+            ):
+                return True, list(points), new_cursor
+            return False, points[cursor["sent"] :], new_cursor
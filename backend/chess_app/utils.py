@@ -1,16 +1,22 @@
 # chess_app/utils.py
 
+from chess_app.book import BookStats, OpeningBook
 from chess_app.config import Config
 from chess_app.data import board_to_tensor, move_to_index, index_to_move
-from chess_app.model import ChessNet, load_model, save_model
+from chess_app.log import get_logger
+from chess_app.metrics import record_move, stage
+from chess_app.model import ChessNet, build_model, load_model, save_model
+from chess_app.search import AlphaBetaSearcher
+from chess_app.tablebase import open_tablebase
+from chess_app.timecontrol import TimeManager
+from chess_app.traininglog import TrainingSeries
 from sklearn.linear_model import LinearRegression
 from tkinter import messagebox
 from torch.utils.tensorboard import SummaryWriter
 from tqdm import tqdm
 import chess.engine
 import chess.pgn
-import json
-import logging
+import contextlib
 import numpy as np
 import os
 import pygame
@@ -21,16 +27,42 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 
+logger = get_logger("utils")
+
 
 def get_device():
     if torch.cuda.is_available():
-        print("Using CUDA device (NVIDIA GPU)")
+        logger.debug("Using CUDA device (NVIDIA GPU)")
         return torch.device("cuda")
     else:
-        print("Using CPU device")
+        logger.debug("Using CPU device")
         return torch.device("cpu")
 
 
+def engine_move(engine, board, limit, stop_event=None):
+    """
+    engine.play(), or with a stop_event an analysis that is stopped as soon
+    as the event is set; a stopped search returns None.
+    """
+    if stop_event is None:
+        return engine.play(board, limit).move
+    with engine.analysis(board, limit) as analysis:
+        for _ in analysis:
+            if stop_event.is_set():
+                return None
+        best = analysis.wait()
+    return None if stop_event.is_set() else best.move
+
+
+def _stage(name, speculative):
+    return contextlib.nullcontext() if speculative else stage(name)
+
+
+def _record_move(source, speculative):
+    if not speculative:
+        record_move(source)
+
+
 class AIPlayer:
     def __init__(
         self,
@@ -38,60 +70,180 @@ class AIPlayer:
         device=None,
         side=chess.WHITE,
         engine_path=Config.ENGINE_PATH,
+        book_path=Config.BOOK_PATH,
+        mode="policy",
+        model=None,
+        registry=None,
+        tablebase=None,
     ):
         self.device = device if device else get_device()
-        self.model = ChessNet().to(self.device)
+        self.model = None
         self.model_path = model_path
         self.side = side
         self.engine_path = engine_path
+        # A ModelRegistry lets a running game pick up hot-reloaded weights.
+        self.registry = registry
+        self.model_version = registry.get() if registry else None
 
-        if model_path and os.path.exists(model_path):
-            load_model(self.model, model_path, self.device)
-            print("Loaded trained model.")
+        if model is not None:
+            # An already-loaded network, e.g. one shared between players.
+            self.model = model.to(self.device)
+            self.model.eval()
+            self.engine = None
+        elif self.model_version is not None:
+            self.model = self.model_version.model
+            self.engine = None
+        elif model_path and os.path.exists(model_path):
+            self.model = build_model(model_path, self.device)
+            logger.info("Loaded trained model from %s.", model_path)
             self.engine = None
         else:
-            print("Trained model not found. Using Stockfish as fallback.")
+            logger.info("Trained model not found. Using Stockfish as fallback.")
             self.engine = chess.engine.SimpleEngine.popen_uci(self.engine_path)
 
         self.difficulty_level = 2
 
+        # "policy" plays the top legal policy move, "search" runs alpha-beta.
+        self.mode = mode
+        self.time_manager = TimeManager()
+        self.searcher = None
+        self.last_search = None
+        if self.model is not None and mode == "search":
+            self.searcher = AlphaBetaSearcher(self.model, self.device)
+
+        # Shared and memory-mapped; None when tablebases are disabled.
+        self.tablebase = tablebase if tablebase is not None else open_tablebase()
+
+        self.book = None
+        self.book_stats = BookStats()
+        if book_path and os.path.exists(book_path):
+            self.book = OpeningBook(book_path)
+            logger.info("Loaded opening book from %s.", book_path)
+
     def set_difficulty(self, level):
         self.difficulty_level = level
         if self.engine:
             self.engine.configure({"Skill Level": level})
 
-    def get_best_move(self, board):
-        if self.model and (not self.engine) and board.turn == self.side:
+    def get_best_move(
+        self, board, remaining=None, increment=0.0, stop_event=None, speculative=False
+    ):
+        """
+        Picks a move for the side to play. When the side's remaining clock
+        time is given, engine and search moves stay within the TimeManager
+        budget; otherwise the fixed depth / node limits apply. Model players
+        play endgames the tablebases cover from them, perfectly and without a
+        search; engine players keep the engine's strength, since they are the
+        reference opponents of evaluations and gauntlets.
+        Setting stop_event from another thread ends a search or engine move
+        early. Speculative moves (pondering) are left out of the move and
+        stage metrics and the book statistics.
+        """
+        if self.tablebase and not self.engine:
+            with _stage("tablebase_probe", speculative):
+                move = self.tablebase.best_move(board)
+            if move is not None:
+                _record_move("tablebase", speculative)
+                return move
+        start = time.perf_counter()
+        self._refresh_model()
+        move = None
+        if self.book:
+            with _stage("book_probe", speculative):
+                move = self.book.choose(board)
+        from_book = move is not None
+        if from_book:
+            _record_move("book", speculative)
+        else:
+            budget = None
+            if remaining is not None:
+                budget = self.time_manager.allocate(
+                    remaining, increment, board.fullmove_number
+                )
+            move = self._choose_move(board, budget, stop_event, speculative)
+        if not speculative:
+            self.book_stats.record(from_book, time.perf_counter() - start)
+        return move
+
+    def _refresh_model(self):
+        """Switches to the registry's current weights between moves."""
+        if self.registry is None or self.engine:
+            return
+        version = self.registry.get()
+        if version is None or version is self.model_version:
+            return
+        self.model_version = version
+        self.model = version.model
+        if self.searcher:
+            self.searcher.model = version.model
+            self.searcher.clear()
+
+    def _choose_move(self, board, budget=None, stop_event=None, speculative=False):
+        if self.searcher and (not self.engine) and board.turn == self.side:
+            _record_move("search", speculative)
+            self.searcher.stop_event = stop_event
+            with _stage("search", speculative):
+                try:
+                    if budget:
+                        self.last_search = self.searcher.search(
+                            board, max_time=budget.hard, soft_time=budget.soft
+                        )
+                    else:
+                        self.last_search = self.searcher.search(board)
+                finally:
+                    self.searcher.stop_event = None
+            logger.debug(
+                "Search depth %d, %d nodes, %.0f nodes/s",
+                self.last_search.depth,
+                self.last_search.nodes,
+                self.last_search.nps,
+            )
+            if self.last_search.move:
+                return self.last_search.move
+            return random.choice(list(board.legal_moves))
+        elif self.model and (not self.engine) and board.turn == self.side:
+            _record_move("policy", speculative)
             self.model.eval()
-            board_tensor = board_to_tensor(board).to(self.device)
-            with torch.no_grad():
+            with _stage("tensor_encode", speculative):
+                board_tensor = board_to_tensor(board).to(self.device)
+            with _stage("model_forward", speculative), torch.no_grad():
                 policy, _, _ = self.model(board_tensor.unsqueeze(0))
-            move_probs = torch.exp(policy).cpu().numpy()[0]
-            top_move_indices = move_probs.argsort()[-10:][::-1]
-            for move_index in top_move_indices:
-                move = index_to_move(move_index, board)
-                if move in board.legal_moves:
-                    return move
-            return random.choice(list(board.legal_moves))
+                move_probs = torch.exp(policy).cpu().numpy()[0]
+            with _stage("move_decode", speculative):
+                top_move_indices = move_probs.argsort()[-10:][::-1]
+                for move_index in top_move_indices:
+                    move = index_to_move(move_index, board)
+                    if move in board.legal_moves:
+                        return move
+                return random.choice(list(board.legal_moves))
         elif self.engine and board.turn == self.side:
             # Opponent is Stockfish
-            result = self.engine.play(
-                board, chess.engine.Limit(depth=self.difficulty_level)
-            )
-            return result.move
+            _record_move("engine", speculative)
+            with _stage("engine_call", speculative):
+                return engine_move(
+                    self.engine, board, self._engine_limit(budget), stop_event
+                )
         elif self.engine and board.turn != self.side:
             # Opponent is Stockfish
-            result = self.engine.play(
-                board, chess.engine.Limit(depth=self.difficulty_level)
-            )
-            return result.move
+            _record_move("engine", speculative)
+            with _stage("engine_call", speculative):
+                return engine_move(
+                    self.engine, board, self._engine_limit(budget), stop_event
+                )
         else:
             # Fallback if something goes wrong
             return random.choice(list(board.legal_moves))
 
+    def _engine_limit(self, budget):
+        if budget:
+            return chess.engine.Limit(depth=self.difficulty_level, time=budget.soft)
+        return chess.engine.Limit(depth=self.difficulty_level)
+
     def close(self):
         if self.engine:
             self.engine.quit()
+        if self.book:
+            self.book.close()
 
 
 class GameAnalyzer:
@@ -116,7 +268,7 @@ class GameAnalyzer:
                     eval_score = score.score(mate_score=100000)
                 analysis.append((move, eval_score))
             except Exception as e:
-                print(f"Error analyzing move {move}: {e}")
+                logger.error("Error analyzing move %s: %s", move.uci(), e)
                 analysis.append((move, 0))
         return analysis
 
@@ -213,83 +365,99 @@ class GameSaver:
 
 class Logger:
     def __init__(self):
-        self.logger = logging.getLogger("ChessAI")
-        self.logger.setLevel(logging.DEBUG)
-        c_handler = logging.StreamHandler()
-        f_handler = logging.FileHandler(os.path.join(Config.LOG_DIR, "chess_ai.log"))
-        c_handler.setLevel(logging.INFO)
-        f_handler.setLevel(logging.DEBUG)
-        c_format = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        f_format = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        c_handler.setFormatter(c_format)
-        f_handler.setFormatter(f_format)
-        self.logger.addHandler(c_handler)
-        self.logger.addHandler(f_handler)
+        self.logger = get_logger()
 
     def get_logger(self):
         return self.logger
 
 
 class PlotlyDashApp(threading.Thread):
+    """
+    Live training dashboard. It tails the JSONL training log and sends each
+    browser only the points it has not seen yet (extendData); the whole
+    figure goes out on a first load or after older points were thinned out.
+    """
+
     def __init__(self, logger, config=Config):
         super().__init__()
         self.logger = logger
         self.config = config
         self.app = None
-        self.figure = None
-        self.x_data = []
-        self.y_data = []
-        self.elo_data = []
+        self.series = TrainingSeries(
+            os.path.join(config.LOG_DIR, config.TRAINING_LOG_FILE),
+            config.DASHBOARD_MAX_POINTS,
+        )
         self.daemon = True
 
+    def figure(self, points):
+        import plotly.graph_objs as go
+
+        epochs = [point[0] for point in points]
+        fig = go.Figure()
+        fig.add_trace(
+            go.Scatter(
+                x=epochs,
+                y=[point[1] for point in points],
+                mode="lines+markers",
+                name="Loss",
+            )
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=epochs,
+                y=[point[2] for point in points],
+                mode="lines+markers",
+                name="Elo Rating",
+                yaxis="y2",
+            )
+        )
+        fig.update_layout(
+            title="Training Progress",
+            xaxis_title="Epoch",
+            yaxis_title="Loss",
+            yaxis2=dict(title="Elo Rating", overlaying="y", side="right"),
+        )
+        return fig
+
     def run(self):
         import dash
         from dash import html, dcc
-        import plotly.graph_objs as go
 
         self.app = dash.Dash(__name__)
         self.app.layout = html.Div(
             [
                 html.H1("Chess AI Training Progress"),
-                dcc.Graph(id="live-update-graph"),
-                dcc.Interval(id="interval-component", interval=5 * 1000, n_intervals=0),
+                dcc.Graph(id="live-update-graph", figure=self.figure([])),
+                dcc.Store(id="graph-cursor"),
+                dcc.Interval(
+                    id="interval-component",
+                    interval=self.config.DASHBOARD_INTERVAL_MS,
+                    n_intervals=0,
+                ),
             ]
         )
 
         @self.app.callback(
-            dash.dependencies.Output("live-update-graph", "figure"),
+            [
+                dash.dependencies.Output("live-update-graph", "figure"),
+                dash.dependencies.Output("live-update-graph", "extendData"),
+                dash.dependencies.Output("graph-cursor", "data"),
+            ],
             [dash.dependencies.Input("interval-component", "n_intervals")],
+            [dash.dependencies.State("graph-cursor", "data")],
         )
-        def update_graph_live(n):
-            log_file = os.path.join(self.config.LOG_DIR, "chess_ai_training.json")
-            if os.path.exists(log_file):
-                with open(log_file, "r") as f:
-                    data = json.load(f)
-                self.x_data = [entry["epoch"] for entry in data]
-                self.y_data = [entry["loss"] for entry in data]
-                self.elo_data = [entry["elo"] for entry in data]
-            fig = go.Figure()
-            fig.add_trace(
-                go.Scatter(
-                    x=self.x_data, y=self.y_data, mode="lines+markers", name="Loss"
-                )
-            )
-            fig.add_trace(
-                go.Scatter(
-                    x=self.x_data,
-                    y=self.elo_data,
-                    mode="lines+markers",
-                    name="Elo Rating",
-                    yaxis="y2",
-                )
-            )
-            fig.update_layout(
-                title="Training Progress",
-                xaxis_title="Epoch",
-                yaxis_title="Loss",
-                yaxis2=dict(title="Elo Rating", overlaying="y", side="right"),
-            )
-            return fig
+        def update_graph_live(n, cursor):
+            full, points, cursor = self.series.update(cursor)
+            if full:
+                return self.figure(points), dash.no_update, cursor
+            if not points:
+                return dash.no_update, dash.no_update, cursor
+            epochs = [point[0] for point in points]
+            extension = {
+                "x": [epochs, epochs],
+                "y": [[point[1] for point in points], [point[2] for point in points]],
+            }
+            return dash.no_update, (extension, [0, 1]), cursor
 
         self.app.run_server()
 
@@ -337,7 +505,7 @@ class SoundEffects:
                 else None
             )
         except pygame.error as e:
-            print(f"Error loading sound files: {e}")
+            logger.warning("Error loading sound files: %s", e)
             self.move_sound = None
             self.capture_sound = None
 
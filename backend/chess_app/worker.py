@@ -0,0 +1,130 @@
+# chess_app/worker.py
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from chess_app.config import Config
+from chess_app.log import get_logger
+
+logger = get_logger("worker")
+
+
+class AIWorker:
+    """
+    Runs AI computation (model moves, engine searches, hints) off the Tk
+    thread. Results are put on a queue that the Tk thread drains every
+    `poll_ms`, so callbacks always run on the Tk thread and background
+    threads never touch widgets.
+
+    cancel() invalidates everything submitted or scheduled before it: queued
+    tasks do not start and the results of a running one are dropped. Tasks
+    that pass `stop_event`, read when they are submitted, to their search
+    are also stopped early, so the next one does not queue behind them.
+    """
+
+    def __init__(self, widget, poll_ms=Config.AI_WORKER_POLL_MS):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        # One thread: the players' models and engines are not shared safely.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai")
+        self.results = queue.SimpleQueue()
+        self.generation = 0
+        self.stop_event = threading.Event()
+        self.pending = set()
+        self.widget.after(self.poll_ms, self._poll)
+
+    def submit(self, fn, on_done=None, on_error=None):
+        """Runs fn() on the worker; on_done(result) or on_error(exc) on Tk."""
+        future = self.executor.submit(self._run, self.generation, fn, on_done, on_error)
+        self.pending.add(future)
+        future.add_done_callback(self.pending.discard)
+        return future
+
+    def after(self, delay_ms, fn, *args):
+        """widget.after() that a later cancel() also cancels."""
+        generation = self.generation
+
+        def run():
+            if generation == self.generation:
+                fn(*args)
+
+        return self.widget.after(delay_ms, run)
+
+    def cancel(self):
+        self.generation += 1
+        self.stop_event.set()
+        self.stop_event = threading.Event()
+        for future in list(self.pending):
+            future.cancel()
+
+    def shutdown(self):
+        self.cancel()
+        self.executor.shutdown(wait=False)
+
+    def _run(self, generation, fn, on_done, on_error):
+        if generation != self.generation:
+            return
+        try:
+            self.results.put((generation, on_done, fn()))
+        except Exception as e:
+            logger.exception("AI task failed: %s", e)
+            self.results.put((generation, on_error, e))
+
+    def _poll(self):
+        while True:
+            try:
+                generation, callback, result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self.generation and callback:
+                # A failing callback must not stop polling: every later
+                # result would be left on the queue.
+                try:
+                    callback(result)
+                except Exception as e:
+                    logger.exception("AI callback failed: %s", e)
+        self.widget.after(self.poll_ms, self._poll)
+
+
+class StallMonitor:
+    """
+    Responsiveness of the Tk event loop: a probe is scheduled every
+    `interval_ms` and a stall is how much later than that it runs. The
+    largest stall since reset() is what a user felt as a frozen window.
+    """
+
+    def __init__(self, widget, interval_ms=Config.STALL_PROBE_MS):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self.expected = None
+        self.reset()
+        self._schedule()
+
+    def reset(self):
+        self.max_stall = 0.0
+        self.total_stall = 0.0
+        self.probes = 0
+        self.started = time.perf_counter()
+
+    def report(self):
+        return {
+            "max_stall_ms": self.max_stall * 1000,
+            "mean_stall_ms": (
+                self.total_stall / self.probes * 1000 if self.probes else 0.0
+            ),
+            "probes": self.probes,
+            "seconds": time.perf_counter() - self.started,
+        }
+
+    def _schedule(self):
+        self.expected = time.perf_counter() + self.interval_ms / 1000
+        self.widget.after(self.interval_ms, self._probe)
+
+    def _probe(self):
+        stall = max(0.0, time.perf_counter() - self.expected)
+        self.max_stall = max(self.max_stall, stall)
+        self.total_stall += stall
+        self.probes += 1
+        self._schedule()
@@ -0,0 +1,89 @@
+# distill.py
+
+import json
+import os
+import chess
+from chess_app.distill import (
+    TeacherCache,
+    cache_teacher,
+    collect_positions,
+    compare,
+    train_student,
+)
+from chess_app.model import ChessNet, build_model, save_model
+from chess_app.utils import get_device, Logger, AIPlayer
+from chess_app.config import Config
+
+
+def main():
+    config = Config()
+    if not os.path.exists(config.LOG_DIR):
+        os.makedirs(config.LOG_DIR)
+
+    logger_instance = Logger()
+    logger = logger_instance.get_logger()
+    device = get_device()
+
+    if not os.path.exists(config.MODEL_PATH):
+        logger.error(f"No teacher model at {config.MODEL_PATH}.")
+        return
+    teacher = build_model(config.MODEL_PATH, device)
+
+    boards = collect_positions(config.SAVE_DIRECTORY, config.DISTILL_MAX_POSITIONS)
+    held_out = min(config.DISTILL_EVAL_POSITIONS, len(boards) // 10)
+    if not held_out:
+        logger.error(f"Too few positions in {config.SAVE_DIRECTORY} to distill.")
+        return
+    train_boards, eval_boards = boards[:-held_out], boards[-held_out:]
+    logger.info(
+        f"{len(train_boards)} training and {len(eval_boards)} held-out positions."
+    )
+
+    # The teacher only runs again when its weights are newer than the cache.
+    cache_path = config.DISTILL_CACHE_PATH
+    if not os.path.exists(cache_path) or os.path.getmtime(
+        cache_path
+    ) < os.path.getmtime(config.MODEL_PATH):
+        cache_teacher(teacher, device, train_boards, cache_path)
+    cache = TeacherCache(cache_path)
+    logger.info(
+        f"Teacher cache: {len(cache)} positions, "
+        f"{os.path.getsize(cache_path) / 2**20:.1f} MB."
+    )
+
+    student = ChessNet(**config.DISTILL_STUDENT).to(device)
+    train_student(student, device, cache, logger=logger)
+    save_model(student, config.DISTILL_STUDENT_PATH)
+
+    report = compare(student, teacher, device, eval_boards)
+    report["student"] = config.DISTILL_STUDENT
+    logger.info(
+        f"Student agrees with the teacher on {report['move_agreement']:.1%} of "
+        f"moves and {report['quality_agreement']:.1%} of quality classes, value "
+        f"MAE {report['value_mae']:.3f}."
+    )
+    logger.info(
+        f"Per-move latency: student {report['student_latency'] * 1000:.2f} ms, "
+        f"teacher {report['teacher_latency'] * 1000:.2f} ms "
+        f"({report['speedup']:.1f}x faster, {report['student_parameters']:,} vs "
+        f"{report['teacher_parameters']:,} parameters)."
+    )
+    with open(config.DISTILL_REPORT, "w") as f:
+        json.dump(report, f, indent=2)
+
+    # The student is an ordinary checkpoint: point MODEL_PATH at it to play.
+    player = AIPlayer(
+        model_path=config.DISTILL_STUDENT_PATH,
+        device=device,
+        side=chess.WHITE,
+        book_path=None,
+    )
+    move = player.get_best_move(chess.Board())
+    player.close()
+    logger.info(
+        f"AIPlayer loaded {config.DISTILL_STUDENT_PATH} and opened with {move.uci()}."
+    )
+
+
+if __name__ == "__main__":
+    main()
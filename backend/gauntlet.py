@@ -0,0 +1,52 @@
+# gauntlet.py
+
+import os
+from chess_app.gauntlet import Participant, run_gauntlet
+from chess_app.utils import Logger
+from chess_app.config import Config
+
+
+def main():
+    config = Config()
+    if not os.path.exists(config.LOG_DIR):
+        os.makedirs(config.LOG_DIR)
+
+    logger_instance = Logger()
+    logger = logger_instance.get_logger()
+
+    participants = Participant.discover(
+        config.GAUNTLET_CHECKPOINT_DIR,
+        config.GAUNTLET_ENGINE_LEVELS,
+        extra_checkpoints=[config.MODEL_PATH],
+    )
+    if len(participants) < 2:
+        logger.error("A gauntlet needs at least two participants.")
+        return
+
+    logger.info(
+        f"Running {config.GAUNTLET_FORMAT} gauntlet with {len(participants)} participants."
+    )
+    standings = run_gauntlet(
+        participants,
+        fmt=config.GAUNTLET_FORMAT,
+        games_per_pair=config.GAUNTLET_GAMES_PER_PAIR,
+        swiss_rounds=config.GAUNTLET_SWISS_ROUNDS,
+        results_file=config.GAUNTLET_RESULTS_FILE,
+        engine_path=config.ENGINE_PATH,
+        max_plies=config.GAUNTLET_MAX_PLIES,
+        workers=config.GAUNTLET_WORKERS,
+        logger=logger,
+    )
+
+    logger.info(
+        f"{'Rank':<5}{'Participant':<40}{'Elo':>8}{'+/-':>7}{'Games':>7}{'Score':>8}"
+    )
+    for rank, row in enumerate(standings, start=1):
+        logger.info(
+            f"{rank:<5}{row['id']:<40}{row['rating']:>8.0f}{2 * row['error']:>7.0f}"
+            f"{row['games']:>7}{row['points']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,12 +9,16 @@ from chess_app.utils import (
     Logger,
     GameSaver,
     EloRating,
+    Timer,
+    engine_move,
 )
+from chess_app.timecontrol import TimeManager
+from chess_app.analysis import QUALITY_LABELS, analyze_game, evaluate_positions
 from chess_app.data import board_to_tensor, move_to_index
 import sys
 import chess
-from threading import Thread
 from chess_app.config import Config
+from chess_app.worker import AIWorker, StallMonitor
 import tkinter as tk
 from tkinter import messagebox
 from chess_app.ui.utils import show_message
@@ -25,13 +29,17 @@ import random
 
 class ChessApp:
     def __init__(self):
-        print("Initializing ChessApp")
+        self.logger_instance = Logger()
+        self.logger = self.logger_instance.get_logger()
+        self.logger.debug("Initializing ChessApp")
         self.ai_player = None
         self.opponent_ai = None
         self.opponent_engine = None
         self.model_loaded = False
         self.white_time = 300
         self.black_time = 300
+        self.increment = Config.TIME_INCREMENT
+        self.time_manager = TimeManager()
         self.board = chess.Board()
         self.captured_pieces = {"white": [], "black": []}
         self.drag_start_coords = None
@@ -41,25 +49,27 @@ class ChessApp:
         )
         self.game_saver = GameSaver()
         self.last_move = None
-        self.logger_instance = Logger()
-        self.logger = self.logger_instance.get_logger()
         self.redo_stack = []
         self.selected_square = None
         self.sound_effects = SoundEffects()
         self.sound_enabled = True
         self.window = MainWindow(self)
+        # AI searches run on the worker so the Tk event loop keeps drawing;
+        # the monitor measures how well that holds up per game.
+        self.ai_worker = AIWorker(self.window)
+        self.stall_monitor = StallMonitor(self.window)
         self.apply_theme()
         self.load_ai_model()
 
     def apply_theme(self):
-        print("Applying theme")
+        self.logger.debug("Applying theme")
         self.window.refresh_ui()
 
     def load_ai_model(self):
-        print("Loading AI model")
+        self.logger.debug("Loading AI model")
         # Attempt to load AI model from MODEL_PATH
         if not Config.MODEL_PATH or not os.path.exists(Config.MODEL_PATH):
-            print("No model path found or path does not exist")
+            self.logger.debug("No model path found or path does not exist")
             self.model_loaded = False
             self.ai_player = AIPlayer(
                 model_path=Config.MODEL_PATH,
@@ -74,7 +84,7 @@ class ChessApp:
             )
         else:
             try:
-                print("Model path found, attempting to load model")
+                self.logger.debug("Model path found, attempting to load model")
                 device = "cuda" if torch.cuda.is_available() else "cpu"
                 self.ai_player = AIPlayer(
                     model_path=Config.MODEL_PATH, device=device, side=chess.WHITE
@@ -82,32 +92,31 @@ class ChessApp:
                 self.model_loaded = True
                 self.update_status("AI model loaded successfully.", color="green")
             except Exception as e:
-                print(f"Failed to load AI model: {e}")
                 self.model_loaded = False
                 self.ai_player = AIPlayer(
                     device=("cuda" if torch.cuda.is_available() else "cpu"),
                     side=chess.WHITE,
                 )
                 self.update_status(f"Failed to load AI model: {e}", color="red")
-                self.logger.error(f"Failed to load AI model: {e}")
+                self.logger.error("Failed to load AI model: %s", e)
 
     def run(self):
-        print("Running ChessApp")
+        self.logger.debug("Running ChessApp")
         self.window.mainloop()
+        self.ai_worker.shutdown()
 
     def handle_move(self, move):
-        print(f"Handling move: {move}")
+        self.logger.debug("Handling move: %s", move)
         try:
             if not self.board.is_legal(move):
-                print(f"Illegal move attempted: {move}")
-                self.logger.warning(f"Attempted illegal move: {move}")
+                self.logger.warning("Attempted illegal move: %s", move)
                 self.update_status(f"Illegal move attempted: {move}.", color="red")
                 return
 
             self.board.push(move)
             self.last_move = (move.from_square, move.to_square)
-            self.window.chessboard.draw_board()
-            self.window.chessboard.draw_pieces()
+            self.window.chessboard.last_move = self.last_move
+            self.window.chessboard.refresh()
             move_san = self.board.san(move)
             self.window.side_panel.update_move_list(move_san)
 
@@ -127,7 +136,7 @@ class ChessApp:
                 self.play_sound(move)
 
             if self.board.is_game_over():
-                print("Game over detected")
+                self.logger.debug("Game over detected")
                 self.handle_game_over()
             else:
                 # If it's AI's turn (if playing against stockfish or model)
@@ -137,52 +146,127 @@ class ChessApp:
                     and self.opponent_engine is None
                     and self.opponent_ai is None
                 ):
-                    print("AI's turn to move")
+                    self.logger.debug("AI's turn to move")
                     # cAI is black, user is white, or vice versa if set
-                    self.window.after(1000, self.ai_make_move)
+                    self.ai_worker.after(1000, self.ai_make_move)
                 elif self.opponent_engine and self.board.turn == chess.BLACK:
-                    print("Stockfish's turn to move")
-                    self.window.after(1000, self.stockfish_move)
+                    self.logger.debug("Stockfish's turn to move")
+                    self.ai_worker.after(1000, self.stockfish_move)
                 elif self.opponent_ai and self.board.turn == self.opponent_ai.side:
-                    print("Opponent AI's turn to move")
-                    self.window.after(1000, self.model_vs_model_move)
+                    self.logger.debug("Opponent AI's turn to move")
+                    self.ai_worker.after(1000, self.model_vs_model_move)
 
         except Exception as e:
-            print(f"Error handling move: {str(e)}")
             self.update_status(f"Error handling move: {str(e)}", color="red")
-            self.logger.error(f"Error in handle_move: {str(e)}")
+            self.logger.exception("Error in handle_move: %s", e)
+
+    def remaining_time(self, color):
+        return self.white_time if color == chess.WHITE else self.black_time
+
+    def charge_clock(self, color, elapsed):
+        if color == chess.WHITE:
+            self.white_time = max(0, self.white_time - elapsed + self.increment)
+        else:
+            self.black_time = max(0, self.black_time - elapsed + self.increment)
+        self.window.side_panel.update_timer(
+            Timer.format_time(int(self.white_time), int(self.black_time))
+        )
+
+    def player_think(self, player, board):
+        remaining = self.remaining_time(board.turn)
+        return lambda position, stop_event: player.get_best_move(
+            position,
+            remaining=remaining,
+            increment=self.increment,
+            stop_event=stop_event,
+        )
+
+    def engine_think(self, engine, board, depth):
+        budget = self.time_manager.allocate(
+            self.remaining_time(board.turn), self.increment, board.fullmove_number
+        )
+        limit = chess.engine.Limit(depth=depth, time=budget.soft)
+        return lambda position, stop_event: engine_move(
+            engine, position, limit, stop_event
+        )
+
+    def think_in_background(self, board, think, on_move):
+        """
+        Runs think(position, stop_event) on a copy of board on the AI worker;
+        a cancel() sets stop_event so the search ends early. Back on the Tk
+        thread the mover's clock is charged and on_move(move) called, unless
+        the search was cancelled or board changed in the meantime.
+        """
+        color = board.turn
+        position = board.copy()
+        fen = position.fen()
+        stop_event = self.ai_worker.stop_event
+
+        def search():
+            start = time.time()
+            move = think(position, stop_event)
+            return move, time.time() - start
+
+        def done(result):
+            move, elapsed = result
+            if board.fen() != fen:
+                self.logger.debug("Dropping move %s for a stale position", move)
+                return
+            self.charge_clock(color, elapsed)
+            if move:
+                on_move(move)
+
+        self.ai_worker.submit(search, on_done=done, on_error=self.ai_failed)
+
+    def ai_failed(self, error):
+        self.update_status(f"AI error: {error}", color="red")
 
     def stockfish_move(self):
-        print("Stockfish making a move")
+        self.logger.debug("Stockfish making a move")
         if self.opponent_engine and self.board.turn == chess.BLACK:
-            result = self.opponent_engine.play(
-                self.board, chess.engine.Limit(depth=Config.DEPTH)
+            self.think_in_background(
+                self.board,
+                self.engine_think(self.opponent_engine, self.board, Config.DEPTH),
+                self.handle_move,
             )
-            if result.move:
-                self.handle_move(result.move)
 
     def model_vs_model_move(self):
-        print("Model vs Model move")
+        self.logger.debug("Model vs Model move")
         # If playing AI vs AI
         if self.opponent_ai and self.board.turn == self.opponent_ai.side:
-            move = self.opponent_ai.get_best_move(self.board)
-            if move:
-                self.handle_move(move)
+            player = self.opponent_ai
         elif self.ai_player and self.board.turn == self.ai_player.side:
-            move = self.ai_player.get_best_move(self.board)
-            if move:
-                self.handle_move(move)
+            player = self.ai_player
+        else:
+            return
+        self.think_in_background(
+            self.board, self.player_think(player, self.board), self.handle_move
+        )
 
     def ai_make_move(self):
-        print("AI making a move")
+        self.logger.debug("AI making a move")
         if self.ai_player and self.model_loaded:
-            move = self.ai_player.get_best_move(self.board)
-            if move:
-                self.handle_move(move)
+            self.think_in_background(
+                self.board,
+                self.player_think(self.ai_player, self.board),
+                self.handle_move,
+            )
+
+    def log_responsiveness(self):
+        report = self.stall_monitor.report()
+        self.logger.info(
+            "UI responsiveness: max event-loop stall %.0f ms, mean %.1f ms "
+            "over %d probes (%.0f s)",
+            report["max_stall_ms"],
+            report["mean_stall_ms"],
+            report["probes"],
+            report["seconds"],
+        )
 
     def start_game(self):
-        print("Starting game")
+        self.logger.debug("Starting game")
         self.update_status("Game started.", color="green")
+        self.stall_monitor.reset()
         if (
             self.ai_player
             and self.ai_player.side == chess.WHITE
@@ -193,7 +277,7 @@ class ChessApp:
             self.ai_make_move()
 
     def handle_game_over(self):
-        print("Handling game over")
+        self.logger.debug("Handling game over")
         outcome = self.board.outcome()
         if outcome.winner is None:
             result_text = "It's a draw!"
@@ -206,35 +290,35 @@ class ChessApp:
             self.update_status(result_text, color="red")
 
         self.game_saver.save_game(self.board)
-        self.logger.info(f"Game over: {result_text}")
+        self.logger.info("Game over: %s", result_text)
+        self.log_responsiveness()
 
     def save_game(self):
-        print("Saving game")
+        self.logger.debug("Saving game")
         try:
             SaveLoad.save_game(self.board, "saved_game.pgn")
             self.update_status("Game saved successfully.", color="green")
         except Exception as e:
-            print(f"Error saving game: {str(e)}")
             self.update_status(f"Error saving game: {str(e)}", color="red")
-            self.logger.error(f"Error saving game: {str(e)}")
+            self.logger.error("Error saving game: %s", e)
 
     def load_game(self):
-        print("Loading game")
+        self.logger.debug("Loading game")
+        self.ai_worker.cancel()
         try:
             board = SaveLoad.load_game("saved_game.pgn")
             self.board = board
             self.window.chessboard.board = self.board
             self.window.chessboard.last_move = self.last_move
-            self.window.chessboard.draw_board()
-            self.window.chessboard.draw_pieces()
+            self.window.chessboard.refresh()
             self.update_status("Game loaded successfully.", color="green")
         except Exception as e:
-            print(f"Error loading game: {str(e)}")
             self.update_status(f"Error loading game: {str(e)}", color="red")
-            self.logger.error(f"Error loading game: {str(e)}")
+            self.logger.error("Error loading game: %s", e)
 
     def resign(self):
-        print("Resigning game")
+        self.logger.debug("Resigning game")
+        self.ai_worker.cancel()
         if self.board.turn == chess.WHITE:
             result_text = "White resigns. Black wins!"
             self.update_status(result_text, color="red")
@@ -245,14 +329,18 @@ class ChessApp:
             self.elo_rating.update(opponent_rating=1500, score=1.0)
 
         self.game_saver.save_game(self.board)
-        self.logger.info(f"Game over: {result_text}. ELO: {self.elo_rating.rating:.0f}")
+        self.logger.info(
+            "Game over: %s. ELO: %.0f", result_text, self.elo_rating.rating
+        )
 
     def offer_draw(self):
-        print("Offering draw")
+        self.logger.debug("Offering draw")
         self.update_status("Draw offered to the opponent.", color="blue")
 
     def undo_move(self):
-        print("Undoing move")
+        self.logger.debug("Undoing move")
+        # A search for the position being undone must not land afterwards.
+        self.ai_worker.cancel()
         if len(self.board.move_stack) > 0:
             last_move = self.board.pop()
             self.redo_stack.append(last_move)
@@ -261,11 +349,15 @@ class ChessApp:
                 pass
             self.update_status("Move undone.", color="green")
             self.window.side_panel.undo_move()
-            self.window.chessboard.draw_board()
-            self.window.chessboard.draw_pieces()
+            previous = self.board.peek() if self.board.move_stack else None
+            self.last_move = (
+                (previous.from_square, previous.to_square) if previous else None
+            )
+            self.window.chessboard.last_move = self.last_move
+            self.window.chessboard.refresh()
 
     def redo_move(self):
-        print("Redoing move")
+        self.logger.debug("Redoing move")
         if self.redo_stack:
             move = self.redo_stack.pop()
             self.board.push(move)
@@ -280,11 +372,16 @@ class ChessApp:
             move_san = self.board.san(move)
             self.window.side_panel.update_move_list(move_san)
             self.update_status("Move redone.", color="green")
-            self.window.chessboard.draw_board()
-            self.window.chessboard.draw_pieces()
+            self.last_move = (move.from_square, move.to_square)
+            self.window.chessboard.last_move = self.last_move
+            self.window.chessboard.refresh()
 
     def restart_game(self):
-        print("Restarting game")
+        self.logger.debug("Restarting game")
+        self.ai_worker.cancel()
+        if self.board.move_stack:
+            self.log_responsiveness()
+        self.stall_monitor.reset()
         self.board.reset()
         self.last_move = None
         self.white_time = 300
@@ -300,56 +397,128 @@ class ChessApp:
         self.window.side_panel.update_timer("White: 05:00 - Black: 05:00")
         self.window.chessboard.board = self.board
         self.window.chessboard.last_move = self.last_move
-        self.window.chessboard.draw_board()
-        self.window.chessboard.draw_pieces()
+        self.window.chessboard.refresh()
         self.update_status("Game restarted.", color="green")
 
     def set_ai_difficulty(self, level):
-        print(f"Setting AI difficulty to level {level}")
+        self.logger.debug("Setting AI difficulty to level %s", level)
         if self.ai_player:
             self.ai_player.set_difficulty(level)
             self.update_status(f"AI difficulty set to level {level}.", color="green")
 
     def toggle_sound(self, enabled):
-        print(f"Toggling sound to {'enabled' if enabled else 'disabled'}")
+        self.logger.debug("Toggling sound to %s", "enabled" if enabled else "disabled")
         self.sound_enabled = enabled
         self.update_status(
             f"Sound Effects {'Enabled' if enabled else 'Disabled'}.", color="green"
         )
 
     def show_hint(self):
-        print("Showing hint")
+        self.logger.debug("Showing hint")
         if self.ai_player and (self.model_loaded or self.ai_player.engine):
-            move = self.ai_player.get_best_move(self.board)
-            if move:
-                move_san = self.board.san(move)
-                messagebox.showinfo("Hint", f"Suggested Move: {move_san}")
-                self.update_status(f"Hint: {move_san}", color="blue")
-            else:
-                messagebox.showwarning("Hint", "No hint available.")
-                self.update_status("No hint available.", color="red")
+            position = self.board.copy()
+            self.update_status("Looking for a hint...", color="blue")
+            stop_event = self.ai_worker.stop_event
+            self.ai_worker.submit(
+                lambda: self.ai_player.get_best_move(position, stop_event=stop_event),
+                on_done=lambda move: self.show_hint_result(position, move),
+                on_error=self.ai_failed,
+            )
         else:
             messagebox.showwarning("Hint", "AI model not loaded.")
             self.update_status("AI model not loaded.", color="red")
 
+    def show_hint_result(self, position, move):
+        if position.fen() != self.board.fen():
+            return
+        if move:
+            move_san = position.san(move)
+            messagebox.showinfo("Hint", f"Suggested Move: {move_san}")
+            self.update_status(f"Hint: {move_san}", color="blue")
+        else:
+            messagebox.showwarning("Hint", "No hint available.")
+            self.update_status("No hint available.", color="red")
+
     def analyze_position(self):
-        print("Analyzing position")
+        self.logger.debug("Analyzing position")
+        if not self.ai_player or self.ai_player.model is None:
+            messagebox.showwarning("Analyze Position", "AI model not loaded.")
+            self.update_status("AI model not loaded.", color="red")
+            return
+        if self.board.is_game_over():
+            messagebox.showinfo("Analyze Position", "The game is over.")
+            return
+        position = self.board.copy()
+        model, device = self.ai_player.model, self.ai_player.device
+        self.update_status("Analyzing position...", color="blue")
+        self.ai_worker.submit(
+            lambda: evaluate_positions(model, device, [position]),
+            on_done=lambda result: self.show_position_analysis(position, result),
+            on_error=self.ai_failed,
+        )
+
+    def show_position_analysis(self, position, result):
+        if position.fen() != self.board.fen():
+            return
+        values, qualities, best_moves, _ = result
+        best_san = position.san(best_moves[0])
         messagebox.showinfo(
-            "Analyze Position", "Position analysis feature is under development."
+            "Analyze Position",
+            f"Evaluation (White): {values[0]:.2f}\n"
+            f"Best move: {best_san}\n"
+            f"Expected move quality: {QUALITY_LABELS[qualities[0]]}",
         )
         self.update_status(
-            "Position analysis feature is under development.", color="blue"
+            f"Evaluation {values[0]:.2f}, best move {best_san}.", color="blue"
         )
 
     def analyze_game(self):
-        print("Analyzing game")
-        messagebox.showinfo(
-            "Analyze Game", "Game analysis feature is under development."
+        self.logger.debug("Analyzing game")
+        if not self.ai_player or self.ai_player.model is None:
+            messagebox.showwarning("Analyze Game", "AI model not loaded.")
+            self.update_status("AI model not loaded.", color="red")
+            return
+        if not self.board.move_stack:
+            messagebox.showinfo("Analyze Game", "No moves to analyze.")
+            return
+        model, device = self.ai_player.model, self.ai_player.device
+        start, moves = self.board.root(), list(self.board.move_stack)
+        self.update_status("Analyzing game...", color="blue")
+        # One batched pass over the whole game: keep it off the Tk thread.
+        self.ai_worker.submit(
+            lambda: analyze_game(model, device, start, moves),
+            on_done=self.show_game_analysis,
+            on_error=self.ai_failed,
+        )
+
+    def show_game_analysis(self, report):
+        lines = []
+        for color in ("white", "black"):
+            side = report["summary"][color]
+            accuracy = side["accuracy"]
+            lines.append(
+                f"{color.capitalize()}: {side['blunder']} blunders, "
+                f"{side['mistake']} mistakes, {side['inaccuracy']} inaccuracies"
+                + (f", {accuracy:.0%} best moves" if accuracy is not None else "")
+            )
+        blunders = [
+            f"{ply['moveNumber']}{'.' if ply['side'] == 'white' else '...'} "
+            f"{ply['san']}?? (best {ply['bestSan']})"
+            for ply in report["plies"]
+            if ply["marker"] == "blunder"
+        ]
+        if blunders:
+            lines.append("")
+            lines.extend(blunders)
+        messagebox.showinfo("Analyze Game", "\n".join(lines))
+        self.update_status(
+            f"Analyzed {len(report['plies'])} moves in "
+            f"{report['forwardPasses']} forward passes.",
+            color="blue",
         )
-        self.update_status("Game analysis feature is under development.", color="blue")
 
     def toggle_theme(self):
-        print("Toggling theme")
+        self.logger.debug("Toggling theme")
         if Config.CURRENT_THEME == Config.LIGHT_THEME:
             Config.CURRENT_THEME = Config.DARK_THEME
         else:
@@ -358,7 +527,8 @@ class ChessApp:
         self.update_status("Theme toggled.", color="green")
 
     def play_against_stockfish(self):
-        print("Playing against Stockfish")
+        self.logger.debug("Playing against Stockfish")
+        self.ai_worker.cancel()
         try:
             self.opponent_engine = chess.engine.SimpleEngine.popen_uci(
                 Config.ENGINE_PATH
@@ -370,12 +540,13 @@ class ChessApp:
             # White is user, Black is Stockfish
             # If it's White's turn (user), user moves. On user move completion, stockfish_move is called.
         except Exception as e:
-            print(f"Failed to start Stockfish: {e}")
+            self.logger.error("Failed to start Stockfish: %s", e)
             self.update_status(f"Failed to start Stockfish: {e}", color="red")
             messagebox.showerror("Error", f"Failed to start Stockfish: {e}")
 
     def play_against_model(self):
-        print("Playing against model")
+        self.logger.debug("Playing against model")
+        self.ai_worker.cancel()
         if not self.model_loaded or not self.ai_player:
             self.update_status("AI model not loaded.", color="red")
             messagebox.showerror("Error", "AI model not loaded.")
@@ -390,7 +561,7 @@ class ChessApp:
         )
 
     def watch_ai_vs_stockfish(self):
-        print("Watching AI vs Stockfish")
+        self.logger.debug("Watching AI vs Stockfish")
         if not self.model_loaded or not self.ai_player:
             self.update_status("AI model not loaded.", color="red")
             messagebox.showerror("Error", "AI model not loaded.")
@@ -400,49 +571,54 @@ class ChessApp:
         self.window.control_panel.update_player_labels(
             "Chess AI (White)", "Stockfish (Black)"
         )
-        self.watch_game_thread = Thread(
-            target=self.watch_game, args=(self.opponent_engine,), daemon=True
-        )
-        self.watch_game_thread.start()
+        self.ai_worker.cancel()
+        self.stall_monitor.reset()
+        self.watch_game(self.opponent_engine)
 
     def watch_game(self, opponent_engine):
-        print("Watching game")
-        game_board = chess.Board()
-        while not game_board.is_game_over():
-            if game_board.turn == self.ai_player.side:
-                move = self.ai_player.get_best_move(game_board)
-            else:
-                result = opponent_engine.play(
-                    game_board,
-                    chess.engine.Limit(depth=self.ai_player.difficulty_level),
-                )
-                move = result.move
-            game_board.push(move)
-            self.update_ui_with_move(game_board, move)
-            time.sleep(Config.MOVE_DELAY / 1000.0)
-        self.handle_game_over_specific(game_board)
+        self.logger.debug("Watching game")
+        depth = self.ai_player.difficulty_level
+        self.autoplay(
+            chess.Board(),
+            lambda board: self.engine_think(opponent_engine, board, depth),
+        )
 
     def play_game_between_models(self, opponent_ai):
-        print("Playing game between models")
-        game_board = chess.Board()
-        while not game_board.is_game_over():
-            if game_board.turn == self.ai_player.side:
-                move = self.ai_player.get_best_move(game_board)
-            else:
-                move = opponent_ai.get_best_move(game_board)
+        self.logger.debug("Playing game between models")
+        self.autoplay(
+            chess.Board(), lambda board: self.player_think(opponent_ai, board)
+        )
+
+    def autoplay(self, game_board, opponent_think):
+        """
+        Plays ai_player against opponent_think(board) on game_board, one move
+        per AI worker search with MOVE_DELAY between moves, all driven from
+        the Tk thread. A cancel on the worker stops the game.
+        """
+        if game_board.is_game_over():
+            self.handle_game_over_specific(game_board)
+            return
+        if game_board.turn == self.ai_player.side:
+            think = self.player_think(self.ai_player, game_board)
+        else:
+            think = opponent_think(game_board)
+
+        def play(move):
             game_board.push(move)
             self.update_ui_with_move(game_board, move)
-            time.sleep(Config.MOVE_DELAY / 1000.0)
-        self.handle_game_over_specific(game_board)
+            self.ai_worker.after(
+                Config.MOVE_DELAY, self.autoplay, game_board, opponent_think
+            )
+
+        self.think_in_background(game_board, think, play)
 
     def update_ui_with_move(self, board, move):
-        print(f"Updating UI with move: {move}")
+        self.logger.debug("Updating UI with move: %s", move)
         self.board = board
         self.last_move = (move.from_square, move.to_square)
         self.window.chessboard.board = self.board
         self.window.chessboard.last_move = self.last_move
-        self.window.chessboard.draw_board()
-        self.window.chessboard.draw_pieces()
+        self.window.chessboard.refresh()
         move_san = self.board.san(move)
         self.window.side_panel.update_move_list(move_san)
         if self.board.is_capture(move):
@@ -460,7 +636,7 @@ class ChessApp:
             self.play_sound(move)
 
     def handle_game_over_specific(self, board):
-        print("Handling specific game over")
+        self.logger.debug("Handling specific game over")
         outcome = board.outcome()
         if outcome.winner is None:
             result_text = "It's a draw!"
@@ -475,7 +651,10 @@ class ChessApp:
             self.update_status(result_text, color="red")
             self.elo_rating.update(opponent_rating=1500, score=0.0)
         self.game_saver.save_game(board)
-        self.logger.info(f"Game over: {result_text}. ELO: {self.elo_rating.rating:.0f}")
+        self.logger.info(
+            "Game over: %s. ELO: %.0f", result_text, self.elo_rating.rating
+        )
+        self.log_responsiveness()
 
     def toggle_coordinates(self, show):
         self.window.chessboard.toggle_coordinates(show)
@@ -0,0 +1,72 @@
+# run_suite.py
+
+import json
+import os
+import sys
+import time
+from chess_app.model import build_model
+from chess_app.search import AlphaBetaSearcher
+from chess_app.suite import load_suite, run_suite
+from chess_app.utils import get_device, Logger
+from chess_app.config import Config
+
+
+def main():
+    config = Config()
+    if not os.path.exists(config.LOG_DIR):
+        os.makedirs(config.LOG_DIR)
+    if not os.path.exists(config.SUITE_RESULTS_DIR):
+        os.makedirs(config.SUITE_RESULTS_DIR)
+
+    logger_instance = Logger()
+    logger = logger_instance.get_logger()
+    device = get_device()
+
+    positions = load_suite(config.SUITE_PATH)
+    scored = sum(p.annotated for p in positions)
+    logger.info(
+        f"Loaded {len(positions)} positions ({scored} annotated) from {config.SUITE_PATH}."
+    )
+    engine_path = config.ENGINE_PATH if os.path.exists(config.ENGINE_PATH) else None
+
+    # Checkpoints to score can be given on the command line.
+    checkpoints = sys.argv[1:] or [config.MODEL_PATH]
+    for checkpoint in checkpoints:
+        model = None
+        searcher = None
+        if os.path.exists(checkpoint):
+            # Any architecture: full-size checkpoints or distilled students.
+            model = build_model(checkpoint, device)
+            searcher = AlphaBetaSearcher(model, device)
+        else:
+            logger.warning(f"Checkpoint {checkpoint} not found, engine only.")
+
+        report = run_suite(
+            positions,
+            model=model,
+            device=device,
+            searcher=searcher,
+            engine_path=engine_path,
+            time_budgets=config.SUITE_TIME_BUDGETS,
+            workers=config.SUITE_ENGINE_WORKERS,
+        )
+        logger.info(f"Results for {checkpoint}:")
+        logger.info(f"{'Solver':<8}{'Budget':>8}{'Solved':>10}{'Rate':>8}{'Pos/s':>10}")
+        for row in report:
+            budget = f"{row['budget']:g}s" if row["budget"] is not None else "-"
+            logger.info(
+                f"{row['solver']:<8}{budget:>8}{row['solved']:>5}/{row['scored']:<4}"
+                f"{row['solve_rate']:>8.0%}{row['positions_per_second']:>10.1f}"
+            )
+
+        name = os.path.splitext(os.path.basename(checkpoint))[0]
+        result_path = os.path.join(
+            config.SUITE_RESULTS_DIR, f"{name}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        )
+        with open(result_path, "w") as f:
+            json.dump({"checkpoint": checkpoint, "results": report}, f, indent=2)
+        logger.info(f"Saved results to {result_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# serve.py
+
+import os
+import signal
+import socket
+import threading
+import time
+from chess_app.config import Config
+from chess_app.log import get_logger, shutdown_logging
+from chess_app.utils import Logger
+
+# Seconds a worker must stay up before its exit counts as a crash to respawn
+# rather than a failure to start.
+MIN_WORKER_UPTIME = 5.0
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def worker_threads(workers):
+    """Inference threads per worker: an equal share of the cores, at least one."""
+    return max(1, available_cores() // workers)
+
+
+def run_worker(sock, app_kind, threads):
+    # Runs in the forked child. The master has imported torch, so its modules
+    # are shared copy-on-write, but its thread pools start on first use and
+    # can still be sized here. The app is imported per worker because it
+    # loads the model and starts the reload watcher at import.
+    import torch
+
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    if app_kind == "asgi":
+        import uvicorn
+
+        Config.ASGI_INFERENCE_WORKERS = min(Config.ASGI_INFERENCE_WORKERS, threads)
+        server = uvicorn.Server(
+            uvicorn.Config("asgi_api:app", log_level="warning", lifespan="on")
+        )
+        server.run(sockets=[sock])
+    else:
+        from werkzeug.serving import make_server
+        import api
+
+        server = make_server(
+            Config.SERVE_HOST,
+            Config.SERVE_PORT,
+            api.app,
+            threaded=True,
+            fd=sock.fileno(),
+        )
+        # shutdown() waits for serve_forever(), so it cannot run on this thread.
+        signal.signal(
+            signal.SIGTERM,
+            lambda *_: threading.Thread(target=server.shutdown).start(),
+        )
+        server.serve_forever()
+        api.model_registry.close()
+
+
+def spawn(sock, app_kind, threads):
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            run_worker(sock, app_kind, threads)
+        except BaseException:
+            get_logger("serve").exception("Worker %d failed", os.getpid())
+            code = 1
+        finally:
+            # os._exit skips atexit, so flush the log queue here.
+            shutdown_logging()
+            os._exit(code)
+    return pid
+
+
+def main():
+    config = Config()
+    if not os.path.exists(config.LOG_DIR):
+        os.makedirs(config.LOG_DIR)
+
+    logger_instance = Logger()
+    logger = logger_instance.get_logger()
+
+    workers = config.SERVE_WORKERS
+    threads = worker_threads(workers)
+    # Every worker maps the same checkpoint instead of loading a copy, unless
+    # CHESS_MODEL_SHARED=0 asks for private copies (the baseline to compare).
+    if os.environ.get("CHESS_MODEL_SHARED") != "0":
+        Config.MODEL_SHARED_WEIGHTS = True
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((config.SERVE_HOST, config.SERVE_PORT))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    children = {}
+    for _ in range(workers):
+        children[spawn(sock, config.SERVE_APP, threads)] = time.monotonic()
+    logger.info(
+        f"Serving {config.SERVE_APP} on {config.SERVE_HOST}:{config.SERVE_PORT} "
+        f"with {workers} workers, {threads} inference threads each "
+        f"(pids {', '.join(str(pid) for pid in children)})."
+    )
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = children.pop(pid, None)
+        if started is None or stopping:
+            continue
+        code = os.waitstatus_to_exitcode(status)
+        if time.monotonic() - started < MIN_WORKER_UPTIME:
+            logger.error(f"Worker {pid} exited with {code} while starting; stopping.")
+            stop(None, None)
+            continue
+        logger.warning(f"Worker {pid} exited with {code}; starting a new one.")
+        children[spawn(sock, config.SERVE_APP, threads)] = time.monotonic()
+    sock.close()
+    logger.info("All workers stopped.")
+
+
+if __name__ == "__main__":
+    main()
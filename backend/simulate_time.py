@@ -0,0 +1,50 @@
+# simulate_time.py
+
+import os
+import random
+from chess_app.book import iter_saved_games
+from chess_app.timecontrol import TimeManager, simulate_time_controls
+from chess_app.utils import Logger
+from chess_app.config import Config
+
+
+def load_game_lengths(save_directory, fallback_games=200, seed=0):
+    """Game lengths in plies from the archive, or a plausible spread if it is empty."""
+    lengths = [
+        sum(1 for _ in game.mainline_moves())
+        for game in iter_saved_games(save_directory)
+    ]
+    lengths = [n for n in lengths if n > 0]
+    if lengths:
+        return lengths, "saved games"
+    rng = random.Random(seed)
+    return [max(20, int(rng.gauss(90, 35))) for _ in range(fallback_games)], "synthetic"
+
+
+def main():
+    config = Config()
+    if not os.path.exists(config.LOG_DIR):
+        os.makedirs(config.LOG_DIR)
+
+    logger_instance = Logger()
+    logger = logger_instance.get_logger()
+
+    lengths, source = load_game_lengths(config.SAVE_DIRECTORY)
+    logger.info(f"Replaying {len(lengths)} {source} under {config.TIME_CONTROLS}.")
+    report = simulate_time_controls(lengths, config.TIME_CONTROLS, TimeManager())
+
+    logger.info(
+        f"{'TC':<10}{'Games':>7}{'Flags':>7}{'Emerg.':>8}"
+        f"{'p50 s':>8}{'p90 s':>8}{'max s':>8}{'Used':>7}"
+    )
+    for row in report:
+        logger.info(
+            f"{row['time_control']:<10}{row['games']:>7}{row['flag_falls']:>7}"
+            f"{row['emergency_fraction']:>8.1%}{row['move_time_p50']:>8.2f}"
+            f"{row['move_time_p90']:>8.2f}{row['move_time_max']:>8.2f}"
+            f"{row['clock_used_mean']:>7.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,12 @@ import chess
 import chess.engine
 import torch
 from torch.utils.data import DataLoader
-from chess_app.model import ChessNet, save_model, load_model
+from torch.utils.data.distributed import DistributedSampler
+from chess_app import distributed
+from chess_app.model import ChessNet, load_model
+from chess_app.augment import FlipCollate
+from chess_app.labelling import Labeller
+from chess_app.checkpoint import CheckpointWriter, latest_checkpoint, load_checkpoint
 from chess_app.data import (
     board_to_tensor,
     move_to_index,
@@ -15,8 +20,13 @@ import torch.optim as optim
 import torch.nn as nn
 import random
 import os
+import time
 from tqdm import tqdm
 from chess_app.utils import get_device, Logger, TensorBoardLogger, EloRating
+from chess_app.timecontrol import TimeManager
+from chess_app.tablebase import open_tablebase
+from chess_app.telemetry import TrainingTelemetry, format_summary
+from chess_app.traininglog import TrainingLog
 from chess_app.config import Config
 
 
@@ -28,18 +38,44 @@ def self_play(
     depth=2,
     logger=None,
     elo_rating=None,
+    time_control=Config.SELFPLAY_TIME_CONTROL,
+    results=None,
+    stats=None,
+    labeller=None,
+    reply_nodes=Config.SELFPLAY_REPLY_NODES,
+    tablebase=None,
 ):
     engine = chess.engine.SimpleEngine.popen_uci(engine_path)
+    if tablebase is None:
+        tablebase = open_tablebase()
+    adjudicated_games = 0
+    engine_seconds = 0.0
+    model_seconds = 0.0
+    time_manager = TimeManager()
+    base_time, increment = time_control
     training_data = []
+    # (board, move) for every sample, for the labeller
+    positions = []
     for game_num in tqdm(
         range(num_games), desc="Self-Play Games", disable=(logger is None)
     ):
         board = chess.Board()
         game_moves = []
         outcome_val = 0.5
+        engine_clock = base_time
+        adjudicated = None
         while not board.is_game_over():
+            # A tablebase position has a known result; playing it out only
+            # adds samples of the network fumbling a won ending.
+            result = tablebase.probe(board) if tablebase else None
+            if result is not None:
+                white_result = result[0] if board.turn == chess.WHITE else -result[0]
+                adjudicated = (white_result + 1) / 2
+                adjudicated_games += 1
+                break
             board_tensor = board_to_tensor(board).numpy()
             if model:
+                start = time.perf_counter()
                 model.eval()
                 with torch.no_grad():
                     policy, value, quality = model(
@@ -57,32 +93,50 @@ def self_play(
                         training_data.append(
                             (board_tensor, move_to_index(move), 0.0, move_quality)
                         )
+                        positions.append((board.copy(stack=False), move))
                         board.push(move)
                         game_moves.append(move)
                         move_found = True
                         break
+                model_seconds += time.perf_counter() - start
                 if not move_found:
                     move = random.choice(list(board.legal_moves))
                     move_quality = "Average Step"
                     training_data.append(
                         (board_tensor, move_to_index(move), 0.0, move_quality)
                     )
+                    positions.append((board.copy(stack=False), move))
                     board.push(move)
                     game_moves.append(move)
             else:
+                start = time.perf_counter()
                 result = engine.play(board, chess.engine.Limit(depth=depth))
+                engine_seconds += time.perf_counter() - start
                 move = result.move
                 training_data.append(
                     (board_tensor, move_to_index(move), 0.0, "Average Step")
                 )
+                positions.append((board.copy(stack=False), move))
                 board.push(move)
                 game_moves.append(move)
 
             if board.is_game_over():
                 break
 
-            # Stockfish move
-            result = engine.play(board, chess.engine.Limit(time=depth))
+            # Stockfish move: a fixed node count, or budgeted from its own
+            # game clock
+            if reply_nodes:
+                limit = chess.engine.Limit(nodes=reply_nodes)
+            else:
+                budget = time_manager.allocate(
+                    engine_clock, increment, board.fullmove_number
+                )
+                limit = chess.engine.Limit(time=budget.soft)
+            start = time.perf_counter()
+            result = engine.play(board, limit)
+            elapsed = time.perf_counter() - start
+            engine_seconds += elapsed
+            engine_clock += increment - elapsed
             stockfish_move = result.move
             training_data.append(
                 (
@@ -92,11 +146,14 @@ def self_play(
                     "Average Step",
                 )
             )
+            positions.append((board.copy(stack=False), stockfish_move))
             board.push(stockfish_move)
             game_moves.append(stockfish_move)
 
         outcome = board.outcome()
-        if outcome.winner is None:
+        if adjudicated is not None:
+            outcome_val = adjudicated
+        elif outcome.winner is None:
             outcome_val = 0.5
         elif outcome.winner == chess.WHITE:
             outcome_val = 1.0
@@ -105,6 +162,8 @@ def self_play(
 
         if elo_rating:
             elo_rating.update(opponent_rating=1500, score=outcome_val)
+        if results is not None:
+            results.append(outcome_val)
 
         for i in range(0, len(game_moves), 2):
             if i < len(training_data):
@@ -123,9 +182,43 @@ def self_play(
             )
 
     engine.quit()
+
+    # All positions are labelled in one batch, spread over the labeller's
+    # engine processes, instead of one engine call at a time during play.
+    label_seconds = 0.0
+    if labeller:
+        before = labeller.engine_seconds
+        labels = labeller.label(positions)
+        label_seconds = labeller.engine_seconds - before
+        training_data = [
+            (board_tensor, move_index, outcome, label)
+            for (board_tensor, move_index, outcome, _), label in zip(
+                training_data, labels
+            )
+        ]
+
+    if stats is not None:
+        stats["engine_seconds"] = stats.get("engine_seconds", 0.0) + engine_seconds
+        stats["label_seconds"] = stats.get("label_seconds", 0.0) + label_seconds
+        stats["samples"] = stats.get("samples", 0) + len(training_data)
+        stats["model_seconds"] = stats.get("model_seconds", 0.0) + model_seconds
+        stats["games"] = stats.get("games", 0) + num_games
+        stats["adjudicated"] = stats.get("adjudicated", 0) + adjudicated_games
     return training_data
 
 
+def make_scheduler(optimizer, epochs_per_iteration):
+    """
+    Step decay that restarts every training iteration, as a single scheduler
+    whose state can be checkpointed and resumed.
+    """
+    return optim.lr_scheduler.LambdaLR(
+        optimizer,
+        lambda epoch: Config.LR_GAMMA
+        ** ((epoch % epochs_per_iteration) // Config.LR_STEP_SIZE),
+    )
+
+
 def train_model(
     model,
     device,
@@ -136,12 +229,41 @@ def train_model(
     logger=None,
     tensorboard_logger=None,
     elo_rating=None,
+    training_log=None,
+    telemetry=None,
+    optimizer=None,
+    scheduler=None,
+    flip_prob=Config.AUGMENT_FLIP_PROB,
 ):
     dataset = ChessDatasetTrain(training_data)
-    dataloader = DataLoader(dataset, batch_size=batch_size, shuffle=True, num_workers=4)
+    # Under torch.distributed each rank trains on its own shard of the data
+    # and gradients are all-reduced by DDP.
+    sampler = None
+    net = model
+    num_workers = Config.DATALOADER_WORKERS
+    if distributed.is_distributed():
+        sampler = DistributedSampler(dataset, shuffle=True)
+        net = distributed.wrap_model(model)
+        # Keep the machine-wide loader process count what it was.
+        num_workers //= distributed.world_size()
+    dataloader = DataLoader(
+        dataset,
+        batch_size=batch_size,
+        shuffle=sampler is None,
+        sampler=sampler,
+        num_workers=num_workers,
+        # Colour-flipped mirrors are made per batch in the loader workers
+        # instead of being stored alongside the originals.
+        collate_fn=FlipCollate(flip_prob) if flip_prob > 0 else None,
+    )
 
-    optimizer = optim.Adam(model.parameters(), lr=lr)
-    scheduler = optim.lr_scheduler.StepLR(optimizer, step_size=5, gamma=0.1)
+    # Callers that checkpoint pass their own so the state outlives this call.
+    if optimizer is None:
+        optimizer = optim.Adam(model.parameters(), lr=lr)
+    if scheduler is None:
+        scheduler = optim.lr_scheduler.StepLR(
+            optimizer, step_size=Config.LR_STEP_SIZE, gamma=Config.LR_GAMMA
+        )
 
     criterion_policy = nn.NLLLoss()
     criterion_value = nn.MSELoss()
@@ -149,6 +271,8 @@ def train_model(
 
     model.train()
     for epoch in range(epochs):
+        if sampler:
+            sampler.set_epoch(epoch)
         total_loss = 0
         total_loss_policy = 0
         total_loss_value = 0
@@ -159,33 +283,56 @@ def train_model(
             leave=False,
             disable=(logger is None),
         )
+        # Time since the previous lap; the first data_wait includes starting
+        # the loader workers.
+        mark = time.perf_counter()
         for batch_idx, (boards, moves, outcomes, qualities) in enumerate(loop):
+            if telemetry:
+                mark = telemetry.lap("data_wait", mark)
             boards = boards.to(device)
             moves = moves.to(device)
             outcomes = outcomes.to(device).float()
             qualities = qualities.to(device).long()
+            if telemetry:
+                mark = telemetry.lap("to_device", mark)
 
             optimizer.zero_grad()
-            policy, value, quality = model(boards)
+            policy, value, quality = net(boards)
             loss_policy = criterion_policy(policy, moves)
             loss_value = criterion_value(value.squeeze(), outcomes)
             loss_quality = criterion_quality(quality, qualities)
             loss = loss_policy + loss_value + loss_quality
+            if telemetry:
+                mark = telemetry.lap("forward", mark)
             loss.backward()
+            if telemetry:
+                mark = telemetry.lap("backward", mark)
             optimizer.step()
 
             total_loss += loss.item()
             total_loss_policy += loss_policy.item()
             total_loss_value += loss_value.item()
             total_loss_quality += loss_quality.item()
+            if telemetry:
+                telemetry.count("steps")
+                telemetry.count("samples", boards.size(0))
 
             if logger:
                 loop.set_postfix(loss=loss.item())
+            if telemetry:
+                mark = telemetry.lap("optimizer", mark)
 
         avg_loss = total_loss / len(dataloader)
         avg_loss_policy = total_loss_policy / len(dataloader)
         avg_loss_value = total_loss_value / len(dataloader)
         avg_loss_quality = total_loss_quality / len(dataloader)
+        if distributed.is_distributed():
+            distributed.average_buffers(model)
+            avg_loss, avg_loss_policy, avg_loss_value, avg_loss_quality = (
+                distributed.all_reduce_mean(
+                    [avg_loss, avg_loss_policy, avg_loss_value, avg_loss_quality]
+                )
+            )
 
         if logger:
             logger.info(
@@ -201,21 +348,100 @@ def train_model(
             }
             tensorboard_logger.log_metrics(metrics, epoch)
 
+        if training_log:
+            training_log.append(
+                loss=avg_loss,
+                policy=avg_loss_policy,
+                value=avg_loss_value,
+                quality=avg_loss_quality,
+                elo=elo_rating.rating if elo_rating else None,
+            )
+
         scheduler.step()
 
     return model
 
 
+def collect_self_play(
+    model, device, config, logger, elo_rating, stats=None, labeller=None
+):
+    """
+    Self-play for one iteration. With several ranks each plays its share of
+    the games and every rank ends up with all of the data, which
+    DistributedSampler then shards for training.
+    """
+    if not distributed.is_distributed():
+        return self_play(
+            model=model,
+            device=device,
+            num_games=config.NUM_GAMES_PER_ITERATION,
+            engine_path=config.ENGINE_PATH,
+            depth=config.DEPTH,
+            logger=logger,
+            elo_rating=elo_rating,
+            stats=stats,
+            labeller=labeller,
+        )
+
+    share, extra = divmod(config.NUM_GAMES_PER_ITERATION, distributed.world_size())
+    results = []
+    local_stats = {}
+    local_data = self_play(
+        model=model,
+        device=device,
+        num_games=share + (1 if distributed.rank() < extra else 0),
+        engine_path=config.ENGINE_PATH,
+        depth=config.DEPTH,
+        logger=logger,
+        results=results,
+        stats=local_stats,
+        labeller=labeller,
+    )
+    training_data = []
+    gathered = distributed.all_gather((local_data, results, local_stats))
+    for rank_data, rank_results, rank_stats in gathered:
+        training_data.extend(rank_data)
+        if stats is not None:
+            for key, value in rank_stats.items():
+                stats[key] = stats.get(key, 0) + value
+        # Replayed in rank order so every rank holds the same rating.
+        for outcome in rank_results:
+            elo_rating.update(opponent_rating=1500, score=outcome)
+    return training_data
+
+
 def main():
+    if distributed.launched_with_torchrun():
+        distributed.init_from_env()
+        run_training()
+    elif Config.TRAIN_PROCESSES > 1:
+        distributed.spawn(run_training, Config.TRAIN_PROCESSES)
+    else:
+        run_training()
+
+
+def run_training():
     config = Config()
     if not os.path.exists(config.LOG_DIR):
-        os.makedirs(config.LOG_DIR)
+        os.makedirs(config.LOG_DIR, exist_ok=True)
     if not os.path.exists(config.PLOTLY_LOG_DIR):
-        os.makedirs(config.PLOTLY_LOG_DIR)
+        os.makedirs(config.PLOTLY_LOG_DIR, exist_ok=True)
 
+    # Only rank 0 reports progress, writes TensorBoard events, the training
+    # log and checkpoints.
+    main_process = distributed.is_main_process()
     logger_instance = Logger()
     logger = logger_instance.get_logger()
-    tensorboard_logger = TensorBoardLogger()
+    if not main_process:
+        logger.setLevel("WARNING")
+    progress_logger = logger if main_process else None
+    tensorboard_logger = TensorBoardLogger() if main_process else None
+    training_log = (
+        TrainingLog(os.path.join(config.LOG_DIR, config.TRAINING_LOG_FILE))
+        if main_process
+        else None
+    )
+    telemetry = TrainingTelemetry(tensorboard_logger)
     device = get_device()
     logger.info(f"Using device: {device}")
 
@@ -224,27 +450,81 @@ def main():
         num_channels=config.NUM_CHANNELS,
         num_residual_blocks=config.NUM_RESIDUAL_BLOCKS,
     ).to(device)
+    optimizer = optim.Adam(model.parameters(), lr=config.LEARNING_RATE)
+    scheduler = make_scheduler(optimizer, config.EPOCHS)
+    elo_rating = EloRating(initial_elo=config.INITIAL_ELO, k_factor=config.K_FACTOR)
+    start_iteration = 0
+    end_iteration = config.NUM_ITERATIONS
+
     model_path = config.MODEL_PATH
-    if os.path.exists(model_path):
+    resume_path = latest_checkpoint(config.CHECKPOINT_DIR)
+    if config.RESUME_TRAINING and resume_path:
+        state = load_checkpoint(resume_path, model, optimizer, scheduler, device)
+        start_iteration = state["iteration"]
+        # An unfinished run continues to the end it was started with; a
+        # finished one trains NUM_ITERATIONS more, like a fresh run would.
+        end_iteration = (state.get("extra") or {}).get("end_iteration", 0)
+        if start_iteration >= end_iteration:
+            end_iteration = start_iteration + config.NUM_ITERATIONS
+        if state.get("elo") is not None:
+            elo_rating.rating = state["elo"]
+    elif os.path.exists(model_path):
         load_model(model, model_path, device)
         logger.info("Loaded existing model.")
     else:
         logger.info("No existing model found. Starting from scratch.")
 
-    elo_rating = EloRating(initial_elo=config.INITIAL_ELO, k_factor=config.K_FACTOR)
-    iterations = config.NUM_ITERATIONS
-    for iteration in range(iterations):
-        logger.info(f"Training Iteration {iteration+1}/{iterations}")
-        training_data = self_play(
-            model=model,
-            device=device,
-            num_games=config.NUM_GAMES_PER_ITERATION,
-            engine_path=config.ENGINE_PATH,
-            depth=config.DEPTH,
-            logger=logger,
-            elo_rating=elo_rating,
+    labeller = None
+    if config.LABEL_MOVES:
+        # Each rank labels its own games; share the engine processes.
+        labeller = Labeller(
+            config.ENGINE_PATH,
+            workers=max(1, config.LABEL_ENGINE_WORKERS // distributed.world_size()),
+        )
+
+    checkpoints = None
+    if main_process:
+        checkpoints = CheckpointWriter(
+            config.CHECKPOINT_DIR, config.CHECKPOINT_KEEP_LAST, weights_path=model_path
+        )
+    for iteration in range(start_iteration, end_iteration):
+        logger.info(f"Training Iteration {iteration+1}/{end_iteration}")
+        if distributed.is_distributed():
+            # Different games on every rank, reproducible on resume.
+            distributed.seed_everything(
+                config.TRAIN_SEED
+                + iteration * distributed.world_size()
+                + distributed.rank()
+            )
+        telemetry.start_iteration()
+        self_play_stats = {}
+        with telemetry.timed("self_play"):
+            training_data = collect_self_play(
+                model,
+                device,
+                config,
+                progress_logger,
+                elo_rating,
+                self_play_stats,
+                labeller,
+            )
+        logger.info(
+            f"Collected {len(training_data)} training samples; "
+            f"{self_play_stats.get('adjudicated', 0)} games adjudicated by tablebase."
         )
-        logger.info(f"Collected {len(training_data)} training samples.")
+        play_seconds = self_play_stats.get("engine_seconds", 0.0)
+        label_seconds = self_play_stats.get("label_seconds", 0.0)
+        engine_seconds = play_seconds + label_seconds
+        if engine_seconds > 0 and training_data:
+            # Every mirror is a distinct position the engine never had to
+            # play, so colour flips double the positions per engine-second.
+            positions = len(training_data) * (2 if config.AUGMENT_FLIP_PROB > 0 else 1)
+            logger.info(
+                f"Engine time {play_seconds:.1f} s playing + {label_seconds:.1f} s "
+                f"labelling ({engine_seconds / len(training_data) * 1000:.1f} ms "
+                f"per sample): {len(training_data) / engine_seconds:.2f} samples and "
+                f"{positions / engine_seconds:.2f} training positions per engine-second."
+            )
         logger.info("Starting model training...")
         model = train_model(
             model=model,
@@ -253,15 +533,52 @@ def main():
             epochs=config.EPOCHS,
             batch_size=config.BATCH_SIZE,
             lr=config.LEARNING_RATE,
-            logger=logger,
+            logger=progress_logger,
             tensorboard_logger=tensorboard_logger,
             elo_rating=elo_rating,
+            training_log=training_log,
+            telemetry=telemetry,
+            optimizer=optimizer,
+            scheduler=scheduler,
         )
         logger.info("Model training completed.")
-        save_model(model, model_path)
-        logger.info(f"Model saved to {model_path}")
+        # The checkpoint records completed iterations and where the run
+        # ends, so a resumed run starts with the next one.
+        if checkpoints:
+            with telemetry.timed("checkpoint"):
+                checkpoints.save(
+                    model,
+                    optimizer,
+                    scheduler,
+                    iteration=iteration + 1,
+                    elo=elo_rating.rating,
+                    extra={"end_iteration": end_iteration},
+                )
+        summary = telemetry.finish(iteration, self_play_stats)
+        for line in format_summary(summary):
+            logger.info(line)
 
-    tensorboard_logger.close()
+    if checkpoints:
+        checkpoints.close()
+        stats = checkpoints.stats()
+        logger.info(
+            f"Checkpoints: {stats['write']['count']} written, training stalled "
+            f"{stats['stall']['mean'] * 1000:.1f} ms on average (max "
+            f"{stats['stall']['max'] * 1000:.1f} ms), writes took "
+            f"{stats['write']['mean']:.2f} s on average."
+        )
+    if labeller:
+        stats = labeller.stats()
+        labeller.close()
+        logger.info(
+            f"Labelled {stats['positions']} positions ({stats['forced']} forced, "
+            f"{stats['obvious']} obvious, {stats['critical']} critical) in "
+            f"{stats['engine_seconds']:.1f} engine-seconds, "
+            f"{stats['seconds_per_sample'] * 1000:.1f} ms per sample."
+        )
+    telemetry.close()
+    if tensorboard_logger:
+        tensorboard_logger.close()
     logger.info("Training loop completed.")
 
 